@@ -1,120 +1,169 @@
-import pandas as pd
+"""
+Synchronize Resources/lead_manual.csv with gc_org_info.csv and the ministers list.
+
+- Organizations in gc_org_info.csv that are missing from lead_manual.csv are
+  added with their harmonized name (an anti-join on gc_orgID).
+- 'Harmonized GC Name' follows the harmonized name in gc_org_info.csv.
+- Rows whose Parent GC OrgID is a ministry ('m…') take the ministry title
+  from lead_code_ministers.csv as both their name and lead department.
+
+Each step is a keyed lookup over whole columns. sync_lead_manual can be
+called in-process and returns the updated table with a summary of the
+changes; running the script writes lead_manual.csv (after a backup) and the
+summary to History/lead_fix_changes.json.
+"""
+import json
 import os
+import sys
+from typing import Dict, Tuple
+
+import pandas as pd
+
+# Shared output helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from id_normalize import normalize_gc_orgid
+from output_writer import report_outputs, write_csv, write_text
 
 # Paths to the CSV files
 resources_folder = os.path.dirname(os.path.abspath(__file__))
-manual_lead_department_file = os.path.join(resources_folder, 'lead_manual.csv')  # Changed
+manual_lead_department_file = os.path.join(resources_folder, 'lead_manual.csv')
 gc_org_info_file = os.path.join(resources_folder, '..', 'gc_org_info.csv')
-manual_ministries_file = os.path.join(resources_folder, 'lead_code_ministers.csv')  # Changed
-
-# Read the CSV files
-try:
-    manual_lead_department_df = pd.read_csv(manual_lead_department_file)
-    gc_org_info_df = pd.read_csv(gc_org_info_file)
-    manual_ministries_df = pd.read_csv(manual_ministries_file)
-    
-    print("Successfully loaded all CSV files")
-    print(f"Manual lead department file has {len(manual_lead_department_df)} rows")
-    print(f"GC Org Info file has {len(gc_org_info_df)} rows")
-    print(f"Manual ministries file has {len(manual_ministries_df)} rows")
-except Exception as e:
-    print(f"Error loading CSV files: {str(e)}")
-    exit(1)
-
-# Create a backup of the original file
-backup_file = os.path.join(resources_folder, 'lead_manual_backup.csv')  # Changed
-manual_lead_department_df.to_csv(backup_file, index=False)
-print(f"Backup created at {backup_file}")
-
-# Create a mapping of gc_orgID to harmonized_name from gc_org_info_df
-gc_orgid_to_name = {}
-for _, row in gc_org_info_df.iterrows():
-    if pd.notna(row['gc_orgID']) and pd.notna(row['harmonized_name']):
-        gc_orgid_to_name[str(int(row['gc_orgID']))] = row['harmonized_name']
-
-# Get a set of existing gc_orgIDs in manual_lead_department_df
-existing_gc_orgids = set()
-for _, row in manual_lead_department_df.iterrows():
-    if pd.notna(row['gc_orgID']):
-        existing_gc_orgids.add(str(int(row['gc_orgID'])))
-
-# Identify missing gc_orgIDs and create new rows
-new_rows = []
-missing_count = 0
-
-for gc_orgid, harmonized_name in gc_orgid_to_name.items():
-    if gc_orgid not in existing_gc_orgids:
-        # Create a new row with the gc_orgID and harmonized_name
-        new_row = {col: '' for col in manual_lead_department_df.columns}  # Initialize with empty values
-        new_row['gc_orgID'] = gc_orgid
-        new_row['Harmonized GC Name'] = harmonized_name
-        new_rows.append(new_row)
-        missing_count += 1
-        print(f"Adding missing org ID {gc_orgid}: '{harmonized_name}'")
-
-# Add new rows to the dataframe
-if new_rows:
-    manual_lead_department_df = pd.concat([manual_lead_department_df, pd.DataFrame(new_rows)], ignore_index=True)
-
-print(f"Added {missing_count} missing organizations")
-
-# Create a mapping of ministry IDs to titles from manual_ministries_df
-ministry_id_to_title = {}
-for _, row in manual_ministries_df.iterrows():
-    if pd.notna(row['minID']) and pd.notna(row['Title']):
-        ministry_id_to_title[str(row['minID'])] = row['Title']
-
-# Update the 'Harmonized GC Name' based on gc_orgID or Parent GC OrgID
-updated_count = 0
-ministry_updated_count = 0
-
-for index, row in manual_lead_department_df.iterrows():
-    # Check if Parent GC OrgID starts with 'm' (ministry ID)
-    if pd.notna(row['Parent GC OrgID']) and str(row['Parent GC OrgID']).startswith('m'):
-        # It's a ministry, use the Title from manualMinistries.csv
-        ministry_id = str(row['Parent GC OrgID'])
-        
-        if ministry_id in ministry_id_to_title:
-            old_name = manual_lead_department_df.at[index, 'Harmonized GC Name']
-            new_name = ministry_id_to_title[ministry_id]
-            
-            # Update both the harmonized name and lead_department for ministries
-            if old_name != new_name:
-                manual_lead_department_df.at[index, 'Harmonized GC Name'] = new_name
-                manual_lead_department_df.at[index, 'lead_department'] = new_name
-                manual_lead_department_df.at[index, 'ministère_responsable'] = row.get('ministère_responsable', '')  # Preserve French if available
-                ministry_updated_count += 1
-                print(f"Updated Ministry ID {ministry_id}: '{old_name}' -> '{new_name}'")
-    
-    # For regular entries, update based on gc_orgID
-    elif pd.notna(row['gc_orgID']):
-        # Convert to string and remove decimal point if present
-        gc_orgid = str(int(row['gc_orgID']))
-        
-        if gc_orgid in gc_orgid_to_name:
-            # Update the harmonized name
-            old_name = manual_lead_department_df.at[index, 'Harmonized GC Name']
-            new_name = gc_orgid_to_name[gc_orgid]
-            
-            if old_name != new_name:
-                manual_lead_department_df.at[index, 'Harmonized GC Name'] = new_name
-                updated_count += 1
-                print(f"Updated ID {gc_orgid}: '{old_name}' -> '{new_name}'")
-
-print(f"Updated {updated_count} organization harmonized names")
-print(f"Updated {ministry_updated_count} ministry harmonized names")
-
-# Save the updated dataframe back to the CSV file
-manual_lead_department_df.to_csv(manual_lead_department_file, index=False)
-print(f"Updated file saved to {manual_lead_department_file}")
-
-# Identify organizations without a lead department
-orgs_without_lead = manual_lead_department_df[
-    (manual_lead_department_df['lead_department'].isna()) | 
-    (manual_lead_department_df['lead_department'] == '')
-]
-
-if not orgs_without_lead.empty:
-    print(f"Found {len(orgs_without_lead)} organizations without a lead department")
-else:
-    print("All organizations have lead departments assigned")
+manual_ministries_file = os.path.join(resources_folder, 'lead_code_ministers.csv')
+backup_file = os.path.join(resources_folder, 'lead_manual_backup.csv')
+summary_file = os.path.join(resources_folder, '..', 'History', 'lead_fix_changes.json')
+
+
+def keyed_values(keys: pd.Series, values: pd.Series) -> pd.Series:
+    """
+    Index values by key, skipping blank keys and values.
+
+    The last row wins when a key repeats, as it would when filling a dict.
+    """
+    present = keys.notna() & values.notna()
+    mapping = pd.Series(values[present].to_numpy(), index=keys[present].to_numpy())
+    return mapping[~mapping.index.duplicated(keep='last')]
+
+
+def sync_lead_manual(lead_df: pd.DataFrame, org_info_df: pd.DataFrame,
+                     ministers_df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Bring lead_manual up to date with gc_org_info and the ministers list.
+
+    Args:
+        lead_df: lead_manual.csv as read
+        org_info_df: gc_org_info.csv
+        ministers_df: lead_code_ministers.csv
+
+    Returns:
+        Tuple of (updated lead_manual table, change summary)
+    """
+    names = keyed_values(normalize_gc_orgid(org_info_df['gc_orgID']), org_info_df['harmonized_name'])
+
+    # Anti-join: organizations without a lead_manual row get one
+    missing = names[~names.index.isin(normalize_gc_orgid(lead_df['gc_orgID']).dropna())]
+    if len(missing):
+        new_rows = pd.DataFrame('', index=range(len(missing)), columns=lead_df.columns)
+        new_rows['gc_orgID'] = missing.index
+        new_rows['Harmonized GC Name'] = missing.to_numpy()
+        lead_df = pd.concat([lead_df, new_rows], ignore_index=True)
+    else:
+        lead_df = lead_df.copy()
+
+    current_names = lead_df['Harmonized GC Name']
+    parents = lead_df['Parent GC OrgID'].astype('string')
+    is_ministry = parents.str.startswith('m').fillna(False).astype(bool)
+
+    # Ministries take their title as name and lead department
+    titles = keyed_values(ministers_df['minID'].astype('string'), ministers_df['Title'])
+    ministry_names = parents.map(titles).where(is_ministry)
+    ministry_update = ministry_names.notna() & (ministry_names != current_names)
+
+    # Everything else follows gc_org_info
+    lead_gc_orgids = normalize_gc_orgid(lead_df['gc_orgID'])
+    org_names = lead_gc_orgids.map(names).where(~is_ministry & lead_df['gc_orgID'].notna())
+    org_update = org_names.notna() & (org_names != current_names)
+
+    summary = {
+        'added': [
+            {'gc_orgID': gc_orgid, 'name': name} for gc_orgid, name in missing.items()
+        ],
+        'renamed': [
+            {'gc_orgID': gc_orgid, 'old': old, 'new': new}
+            for gc_orgid, old, new in zip(lead_gc_orgids[org_update], current_names[org_update],
+                                          org_names[org_update])
+        ],
+        'ministries_renamed': [
+            {'gc_orgID': gc_orgid, 'minID': min_id, 'old': old, 'new': new}
+            for gc_orgid, min_id, old, new in zip(lead_gc_orgids[ministry_update], parents[ministry_update],
+                                                  current_names[ministry_update], ministry_names[ministry_update])
+        ],
+    }
+
+    lead_df.loc[org_update, 'Harmonized GC Name'] = org_names[org_update]
+    lead_df.loc[ministry_update, 'Harmonized GC Name'] = ministry_names[ministry_update]
+    lead_df.loc[ministry_update, 'lead_department'] = ministry_names[ministry_update]
+
+    without_lead = lead_df['lead_department'].isna() | (lead_df['lead_department'] == '')
+    summary['without_lead_department'] = int(without_lead.sum())
+    return lead_df, summary
+
+
+def json_value(value):
+    """Make a summary value JSON serializable (blank names become null)."""
+    return None if pd.isna(value) else value
+
+
+def print_summary(summary: Dict) -> None:
+    """Print the changes made by sync_lead_manual."""
+    for row in summary['added']:
+        print(f"Adding missing org ID {row['gc_orgID']}: '{row['name']}'")
+    print(f"Added {len(summary['added'])} missing organizations")
+    for row in summary['renamed']:
+        print(f"Updated ID {row['gc_orgID']}: '{row['old']}' -> '{row['new']}'")
+    for row in summary['ministries_renamed']:
+        print(f"Updated Ministry ID {row['minID']}: '{row['old']}' -> '{row['new']}'")
+    print(f"Updated {len(summary['renamed'])} organization harmonized names")
+    print(f"Updated {len(summary['ministries_renamed'])} ministry harmonized names")
+    if summary['without_lead_department']:
+        print(f"Found {summary['without_lead_department']} organizations without a lead department")
+    else:
+        print("All organizations have lead departments assigned")
+
+
+def main():
+    """Synchronize lead_manual.csv and write the change summary."""
+    try:
+        manual_lead_department_df = pd.read_csv(manual_lead_department_file)
+        gc_org_info_df = pd.read_csv(gc_org_info_file)
+        manual_ministries_df = pd.read_csv(manual_ministries_file)
+
+        print("Successfully loaded all CSV files")
+        print(f"Manual lead department file has {len(manual_lead_department_df)} rows")
+        print(f"GC Org Info file has {len(gc_org_info_df)} rows")
+        print(f"Manual ministries file has {len(manual_ministries_df)} rows")
+    except Exception as e:
+        print(f"Error loading CSV files: {str(e)}")
+        sys.exit(1)
+
+    # Create a backup of the original file
+    write_csv(manual_lead_department_df, backup_file, index=False)
+    print(f"Backup created at {backup_file}")
+
+    updated_df, summary = sync_lead_manual(manual_lead_department_df, gc_org_info_df, manual_ministries_df)
+    print_summary(summary)
+
+    # Save the updated dataframe back to the CSV file
+    write_csv(updated_df, manual_lead_department_file, index=False)
+    print(f"Updated file saved to {manual_lead_department_file}")
+
+    summary_json = {
+        key: [{field: json_value(value) for field, value in row.items()} for row in rows]
+        if isinstance(rows, list) else rows
+        for key, rows in summary.items()
+    }
+    write_text(summary_file, json.dumps(summary_json, ensure_ascii=False, indent=2) + '\n')
+    report_outputs()
+
+
+if __name__ == "__main__":
+    main()
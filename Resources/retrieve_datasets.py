@@ -1,27 +1,31 @@
 import os
 import requests
+import sys
+
+# Shared output helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from output_writer import report_outputs
+from stream_download import download_text
 
 # Path to the folder where the script is located
 script_folder = os.path.dirname(os.path.abspath(__file__))
 
+# Non-breaking hyphens (U+2011) and typographic apostrophes (U+2018, U+2019)
+# become their plain ASCII forms
+CHARACTER_FIXUPS = {'\u2011': '-', '\u2018': "'", '\u2019': "'"}
+
 def download_and_fix_csv(url, filename):
-    response = requests.get(url)
-    if response.status_code == 200:
-        # Decode the content to a string
-        content = response.text
-        print("Original content snippet:", content[:100])  # Print the first 100 characters of the original content
-        # Replace non-breaking hyphens (U+2011) with regular hyphens (U+002D)
-        fixed_content = content.replace('\u2011', '-')
-        # Replace typographic apostrophes (U+2018 and U+2019) with regular apostrophes (U+0027)
-        fixed_content = fixed_content.replace('\u2018', "'").replace('\u2019', "'")
-        print("Fixed content snippet:", fixed_content[:100])  # Print the first 100 characters of the fixed content
-        # Save the fixed content to a file with UTF-8 encoding
-        file_path = os.path.join(script_folder, filename)
-        with open(file_path, 'w', encoding='utf-8-sig') as file:
-            file.write(fixed_content)
-        print(f'{filename} downloaded and fixed successfully!')
-    else:
-        print(f'Failed to download {filename}. Status code: {response.status_code}')
+    # Stream the dump to the file, fixing characters chunk by chunk
+    file_path = os.path.join(script_folder, filename)
+    try:
+        stream = download_text(url, file_path, fixups=CHARACTER_FIXUPS)
+    except requests.HTTPError as e:
+        print(f'Failed to download {filename}. Status code: {e.response.status_code}')
+        return
+    print("Original content snippet:", stream.head)  # The first 100 characters of the original content
+    print("Fixed content snippet:", stream.fixed_head)  # The first 100 characters of the fixed content
+    print(f'{filename} downloaded and fixed successfully! '
+          f'({stream.compressed_bytes} bytes transferred, {stream.characters} characters)')
 
 # Infobase Datasets
 download_and_fix_csv('https://open.canada.ca/data/en/datastore/dump/7c131a87-7784-4208-8e5c-043451240d95?bom=True', 'infobase_en.csv')
@@ -33,3 +37,4 @@ download_and_fix_csv('https://ouvert.canada.ca/data/fr/datastore/dump/f0ca63e0-c
 
 # Open Portal List Download
 download_and_fix_csv('https://open.canada.ca/data/en/datastore/dump/04cbec5c-5a3d-4d34-927d-e41c9e6e3736?bom=True', 'ogp.csv')
+report_outputs()
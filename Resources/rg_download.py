@@ -1,6 +1,12 @@
 import os
-import requests
 import pandas as pd
+import sys
+
+# Shared output helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from id_normalize import format_rg_code
+from output_writer import report_outputs, write_csv
+from stream_download import ChunkReader, DownloadStream
 
 # URL of the CSV file
 url = 'https://donnees-data.tpsgc-pwgsc.gc.ca/ba1/min-dept/min-dept.csv'
@@ -8,48 +14,43 @@ url = 'https://donnees-data.tpsgc-pwgsc.gc.ca/ba1/min-dept/min-dept.csv'
 # Path to save the downloaded CSV file
 script_folder = os.path.dirname(os.path.abspath(__file__))
 output_file = os.path.join(script_folder, 'rg_data.csv')
-temp_file = os.path.join(script_folder, 'downloaded_file.csv')
 
 print(f"Downloading from: {url}")
 print(f"Output file will be: {output_file}")
 
-# Step 1: Download the file and save it locally
-try:
-    response = requests.get(url)
-    response.raise_for_status()  # Raise exception for bad status codes
-    
-    with open(temp_file, 'wb') as file:
-        file.write(response.content)
-    print(f"✓ File downloaded successfully to {temp_file}")
-    
+def read_rg_stream(encoding):
+    # Stream the download straight into pandas, without a temporary file
+    stream = DownloadStream(url, encoding=encoding, preview_chars=2000)
+    df = pd.read_csv(ChunkReader(stream))
+    print(f"✓ File downloaded successfully ({stream.compressed_bytes} bytes transferred)")
+
     # Display the first 3 lines to see the file structure
-    with open(temp_file, 'r', encoding='utf-8', errors='ignore') as file:
-        header = file.readline().strip()
-        print("\nFile header:")
-        print(header)
-        print("\nFirst two data rows:")
-        print(file.readline().strip())
-        print(file.readline().strip())
-    
-except Exception as e:
-    print(f"Error downloading file: {e}")
-    exit(1)
+    lines = stream.head.splitlines()
+    print("\nFile header:")
+    print(lines[0].strip() if lines else '')
+    print("\nFirst two data rows:")
+    for line in lines[1:3]:
+        print(line.strip())
+    return df
 
-# Step 2: Read the CSV file
+# Steps 1 and 2: Download the file and read the CSV in one pass
 try:
-    df = pd.read_csv(temp_file)
+    df = read_rg_stream('utf-8-sig')
     print(f"\n✓ CSV loaded successfully with {len(df)} rows")
     print(f"Original columns: {df.columns.tolist()}")
-except Exception as e:
+except UnicodeDecodeError as e:
     print(f"Error reading CSV with default options: {e}")
     print("Trying with different encoding...")
     try:
-        df = pd.read_csv(temp_file, encoding='latin1')
+        df = read_rg_stream('latin1')
         print(f"✓ CSV loaded successfully with latin1 encoding")
     except Exception as e2:
         print(f"Error with latin1 encoding: {e2}")
         print("CSV could not be loaded. Please check the file format manually.")
         exit(1)
+except Exception as e:
+    print(f"Error downloading file: {e}")
+    exit(1)
 
 # Step 3: Simple column renaming based on position
 print("\nRenaming columns by position...")
@@ -77,19 +78,8 @@ try:
         print(f"rgnumber column dtype: {df['rgnumber'].dtype}")
         print(f"Sample values: {df['rgnumber'].head().tolist()}")
         
-        # Convert to string and pad with zeros
-        df['rgnumber'] = df['rgnumber'].astype(str)
-        
-        # Try to format numbers, handling non-numeric values
-        def format_number(x):
-            try:
-                if pd.notna(x) and x.strip():
-                    return f"{int(float(x)):03d}"
-                return x
-            except ValueError:
-                return x
-                
-        df['rgnumber'] = df['rgnumber'].apply(format_number)
+        # Zero-pad numeric codes to three digits, keeping any other text as is
+        df['rgnumber'] = format_rg_code(df['rgnumber'])
         print("✓ Department numbers formatted")
     else:
         print("Error: 'rgnumber' column not found after renaming")
@@ -100,7 +90,7 @@ except Exception as e:
 # Step 5: Save the output file
 print("\nSaving output file...")
 try:
-    df.to_csv(output_file, index=False, encoding='utf-8-sig')
+    write_csv(df, output_file, index=False, encoding='utf-8-sig')
     if os.path.exists(output_file):
         print(f"✓ File saved successfully to {output_file}")
         print(f"  File size: {os.path.getsize(output_file)} bytes")
@@ -111,12 +101,5 @@ try:
 except Exception as e:
     print(f"Error saving output file: {e}")
 
-# Clean up
-try:
-    if os.path.exists(temp_file):
-        os.remove(temp_file)
-        print(f"\n✓ Temporary file removed")
-except Exception as e:
-    print(f"Error removing temporary file: {e}")
-
 print("\nProcess completed")
+report_outputs()
@@ -1,5 +1,11 @@
 import os
 import pandas as pd
+import sys
+
+# Shared output helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from id_normalize import parse_int
+from output_writer import report_outputs, write_csv
 
 # Enable debugging
 DEBUG = True
@@ -98,7 +104,7 @@ debug_print(f"Combined final_df has {len(final_df)} rows")
 
 # Set gc_orgID to whole numbers, handling non-finite values
 debug_print("Converting gc_orgID to integers...")
-final_df['gc_orgID'] = pd.to_numeric(final_df['gc_orgID'], errors='coerce').fillna(0).astype(int)
+final_df['gc_orgID'] = parse_int(final_df['gc_orgID']).fillna(0)
 
 # Merge 'rgnumber' field from rg_fixed.csv to final_RG_match.csv
 if 'rgnumber' in fixed_df.columns:
@@ -133,7 +139,7 @@ if 'rgnumber' in final_df.columns:
 # Set rgnumber to whole numbers, handling non-finite values
 if 'rgnumber' in final_df.columns:
     debug_print("Converting rgnumber to integers...")
-    final_df['rgnumber'] = pd.to_numeric(final_df['rgnumber'], errors='coerce').fillna(0).astype(int)
+    final_df['rgnumber'] = parse_int(final_df['rgnumber']).fillna(0)
 
 # Round all numeric fields to whole numbers, handling non-finite values before conversion
 debug_print("Rounding all numeric fields...")
@@ -154,6 +160,7 @@ else:
 # Save the updated DataFrame to a new CSV file in the Resources folder
 updated_output_file = os.path.join(script_folder, 'Resources', 'rg_final.csv')
 debug_print(f"Saving final result to {updated_output_file}")
-final_df.to_csv(updated_output_file, index=False, encoding='utf-8-sig')
+write_csv(final_df, updated_output_file, index=False, encoding='utf-8-sig')
 
 print(f"The updated matched names have been saved to {updated_output_file}")
+report_outputs()
@@ -1,6 +1,13 @@
 import os
 import pandas as pd
 from rapidfuzz import process
+import sys
+
+# Shared output helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from build_profile import stage, start_profiling, stop_profiling
+from id_normalize import parse_int
+from output_writer import report_outputs, write_csv
 
 # Enable debugging
 DEBUG = True
@@ -16,6 +23,9 @@ manual_org_file = os.path.join(script_folder, 'Manual org ID link.csv')
 matched_file = os.path.join(script_folder, 'rg_matched.csv')
 fixed_file = os.path.join(script_folder, 'rg_fixed.csv')
 
+# Stage timings and memory when GC_ORG_PROFILE is set or --profile is passed
+start_profiling('rg_fuzzy')
+
 debug_print(f"Script folder: {script_folder}")
 debug_print(f"RG data file: {rg_data_file}")
 debug_print(f"Manual org file: {manual_org_file}")
@@ -64,7 +74,9 @@ def fuzzy_match(name, choices, threshold=80):
 
 # Perform fuzzy matching for rg_data_df
 debug_print("Starting fuzzy matching process...")
-matches = rg_names.apply(lambda x: fuzzy_match(x, manual_org_names))
+with stage('fuzzy match') as matching:
+    matches = rg_names.apply(lambda x: fuzzy_match(x, manual_org_names))
+    matching.rows(rg_names, matches)
 debug_print(f"Completed fuzzy matching: {len(matches)} results")
 
 # Create a DataFrame with the matching results
@@ -112,7 +124,9 @@ def lookup_org_details(matched_name):
 
 # Apply the lookup function to get Organization Legal Name English and gc_orgID
 debug_print("Looking up organization details...")
-org_details = match_df['MatchedName'].apply(lookup_org_details)
+with stage('org lookup') as lookup:
+    org_details = match_df['MatchedName'].apply(lookup_org_details)
+    lookup.rows(match_df, org_details)
 debug_print(f"Completed organization detail lookup: {len(org_details)} results")
 
 match_df['Organization Legal Name English'] = org_details.apply(lambda x: x[0] if x is not None else None)
@@ -155,7 +169,7 @@ if not missing_org_names.empty:
 final_df = match_df.copy()
 
 # Ensure 'rgnumber' values do not have decimals
-final_df['rgnumber'] = pd.to_numeric(final_df['rgnumber'], errors='coerce').fillna(0).astype(int)
+final_df['rgnumber'] = parse_int(final_df['rgnumber']).fillna(0)
 
 # Sort by 'MatchedName' and 'MatchScore' in descending order
 final_df = final_df.sort_values(by=['MatchedName', 'MatchScore'], ascending=[True, False])
@@ -172,7 +186,7 @@ final_df_matched = final_df[matched_columns]
 debug_print(f"Prepared final_df_matched with {len(final_df_matched)} rows and columns: {list(final_df_matched.columns)}")
 
 # Save the result to rg_matched.csv
-final_df_matched.to_csv(matched_file, index=False, encoding='utf-8-sig')
+write_csv(final_df_matched, matched_file, index=False, encoding='utf-8-sig')
 debug_print(f"Saved matched data to {matched_file}")
 
 # Update rg_fixed.csv with new entries from rg_matched.csv
@@ -269,8 +283,10 @@ updated_fixed_df = updated_fixed_df[fixed_columns]
 debug_print(f"Fixed columns final order: {list(updated_fixed_df.columns)}")
 
 # Save the updated fixed DataFrame to the CSV file
-updated_fixed_df.to_csv(fixed_file, index=False, encoding='utf-8-sig')
+write_csv(updated_fixed_df, fixed_file, index=False, encoding='utf-8-sig')
 debug_print(f"Saved fixed data to {fixed_file}")
 
 print(f"The matched names have been saved to {matched_file}")
 print(f"rg_fixed.csv has been updated with new entries from rg_matched.csv")
+stop_profiling(os.path.join(script_folder, '..', 'History'))
+report_outputs()
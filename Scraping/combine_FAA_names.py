@@ -2,6 +2,18 @@
 import os
 import glob
 import pandas as pd
+import sys
+
+# Shared output helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from build_profile import stage, start_profiling, stop_profiling
+from coalesce import coalesce_rows
+from output_writer import report_outputs, write_csv
+from overrides import apply_overrides, load_overrides
+
+# FAA schedules in priority order: an organization listed in several
+# schedules keeps the entry from the first one
+FAA_SCHEDULE_PRIORITY = ['1', 'i1', '2', '4', '3', '5']
 
 
 def remove_specific_values(dataframe, filename):
@@ -58,6 +70,9 @@ def main():
     # Path to the folder where the script is located
     script_folder = os.path.dirname(os.path.abspath(__file__))
 
+    # Stage timings and memory when GC_ORG_PROFILE is set or --profile is passed
+    start_profiling('combine_FAA_names')
+
     # List CSV files matching the pattern 'FAA*.csv' in the script's folder
     csv_files = glob.glob(os.path.join(script_folder, 'FAA*.csv'))
 
@@ -65,20 +80,22 @@ def main():
     dfs = []
 
     # Read each CSV file, filter out specific values, and append to the list
-    for file in csv_files:
-        try:
-            df = pd.read_csv(file)
-            
-            # Ensure all values in the 'FAA' column are strings
-            df['FAA'] = df['FAA'].astype(str)
-            
-            # Filter out specific values
-            df = remove_specific_values(df, os.path.basename(file))
-            
-            dfs.append(df)
-        except (pd.errors.EmptyDataError, pd.errors.ParserError,
-                FileNotFoundError) as error:
-            print(f"Error reading {file}: {error}")
+    with stage('load') as loaded:
+        for file in csv_files:
+            try:
+                df = pd.read_csv(file)
+
+                # Ensure all values in the 'FAA' column are strings
+                df['FAA'] = df['FAA'].astype(str)
+
+                # Filter out specific values
+                df = remove_specific_values(df, os.path.basename(file))
+
+                dfs.append(df)
+            except (pd.errors.EmptyDataError, pd.errors.ParserError,
+                    FileNotFoundError) as error:
+                print(f"Error reading {file}: {error}")
+        loaded.rows(rows_out=dfs)
 
     # Check if there are any DataFrames to concatenate
     if dfs:
@@ -90,53 +107,16 @@ def main():
         if unnamed_cols:
             combined_df = combined_df.drop(columns=unnamed_cols)
         
-        # Overrides: Add the specified information manually
-        new_data = {
-            'English Name': [
-                'Office of the Information Commissioner',
-                'Office of the Privacy Commissioner of Canada'
-            ],
-            'French Name': [
-                "Commissariat à l'information au Canada",
-                'Commissariat à la protection de la vie privée du Canada'
-            ],
-            'FAA': ['4', '4']
-        }
-        new_df = pd.DataFrame(new_data)
-        combined_df = pd.concat([combined_df, new_df], ignore_index=True)
-        
-        # Renaming: Update specific entries
-        combined_df.loc[
-            combined_df['English Name'] == (
-                "Registrar of the Supreme Court of Canada and that portion of the "
-                "federal public administration appointed under subsection 12(2) of "
-                "the Supreme Court Act"
-            ), 'English Name'
-        ] = "Registrar of the Supreme Court of Canada"
-        combined_df.loc[
-            combined_df['French Name'] == (
-                "Registraire de la Cour suprême du Canada et le secteur de l'administration publique fédérale nommé en vertu du paragraphe 12(2) de la Loi sur la Cour suprême"
-            ), 'French Name'
-        ] = "Registraire de la Cour suprême du Canada"
+        # Overrides: inserted organizations and renamed entries from Resources/overrides.csv
+        overrides_file = os.path.join(script_folder, '..', 'Resources', 'overrides.csv')
+        combined_df = apply_overrides(combined_df, 'combined_FAA_names', load_overrides(overrides_file))
 
         # Trim whitespace from English Name and French Name columns
         combined_df['English Name'] = combined_df['English Name'].str.replace('’', "'").str.strip()
         combined_df['French Name'] = combined_df['French Name'].str.replace('’', "'").str.strip()
         
-        # Define the priority order for the 'FAA' column
-        priority_order = {'1': 1, 'i1': 2, '2': 3, '4': 4, '3': 5, '5': 6}
-        
-        # Map the priority order to a new column
-        combined_df['priority'] = combined_df['FAA'].map(priority_order)
-        
-        # Sort the DataFrame based on English Name and priority
-        combined_df = combined_df.sort_values(by=['English Name', 'priority'])
-        
-        # Drop duplicates based ONLY on English Name, keeping the highest priority
-        combined_df = combined_df.drop_duplicates(subset=['English Name'], keep='first')
-        
-        # Drop the priority column as it's no longer needed
-        combined_df = combined_df.drop(columns=['priority'])
+        # Keep one entry per English Name, from the highest priority schedule
+        combined_df = coalesce_rows(combined_df, 'English Name', 'FAA', FAA_SCHEDULE_PRIORITY)
         
         # Sort the DataFrame based on the 'FAA' field for readability
         combined_df = combined_df.sort_values(by='FAA')
@@ -146,15 +126,18 @@ def main():
              
         # Save the combined DataFrame to a new CSV file with UTF-8 encoding
         output_file = os.path.join(script_folder, 'combined_FAA_names.csv')
-        combined_df.to_csv(
+        write_csv(
+            combined_df,
             output_file,
             index=False,
             encoding='utf-8-sig'
         )
         
         print(f"Created {output_file}")
+        report_outputs()
     else:
         print("No CSV files found to combine")
+    stop_profiling(os.path.join(script_folder, '..', 'History'))
 
 
 if __name__ == "__main__":
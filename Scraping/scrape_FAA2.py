@@ -3,6 +3,11 @@ import requests
 import pandas as pd
 import xml.etree.ElementTree as ET
 import re
+import sys
+
+# Shared output helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from output_writer import report_outputs, write_csv
 
 # Function to remove namespaces
 def remove_namespace(doc, namespace):
@@ -65,7 +70,8 @@ if response.status_code == 200:
     
     # Save the DataFrame to a CSV file with UTF-8 encoding in the scripts folder
     output_file_path = os.path.join(script_folder, 'FAA 2 names.csv')
-    df.to_csv(output_file_path, index=True, encoding='utf-8-sig')
+    write_csv(df, output_file_path, index=True, encoding='utf-8-sig')
+    report_outputs()
     print(f"DataFrame saved to {output_file_path}")
 else:
     print(f'Failed to retrieve the XML file. Status code: {response.status_code}')
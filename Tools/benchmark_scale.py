@@ -0,0 +1,360 @@
+"""
+Scale benchmark of the gc_concordance / gc_org_info build on synthetic sources.
+
+For each requested size the generator writes a consistent set of source
+files (Manual org ID link, the FAA schedules, applied_en, Infobase EN/FR,
+rg_final, manual pop phoenix, lead_manual, the lead ministers and
+overrides) into a scratch folder laid out like the repository.
+combine_FAA_names.py and create_harmonized_name.py then run in that folder,
+followed by the build of build_gc_org.py, with build_profile.py collecting
+per-stage timings.
+
+For every stage the report gives the time at each size and the scaling
+exponent between the two largest sizes: about 1 is linear, and 2 or more
+points at a quadratic hotspot (a row-wise apply or a per-row lookup).
+
+Examples:
+    python Tools/benchmark_scale.py --sizes 1000 10000 100000
+    python Tools/benchmark_scale.py --sizes 1000 10000 --json scale.json --plot scale.png
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Shared build modules live in the repository root
+repository_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, repository_folder)
+from build_gc_org import build_and_publish, load_dataframes
+from build_profile import stage, start_profiling, stop_profiling
+
+# First synthetic gc_orgID, far above the real ones
+FIRST_ID = 100000
+# One lead department per this many organizations
+PORTFOLIO_SIZE = 20
+FAA_SCHEDULES = ['1', 'i1', '2', '3', '4', '5']
+# Share of FAA organizations also listed in a second schedule
+FAA_REPEATED = 0.05
+# Exponent between the two largest sizes above which a stage is flagged
+SUPERLINEAR = 1.3
+
+
+def write_source(df, folder, relative_path, encoding='utf-8-sig'):
+    """Write one synthetic source file under folder."""
+    path = os.path.join(folder, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_csv(path, index=False, encoding=encoding)
+
+
+def pick(rng, n, share):
+    """Return a sorted random subset of range(n) of the given share."""
+    return np.sort(rng.choice(n, size=int(n * share), replace=False))
+
+
+def generate_sources(folder, n_orgs, seed=0):
+    """
+    Write a consistent set of synthetic build sources.
+
+    Every source refers to the same organizations, with the coverage of the
+    real files (rg_final.csv is written directly, next to the rg_matched.csv
+    and rg_fixed.csv it would be built from): most organizations are in the
+    FAA schedules, applied_en and Infobase, some have RG numbers, every one
+    has a lead department and POP/Phoenix row, a few RG entries match no
+    organization and about one in a hundred organizations has an override.
+
+    Args:
+        folder: Scratch folder laid out like the repository
+        n_orgs: Number of organizations
+        seed: Random seed, so a size always produces the same files
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.arange(n_orgs)
+    gc_orgids = (FIRST_ID + numbers).astype(str)
+    legal_en = np.char.add('Synthetic Organization ', numbers.astype(str))
+    legal_fr = np.char.add('Organisation synthétique ', numbers.astype(str))
+    applied_en = np.char.add('Applied Organization ', numbers.astype(str))
+    applied_fr = np.char.add("Organisation d'usage ", numbers.astype(str))
+
+    write_source(pd.DataFrame({
+        'gc_orgID': gc_orgids,
+        'Organization Legal Name English': legal_en,
+        'Organization Legal Name French': legal_fr,
+    }), folder, 'Resources/Manual org ID link.csv')
+
+    # FAA schedules as the scrapers write them; a few organizations are
+    # listed in two schedules, for combine_FAA_names.py to pick one
+    # (drawn from their own generator so the other sources stay the same)
+    in_faa = pick(rng, n_orgs, 0.9)
+    schedules = rng.choice(FAA_SCHEDULES, size=len(in_faa))
+    repeat_rng = np.random.default_rng([seed, 1])
+    repeated = pick(repeat_rng, len(in_faa), FAA_REPEATED)
+    listed = np.concatenate([in_faa, in_faa[repeated]])
+    faa = pd.DataFrame({
+        'English Name': legal_en[listed],
+        'French Name': legal_fr[listed],
+        'FAA': np.concatenate([schedules, repeat_rng.choice(FAA_SCHEDULES, size=len(repeated))]),
+    })
+    for schedule, entries in faa.groupby('FAA'):
+        write_source(entries.reset_index(drop=True).reset_index().rename(columns={'index': ''}),
+                     folder, f'Scraping/FAA {schedule} names.csv')
+
+    in_applied = pick(rng, n_orgs, 0.6)
+    write_source(pd.DataFrame({
+        'Legal title': legal_en[in_applied],
+        'Applied title': applied_en[in_applied],
+        "Titre d'usage": applied_fr[in_applied],
+        'Abbreviation': np.char.add('SO', in_applied.astype(str)),
+        'Abreviation': np.char.add('OS', in_applied.astype(str)),
+    }), folder, 'Resources/applied_en.csv')
+
+    in_infobase = pick(rng, n_orgs, 0.7)
+    infobase_ids = in_infobase + 1
+    websites = np.char.add(np.char.add('www.org', in_infobase.astype(str)), '.gc.ca')
+    write_source(pd.DataFrame({
+        'OrgID': infobase_ids,
+        'Legal title': legal_en[in_infobase],
+        'Website': websites,
+        'Status': rng.choice(['a', 'i'], size=len(in_infobase), p=[0.9, 0.1]),
+        'End date': '',
+    }), folder, 'Resources/infobase_en.csv')
+    write_source(pd.DataFrame({
+        'OrgID': infobase_ids,
+        'Appellation legale': legal_fr[in_infobase],
+        'Titre applique': legal_fr[in_infobase],
+        'Site Web': websites,
+    }), folder, 'Resources/infobase_fr.csv')
+
+    # RG numbers, plus RG entries without an organization (gc_orgID 0)
+    in_rg = pick(rng, n_orgs, 0.4)
+    n_rg_unmatched = max(1, n_orgs // 100)
+    rg_names = np.concatenate([legal_en[in_rg], np.char.add('RG Entry ', np.arange(n_rg_unmatched).astype(str))])
+    write_source(pd.DataFrame({
+        'RGOriginalName': rg_names,
+        'rgnumber': np.arange(1, len(rg_names) + 1),
+        'MatchedName': rg_names,
+        'MatchScore': 100,
+        'gc_orgID': np.concatenate([gc_orgids[in_rg], np.zeros(n_rg_unmatched, dtype=int).astype(str)]),
+        'Organization Legal Name English': '',
+    }), folder, 'Resources/rg_final.csv')
+
+    # The RG match inputs rg_final.csv is built from: weak fuzzy matches in
+    # rg_matched.csv are corrected by the manual entries in rg_fixed.csv
+    weak = rng.random(len(rg_names)) < 0.2
+    weak[len(in_rg):] = True
+    wrong = rng.integers(0, n_orgs, size=len(rg_names))
+    correct_ids = np.concatenate([gc_orgids[in_rg], np.full(n_rg_unmatched, '')])
+    write_source(pd.DataFrame({
+        'RGOriginalName': rg_names,
+        'rgnumber': np.arange(1, len(rg_names) + 1),
+        'MatchedName': np.where(weak, legal_en[wrong], rg_names),
+        'MatchScore': np.where(weak, 85.5, 100.0),
+        'gc_orgID': np.where(weak, gc_orgids[wrong], correct_ids),
+    }), folder, 'Resources/rg_matched.csv')
+    write_source(pd.DataFrame({
+        'RGOriginalName': rg_names,
+        'rgnumber': np.arange(1, len(rg_names) + 1),
+        'MatchedName': np.concatenate([legal_en[in_rg], np.full(n_rg_unmatched, '')]),
+        'MatchScore': 100.0,
+        'Organization Legal Name English': '',
+        'gc_orgID': np.char.add(correct_ids, np.where(correct_ids == '', '', '.0')),
+    }), folder, 'Resources/rg_fixed.csv')
+
+    write_source(pd.DataFrame({
+        'gc_orgID': gc_orgids,
+        'Harmonize_name': legal_en,
+        'open_gov_ouvert': rng.choice(['', 'Y', 'N'], size=n_orgs),
+        'ati': rng.choice(['', 'Y', 'N'], size=n_orgs),
+        'pop': np.char.add('P', (numbers % 997).astype(str)),
+        'phoenix': np.char.add('X', (numbers % 991).astype(str)),
+    }), folder, 'Resources/manual pop phoenix.csv')
+
+    # Portfolios: the first organization of each block is the lead department,
+    # and each lead department reports to a minister
+    lead = numbers - numbers % PORTFOLIO_SIZE
+    n_ministers = (n_orgs + PORTFOLIO_SIZE - 1) // PORTFOLIO_SIZE
+    min_ids = np.char.add('m', np.char.zfill(np.arange(1, n_ministers + 1).astype(str), 6))
+    parents = np.where(lead == numbers, min_ids[lead // PORTFOLIO_SIZE], gc_orgids[lead])
+    write_source(pd.DataFrame({
+        'gc_orgID': gc_orgids,
+        'Parent GC OrgID': parents,
+        'Harmonized GC Name': legal_en,
+        'lead_department': legal_en[lead],
+        'ministère_responsable': legal_fr[lead],
+    }), folder, 'Resources/lead_manual.csv', encoding='utf-8')
+    write_source(pd.DataFrame({
+        'minID': min_ids,
+        'Title': np.char.add('Minister of Portfolio ', np.arange(1, n_ministers + 1).astype(str)),
+        'Titre': np.char.add('Ministre du portefeuille ', np.arange(1, n_ministers + 1).astype(str)),
+    }), folder, 'Resources/lead_code_ministers.csv')
+
+    overridden = pick(rng, n_orgs, 0.01)
+    overrides = [
+        ('gc_concordance', 'set', 'gc_orgID', gc_orgid, 'abbreviation', f'OVR{gc_orgid}', 'synthetic')
+        for gc_orgid in gc_orgids[overridden]
+    ] + [
+        ('gc_org_info', 'set', 'gc_orgID', gc_orgid, 'preferred_name', f'Preferred {gc_orgid}', 'synthetic')
+        for gc_orgid in gc_orgids[overridden]
+    ]
+    write_source(pd.DataFrame(overrides, columns=['table', 'action', 'key_field', 'key', 'field', 'value', 'reason']),
+                 folder, 'Resources/overrides.csv', encoding='utf-8')
+
+
+def run_script(folder, relative_path):
+    """
+    Run a copy of a pipeline script placed in a generated folder.
+
+    The scripts find their files next to themselves, so the copy works on
+    the synthetic sources. Their printed output is discarded.
+    """
+    script = os.path.join(folder, relative_path)
+    shutil.copy(os.path.join(repository_folder, relative_path), script)
+    saved_path = list(sys.path)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(script, run_name='__main__')
+    finally:
+        sys.path[:] = saved_path
+
+
+def run_build(folder, trace_memory=False):
+    """
+    Run the FAA name and harmonized name scripts and the build against a
+    generated folder.
+
+    Args:
+        folder: Folder written by generate_sources
+        trace_memory: Also record peak memory (slows the timed stages down)
+
+    Returns:
+        Profile report from build_profile.py
+    """
+    paths = {
+        'script': folder,
+        'resources': os.path.join(folder, 'Resources'),
+        'scraping': os.path.join(folder, 'Scraping'),
+    }
+    start_profiling('benchmark_scale', argv=['--profile'], trace_memory=trace_memory)
+    try:
+        with stage('combine FAA names'):
+            run_script(folder, os.path.join('Scraping', 'combine_FAA_names.py'))
+        with stage('harmonized names'):
+            run_script(folder, 'create_harmonized_name.py')
+        try:
+            build_and_publish(load_dataframes(paths), folder)
+        except ValueError as e:
+            print(f"    {e}")
+    finally:
+        profile = stop_profiling(os.path.join(folder, 'History'))
+    return profile
+
+
+def stage_times(profile):
+    """Sum the wall time of each top-level stage of a profile report."""
+    times = {}
+    for record in profile['stages']:
+        if record['parent'] is None:
+            times[record['stage']] = times.get(record['stage'], 0.0) + record['wall_seconds']
+    return times
+
+
+def scaling_exponent(sizes, seconds):
+    """Return the log-log slope between the two largest sizes."""
+    if len(sizes) < 2 or min(seconds[-2:]) <= 0:
+        return None
+    return math.log(seconds[-1] / seconds[-2]) / math.log(sizes[-1] / sizes[-2])
+
+
+def print_results(results):
+    """Print the stage timings and scaling exponents."""
+    sizes = [result['orgs'] for result in results]
+    stages = list(results[-1]['stages'])
+    print(f"{'stage':<20}" + ''.join(f"{size:>12,}" for size in sizes) + f"{'exponent':>10}")
+    for name in stages + ['total']:
+        seconds = [result['stages'].get(name, 0.0) if name != 'total' else result['total'] for result in results]
+        exponent = scaling_exponent(sizes, seconds)
+        flag = ' <-' if exponent is not None and exponent > SUPERLINEAR else ''
+        print(f"{name:<20}" + ''.join(f"{value:>12.3f}" for value in seconds)
+              + (f"{exponent:>10.2f}" if exponent is not None else f"{'':>10}") + flag)
+    if len(sizes) > 1:
+        print(f"\nStages marked <- grow faster than n^{SUPERLINEAR} between the two largest sizes.")
+
+
+def plot_results(results, plot_file):
+    """Plot stage time against size on log-log axes (needs matplotlib)."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed; skipping the plot")
+        return
+
+    sizes = [result['orgs'] for result in results]
+    figure, axes = plt.subplots(figsize=(9, 6))
+    for name in results[-1]['stages']:
+        axes.plot(sizes, [result['stages'].get(name, 0.0) for result in results], marker='o', label=name)
+    axes.plot(sizes, [result['total'] for result in results], marker='o', color='black', linewidth=2, label='total')
+    axes.set_xscale('log')
+    axes.set_yscale('log')
+    axes.set_xlabel('organizations')
+    axes.set_ylabel('wall time (s)')
+    axes.set_title('Build stage scaling')
+    axes.legend(fontsize='small')
+    figure.tight_layout()
+    figure.savefig(plot_file)
+    print(f"Plot written to {plot_file}")
+
+
+def main():
+    """Generate synthetic sources at each size and time every build stage."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='numbers of organizations, from 1000 to 1000000')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='write the results to this JSON file')
+    parser.add_argument('--plot', help='write a log-log plot to this image file')
+    parser.add_argument('--memory', action='store_true',
+                        help='also record peak memory with tracemalloc (inflates the timings)')
+    parser.add_argument('--keep', action='store_true', help='keep the generated folders')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = []
+    for size in sorted(args.sizes):
+        folder = tempfile.mkdtemp(prefix=f'gc_org_scale_{size}_')
+        print(f"{size:,} organizations: generating sources in {folder}")
+        generate_sources(folder, size, seed=args.seed)
+        print(f"{size:,} organizations: building")
+        profile = run_build(folder, trace_memory=args.memory)
+        results.append({
+            'orgs': size,
+            'total': profile['wall_seconds'],
+            'peak_memory_mb': profile['peak_memory_mb'],
+            'stages': stage_times(profile),
+        })
+        if not args.keep:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    print()
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+    if args.plot:
+        plot_results(results, args.plot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Repeatable benchmark of typical queries against gc_org.sqlite.
+
+Each query is run a fixed number of times against the published database and
+the median and best times are reported, so results can be compared between
+builds or machines. Build the database first with publish_sqlite.py.
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import time
+
+# Typical lookups made by the tools that read the database
+QUERIES = {
+    'lookup by gc_orgID':
+        "SELECT * FROM concordance WHERE gc_orgID = 2222",
+    'lookup by rg':
+        "SELECT gc_orgID, harmonized_name FROM concordance WHERE rg = 88",
+    'lookup by pop':
+        "SELECT gc_orgID FROM concordance WHERE pop = 'AGR'",
+    'join org info to concordance':
+        "SELECT i.gc_orgID, i.lead_department, c.rg, c.phoenix "
+        "FROM org_info i JOIN concordance c ON c.gc_orgID = i.gc_orgID",
+    'portfolio of a lead department':
+        "SELECT h.gc_orgID, h.harmonized_name FROM lead_hierarchy h "
+        "WHERE h.parent_id = '2222'",
+    'ministry portfolio with titles':
+        "SELECT m.title, h.gc_orgID FROM ministries m "
+        "JOIN lead_hierarchy h ON h.parent_id = m.minID",
+    'RG crosswalk join':
+        "SELECT r.rgnumber, c.harmonized_name FROM rg_crosswalk r "
+        "JOIN concordance c ON c.gc_orgID = r.gc_orgID",
+    'full text search (English)':
+        "SELECT gc_orgID FROM org_names_fts WHERE org_names_fts MATCH 'health' ORDER BY rank LIMIT 10",
+    'full text search (French, no accents)':
+        "SELECT gc_orgID FROM org_names_fts WHERE org_names_fts MATCH 'sante' ORDER BY rank LIMIT 10",
+    'full text prefix search':
+        "SELECT gc_orgID FROM org_names_fts WHERE org_names_fts MATCH 'commiss*' ORDER BY rank LIMIT 10",
+}
+
+
+def time_query(connection, sql, repeat):
+    """Return the run times of a query in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        connection.execute(sql).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    """Run every benchmark query and print its median and best time."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--database', default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'gc_org.sqlite'))
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        print(f"Database not found: {args.database}. Run publish_sqlite.py first.")
+        return 1
+
+    connection = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    print(f"{'query':<40} {'median ms':>10} {'best ms':>10}")
+    for name, sql in QUERIES.items():
+        timings = time_query(connection, sql, args.repeat)
+        print(f"{name:<40} {statistics.median(timings):>10.3f} {min(timings):>10.3f}")
+    connection.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Check that the lightweight lookup path stays fast to import.
+
+Each module is imported in a fresh interpreter so earlier imports do not hide
+its cost. The check fails if a module pulls in pandas or numpy at import time,
+or if importing it takes longer than the budget.
+"""
+import os
+import subprocess
+import sys
+
+# Modules that must only depend on the standard library at import time
+LIGHTWEIGHT_MODULES = ['org_registry', 'lookup_org', 'autocomplete', 'org_history']
+
+# Import budget per module, in milliseconds
+IMPORT_BUDGET_MS = 150
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = (time.perf_counter() - start) * 1000\n"
+    "heavy = [name for name in ('pandas', 'numpy') if name in sys.modules]\n"
+    "print(f'{{elapsed:.1f}} {{\",\".join(heavy)}}')\n"
+)
+
+
+def measure(module, repo_folder):
+    """Return (milliseconds, heavy modules loaded) for importing one module."""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module)],
+        cwd=repo_folder, capture_output=True, text=True, check=True
+    )
+    elapsed, _, heavy = result.stdout.strip().partition(' ')
+    return float(elapsed), [name for name in heavy.split(',') if name]
+
+
+def main():
+    """Measure each lightweight module and report any that exceed the budget."""
+    repo_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    failures = 0
+    for module in LIGHTWEIGHT_MODULES:
+        elapsed, heavy = measure(module, repo_folder)
+        status = 'ok'
+        if heavy:
+            status = f"FAIL: imports {', '.join(heavy)}"
+            failures += 1
+        elif elapsed > IMPORT_BUDGET_MS:
+            status = f"FAIL: over {IMPORT_BUDGET_MS} ms budget"
+            failures += 1
+        print(f"{module}: {elapsed:.1f} ms - {status}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
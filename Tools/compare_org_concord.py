@@ -1,91 +1,170 @@
+"""
+Compare gc_org_info.csv and gc_concordance.csv.
+
+Checks that both files list the same organizations, once each, with the
+same harmonized names in English and French. The comparison only uses the
+standard library, so the tool starts without importing pandas; records found
+in only one file and name mismatches are saved as CSV files for review.
+
+With --validate, the same checks are run through validate_build.py instead
+(as during every build) on the published files and the sources they were
+built from, and the result is written to org_concord_report.json.
+"""
+import argparse
+import csv
+import io
 import os
-import pandas as pd
 import sys
+from collections import Counter
+
+# Shared output helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from output_writer import report_outputs, write_text
 
 # Define the paths to the CSV files in the parent folder
 parent_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 gc_org_info_path = os.path.join(parent_folder, 'gc_org_info.csv')
 gc_concordance_path = os.path.join(parent_folder, 'gc_concordance.csv')
 
-# Load the CSV files with error handling
-try:
-    gc_org_info_df = pd.read_csv(gc_org_info_path)
-    print(f"Successfully loaded {gc_org_info_path}")
-    print(f"Number of records in gc_org_info: {len(gc_org_info_df)}")
-except Exception as e:
-    print(f"Error loading {gc_org_info_path}: {str(e)}")
-    sys.exit(1)
-
-try:
-    gc_concordance_df = pd.read_csv(gc_concordance_path)
-    print(f"Successfully loaded {gc_concordance_path}")
-    print(f"Number of records in gc_concordance: {len(gc_concordance_df)}")
-except Exception as e:
-    print(f"Error loading {gc_concordance_path}: {str(e)}")
-    sys.exit(1)
-
-# Check for duplicates in gc_orgID
-dup_info = gc_org_info_df['gc_orgID'].duplicated().sum()
-dup_concord = gc_concordance_df['gc_orgID'].duplicated().sum()
-if dup_info > 0 or dup_concord > 0:
-    print(f"\nWARNING: Found duplicates - gc_org_info: {dup_info}, gc_concordance: {dup_concord}")
-
-# Ensure gc_orgID has the same type in both dataframes
-gc_org_info_df['gc_orgID'] = gc_org_info_df['gc_orgID'].astype(str)
-gc_concordance_df['gc_orgID'] = gc_concordance_df['gc_orgID'].astype(str)
-
-# Check for records present in one file but not the other
-print("\nAnalyzing records across datasets...")
-info_only = gc_org_info_df[~gc_org_info_df['gc_orgID'].isin(gc_concordance_df['gc_orgID'])]
-concord_only = gc_concordance_df[~gc_concordance_df['gc_orgID'].isin(gc_org_info_df['gc_orgID'])]
-
-if len(info_only) > 0:
-    print(f"Found {len(info_only)} records in gc_org_info but not in gc_concordance")
-    # Save these records for reference
-    info_only.to_csv(os.path.join(parent_folder, 'info_only_records.csv'), index=False)
-    
-if len(concord_only) > 0:
-    print(f"Found {len(concord_only)} records in gc_concordance but not in gc_org_info")
-    # Save these records for reference
-    concord_only.to_csv(os.path.join(parent_folder, 'concord_only_records.csv'), index=False)
-
-# Merge datasets for comparison on common records
-print("\nComparing name values in common records...")
-common_records = pd.merge(
-    gc_org_info_df, 
-    gc_concordance_df, 
-    on='gc_orgID', 
-    how='inner',
-    suffixes=('_info', '_concordance')
-)
-
-# Find mismatches in harmonized names
-mismatches = common_records[
-    (common_records['harmonized_name_info'] != common_records['harmonized_name_concordance']) |
-    (common_records['nom_harmonisé_info'] != common_records['nom_harmonisé_concordance'])
-]
-
-# Report results
-print(f"\nSummary:")
-print(f"- Common records: {len(common_records)}")
-print(f"- Mismatches found: {len(mismatches)}")
-
-if len(mismatches) > 0:
-    print("\nMismatches detected. Saving to 'mismatches.csv'")
-    
-    # Create a clean view of mismatches focusing only on the differences
-    mismatch_view = mismatches[['gc_orgID', 
-                               'harmonized_name_info', 'harmonized_name_concordance',
-                               'nom_harmonisé_info', 'nom_harmonisé_concordance']]
-    
-    # Save mismatches to a CSV file for further analysis
-    mismatch_file = os.path.join(parent_folder, 'mismatches.csv')
-    mismatch_view.to_csv(mismatch_file, index=False)
-else:
-    print("\nNo mismatches found in common records.")
-
-# Overall assessment
-if len(info_only) > 0 or len(concord_only) > 0 or len(mismatches) > 0:
-    print("\nDiscrepancies found between the datasets. See output files for details.")
-else:
-    print("\nThe datasets are consistent.")
+# validate_build checks covering the same ground as the comparison
+CHECK_PREFIXES = ['agreement:', 'unique:gc_']
+
+
+def read_rows(path):
+    """Read a CSV file into a list of dictionaries (standard library only)."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+def write_rows(path, fieldnames, rows):
+    """Write a list of dictionaries to a CSV file."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
+    write_text(path, buffer.getvalue())
+
+
+def load_rows(path, name):
+    """Read one of the published files, exiting with status 1 if it cannot be read."""
+    try:
+        fields, rows = read_rows(path)
+    except Exception as e:
+        print(f"Error loading {path}: {str(e)}")
+        sys.exit(1)
+    print(f"Successfully loaded {path}")
+    print(f"Number of records in {name}: {len(rows)}")
+    return fields, rows
+
+
+def compare_files():
+    """
+    Compare the published files with the standard library.
+
+    Returns:
+        True if the datasets are consistent
+    """
+    gc_org_info_fields, gc_org_info_rows = load_rows(gc_org_info_path, 'gc_org_info')
+    gc_concordance_fields, gc_concordance_rows = load_rows(gc_concordance_path, 'gc_concordance')
+
+    # Check for duplicates in gc_orgID
+    info_counts = Counter(row['gc_orgID'] for row in gc_org_info_rows)
+    concord_counts = Counter(row['gc_orgID'] for row in gc_concordance_rows)
+    dup_info = sum(count - 1 for count in info_counts.values())
+    dup_concord = sum(count - 1 for count in concord_counts.values())
+    if dup_info > 0 or dup_concord > 0:
+        print(f"\nWARNING: Found duplicates - gc_org_info: {dup_info}, gc_concordance: {dup_concord}")
+
+    # Check for records present in one file but not the other
+    print("\nAnalyzing records across datasets...")
+    info_only = [row for row in gc_org_info_rows if row['gc_orgID'] not in concord_counts]
+    concord_only = [row for row in gc_concordance_rows if row['gc_orgID'] not in info_counts]
+
+    if len(info_only) > 0:
+        print(f"Found {len(info_only)} records in gc_org_info but not in gc_concordance")
+        # Save these records for reference
+        write_rows(os.path.join(parent_folder, 'info_only_records.csv'), gc_org_info_fields, info_only)
+
+    if len(concord_only) > 0:
+        print(f"Found {len(concord_only)} records in gc_concordance but not in gc_org_info")
+        # Save these records for reference
+        write_rows(os.path.join(parent_folder, 'concord_only_records.csv'), gc_concordance_fields, concord_only)
+
+    # Compare name values on common records
+    print("\nComparing name values in common records...")
+    concordance_by_id = {}
+    for row in gc_concordance_rows:
+        concordance_by_id.setdefault(row['gc_orgID'], []).append(row)
+
+    mismatches = []
+    common_count = 0
+    for info_row in gc_org_info_rows:
+        for concord_row in concordance_by_id.get(info_row['gc_orgID'], []):
+            common_count += 1
+            if (info_row['harmonized_name'] != concord_row['harmonized_name'] or
+                    info_row['nom_harmonisé'] != concord_row['nom_harmonisé']):
+                mismatches.append({
+                    'gc_orgID': info_row['gc_orgID'],
+                    'harmonized_name_info': info_row['harmonized_name'],
+                    'harmonized_name_concordance': concord_row['harmonized_name'],
+                    'nom_harmonisé_info': info_row['nom_harmonisé'],
+                    'nom_harmonisé_concordance': concord_row['nom_harmonisé'],
+                })
+
+    # Report results
+    print(f"\nSummary:")
+    print(f"- Common records: {common_count}")
+    print(f"- Mismatches found: {len(mismatches)}")
+
+    if len(mismatches) > 0:
+        print("\nMismatches detected. Saving to 'mismatches.csv'")
+
+        # Save mismatches to a CSV file for further analysis
+        mismatch_file = os.path.join(parent_folder, 'mismatches.csv')
+        write_rows(mismatch_file, list(mismatches[0]), mismatches)
+    else:
+        print("\nNo mismatches found in common records.")
+
+    return not (dup_info or dup_concord or info_only or concord_only or mismatches)
+
+
+def validate_files():
+    """
+    Run the matching validate_build checks and write org_concord_report.json.
+
+    Returns:
+        True if the datasets are consistent
+    """
+    # Imported here so the default comparison does not load pandas or the sources
+    import validate_build
+
+    report = validate_build.validate_files(parent_folder)
+    report['checks'] = [check for check in report['checks']
+                        if check['check'].startswith(tuple(CHECK_PREFIXES))]
+    report['passed'] = all(check['passed'] for check in report['checks'])
+
+    validate_build.print_report(report)
+    write_text(os.path.join(parent_folder, 'org_concord_report.json'), validate_build.report_json(report))
+    return report['passed']
+
+
+def main():
+    """Compare gc_org_info.csv and gc_concordance.csv."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--validate', action='store_true',
+                        help='run the checks of validate_build.py and write org_concord_report.json')
+    args = parser.parse_args()
+
+    consistent = validate_files() if args.validate else compare_files()
+
+    # Overall assessment
+    if consistent:
+        print("\nThe datasets are consistent.")
+    else:
+        print("\nDiscrepancies found between the datasets. See output files for details.")
+    report_outputs()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,76 @@
+"""
+Create PDF reports of lead departments and their associated organizations.
+
+Produces lead_department.pdf (one section per lead department, followed by
+the Regional Development Agencies page) and orgs_without_lead_department.pdf.
+
+Each section is rendered on its own and cached in Tools/.pdf_cache under a
+hash of its rows and of this script, so a change to one organization only
+re-renders its department. Sections that are not cached are rendered in
+parallel worker processes, then merged with page numbers stamped across the
+whole document. Without pypdf the report is rendered in one pass instead.
+"""
+import hashlib
+import json
+from datetime import datetime
 import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
-from fpdf import FPDF
+from fpdf import FPDF, FPDF_VERSION
+
+# Shared output helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from id_normalize import normalize_gc_orgid
+from output_writer import atomic_output, file_hash, report_outputs
 
 # Get the directory of the current script
 script_folder = os.path.dirname(os.path.abspath(__file__))
-
-# Read the CSV data
-data_file = os.path.join(script_folder, '..', 'gc_org_info.csv')
-data = pd.read_csv(data_file)
+cache_folder = os.path.join(script_folder, '.pdf_cache')
 resources_folder = os.path.join(script_folder, '..', 'Resources')
+data_file = os.path.join(script_folder, '..', 'gc_org_info.csv')
 manual_lead_department_file = os.path.join(resources_folder, 'lead_manual.csv')
 
-# Fill NaN values with an empty string
-data['harmonized_name'] = data['harmonized_name'].fillna('')
-data['lead_department'] = data['lead_department'].fillna('')
-data['gc_orgID'] = data['gc_orgID'].fillna('')
+# Any change to this script (and so to the layout) invalidates the cached sections
+LAYOUT_HASH = file_hash(os.path.abspath(__file__))
 
-# Filter out rows with empty lead_department
-data = data[data['lead_department'] != '']
+# List of gc_orgID for the special page
+special_gc_orgIDs = ['2240', '2244', '2249', '2257', '2258', '2298', '2299']
 
-# Group data by lead_department
-grouped = data.groupby('lead_department')
+REPORT_TITLE = 'Lead Departments and their Associated Organizations'
+NO_LEAD_TITLE = 'Organizations without a Lead Department'
+
+# Written instead of the render time, so an unchanged report renders byte-identical
+CREATION_DATE = datetime(2025, 3, 19, 18, 1, 0)
 
-# List of gc_orgID for the special page
-special_gc_orgIDs = [2240, 2244, 2249, 2257, 2258, 2298, 2299]
 
-# Filter data for the special page
-special_data = data[data['gc_orgID'].isin(special_gc_orgIDs)]
+class ReportPDF(FPDF):
+    """FPDF document stamped with CREATION_DATE rather than the current time."""
 
-class PDF(FPDF):
     def __init__(self, orientation='P', unit='mm', format='A4'):
+        super().__init__(orientation, unit, format)
+        if hasattr(self, 'set_creation_date'):  # fpdf2
+            self.set_creation_date(CREATION_DATE)
+
+    def _putinfo(self):
+        # fpdf 1.7.2 always writes the current time into the info dictionary
+        self._out('/Producer ' + self._textstring('PyFPDF ' + FPDF_VERSION + ' http://pyfpdf.googlecode.com/'))
+        for key in ['title', 'subject', 'author', 'keywords', 'creator']:
+            if hasattr(self, key):
+                self._out(f'/{key.capitalize()} ' + self._textstring(getattr(self, key)))
+        self._out('/CreationDate ' + self._textstring('D:' + CREATION_DATE.strftime('%Y%m%d%H%M%S')))
+
+
+class PDF(ReportPDF):
+    def __init__(self, orientation='P', unit='mm', format='A4', number_pages=True):
         super().__init__(orientation, unit, format)
         self.disable_footer = False
-        self.set_title('Lead Departments and their Associated Organizations')
+        # Sections rendered on their own get page numbers when they are merged
+        self.number_pages = number_pages
+        self.set_title(REPORT_TITLE)
         self.set_author('OCIO - TBS')
 
     def header(self):
@@ -41,7 +79,7 @@ class PDF(FPDF):
         self.set_y(10)
         self.set_font('Arial', 'B', 12)
         self.set_text_color(255, 255, 255) # Set text color to white
-        self.cell(0, 10, 'Lead Departments and their Associated Organizations', 0, 1, 'C')
+        self.cell(0, 10, REPORT_TITLE, 0, 1, 'C')
 
     def chapter_title(self, lead_department):
         self.set_y(33)  # Move the chapter title down to start at the 33rd pixel
@@ -51,13 +89,13 @@ class PDF(FPDF):
         self.ln(6)
         self.title_y = self.get_y()       # Store the y-coordinate of the title
 
-    def chapter_body(self, departments):
+    def chapter_body(self, rows):
         self.set_font('Arial', '', 12)
         self.set_draw_color(89, 89, 89)    # Set draw color to grey (#595959)
         self.body_start_y = self.get_y()   # Store the starting y-coordinate of the body
-        for index, row in departments.iterrows():
+        for harmonized_name, gc_orgid in rows:
             self.set_x(30)  # Move the body text to the right by 30 pixels
-            self.cell(0, 8, f"{row['harmonized_name']} - GC Org ID: {row['gc_orgID']}", 1, 1)  # Add a grey outline box around the text with reduced height
+            self.cell(0, 8, f"{harmonized_name} - GC Org ID: {gc_orgid}", 1, 1)  # Add a grey outline box around the text with reduced height
             self.ln(2)  # Add 2 pixels of space beneath each line
             self.set_draw_color(89, 89, 89)
             # Draw horizontal line centered vertically in the cell
@@ -71,11 +109,10 @@ class PDF(FPDF):
         if not self.disable_footer:
             self.set_draw_color(89, 89, 89)    # Set draw color to grey (#595959)
             self.line(10, self.title_y - 6, 10, self.body_end_y - 6)
-            self.set_y(-15)
-            self.set_font('Arial', 'I', 8)
-            self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+            if self.number_pages:
+                draw_page_number(self, self.page_no())
 
-    def special_page(self, data):
+    def special_page(self, rows):
         self.add_page()
         # Disable footer for this special page
         self.disable_footer = True
@@ -88,35 +125,16 @@ class PDF(FPDF):
         self.cell(95, 10, 'Lead Department', 1)
         self.ln()
         self.set_font('Arial', '', 7)
-        for index, row in data.iterrows():
-            self.cell(95, 10, f"{row['harmonized_name']} - GC Org ID: {row['gc_orgID']}", 1)
-            self.cell(95, 10, row['lead_department'], 1)
+        for harmonized_name, gc_orgid, lead_department in rows:
+            self.cell(95, 10, f"{harmonized_name} - GC Org ID: {gc_orgid}", 1)
+            self.cell(95, 10, lead_department, 1)
             self.ln()
 
-# Create a PDF object
-pdf = PDF()
-
-# Add a page for each lead department excluding the special ones
-for lead_department, group in grouped:
-    if lead_department not in special_data['lead_department'].unique():
-        pdf.add_page()
-        pdf.chapter_title(lead_department)
-        pdf.chapter_body(group)
 
-# Add the special page at the end (footer disabled on this page)
-pdf.special_page(special_data)
-
-# Save the PDF in the Tools folder
-output_file = os.path.join(script_folder, 'lead_department.pdf')
-pdf.output(output_file)
-
-print("PDF created successfully.")
-
-# Create a PDF for organizations without a lead department
-class NoLeadDeptPDF(FPDF):
+class NoLeadDeptPDF(ReportPDF):
     def __init__(self, orientation='P', unit='mm', format='A4'):
         super().__init__(orientation, unit, format)
-        self.set_title('Organizations without a Lead Department')
+        self.set_title(NO_LEAD_TITLE)
         self.set_author('OCIO - TBS')
 
     def header(self):
@@ -125,35 +143,33 @@ class NoLeadDeptPDF(FPDF):
         self.set_y(10)
         self.set_font('Arial', 'B', 12)
         self.set_text_color(255, 255, 255)  # Set text color to white
-        self.cell(0, 10, 'Organizations without a Lead Department', 0, 1, 'C')
+        self.cell(0, 10, NO_LEAD_TITLE, 0, 1, 'C')
 
     def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+        draw_page_number(self, self.page_no())
 
     def create_table(self, data):
         # TABLE_START_Y defines where the table begins on each page (40mm from top)
         # This allows space for the header on all pages
         TABLE_START_Y = 40  # Starting Y position in mm for table on all pages
-        
+
         self.set_y(TABLE_START_Y)  # Position cursor at the defined starting position
         self.set_fill_color(200, 200, 200)  # Light grey for header row
         self.set_text_color(0)
         self.set_font('Arial', 'B', 10)
-        
+
         # Calculate column widths
         page_width = self.w - 2 * 10  # Page width minus margins
         col_width = [page_width * 0.3, page_width * 0.7]  # 30% for ID, 70% for name
-        
+
         # Header row
         self.cell(col_width[0], 10, 'GC Org ID', 1, 0, 'C', True)
         self.cell(col_width[1], 10, 'Organization Name', 1, 1, 'C', True)
-        
+
         # Data rows
         self.set_font('Arial', '', 10)
         self.set_fill_color(255, 255, 255)  # White for data rows
-        
+
         # Alternate row colors for better readability
         fill = False
         for row in data:
@@ -161,7 +177,7 @@ class NoLeadDeptPDF(FPDF):
                 self.add_page()
                 # Position the table at the same starting position on new pages
                 self.set_y(TABLE_START_Y)
-                
+
                 # Repeat header
                 self.set_fill_color(200, 200, 200)
                 self.set_font('Arial', 'B', 10)
@@ -169,56 +185,244 @@ class NoLeadDeptPDF(FPDF):
                 self.cell(col_width[1], 10, 'Organization Name', 1, 1, 'C', True)
                 self.set_font('Arial', '', 10)
                 self.set_fill_color(255, 255, 255)
-            
+
             self.cell(col_width[0], 10, str(row[0]), 1, 0, 'C', fill)
             self.cell(col_width[1], 10, str(row[1]), 1, 1, 'L', fill)
-            
+
             fill = not fill  # Toggle fill for next row
 
+
+class PageNumberPDF(FPDF):
+    """Blank pages carrying only the page number, stamped onto merged sections."""
+
+    def footer(self):
+        if self.page_no() not in self.unnumbered_pages:
+            draw_page_number(self, self.page_no())
+
+
+def draw_page_number(pdf, page_number):
+    """Draw the centred page number at the bottom of the current page."""
+    pdf.set_y(-15)
+    pdf.set_font('Arial', 'I', 8)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 10, f'Page {page_number}', 0, 0, 'C')
+
+
+def load_sections():
+    """
+    Split the organizations into report sections.
+
+    Returns:
+        List of (kind, title, rows) tuples in document order: one 'department'
+        section per lead department, then the 'special' Regional Development
+        Agencies section
+    """
+    data = pd.read_csv(data_file, dtype=str).fillna('')
+
+    # Filter out rows with empty lead_department
+    data = data[data['lead_department'] != '']
+    special_data = data[data['gc_orgID'].isin(special_gc_orgIDs)]
+    special_departments = set(special_data['lead_department'])
+
+    sections = []
+    for lead_department, group in data.groupby('lead_department'):
+        if lead_department not in special_departments:
+            rows = list(zip(group['harmonized_name'], group['gc_orgID']))
+            sections.append(('department', lead_department, rows))
+    special_rows = list(zip(special_data['harmonized_name'], special_data['gc_orgID'],
+                            special_data['lead_department']))
+    sections.append(('special', 'Regional Development Agencies', special_rows))
+    return sections
+
+
+def render_document(sections, number_pages=True):
+    """Render sections into one PDF object."""
+    pdf = PDF(number_pages=number_pages)
+    for kind, title, rows in sections:
+        if kind == 'department':
+            pdf.add_page()
+            pdf.chapter_title(title)
+            pdf.chapter_body(rows)
+        else:
+            # Add the special page at the end (footer disabled on this page)
+            pdf.special_page(rows)
+    return pdf
+
+
+def section_key(section):
+    """Return the cache key of a section: a hash of the layout and its rows."""
+    payload = json.dumps([LAYOUT_HASH, section], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+
+
+def section_path(key):
+    """Return the cached PDF path of a section key."""
+    return os.path.join(cache_folder, f'{key}.pdf')
+
+
+def render_section(section):
+    """
+    Render one section into the cache (runs in a worker process).
+
+    Args:
+        section: (kind, title, rows) tuple
+
+    Returns:
+        Path of the cached section PDF
+    """
+    path = section_path(section_key(section))
+    handle, temp_path = tempfile.mkstemp(dir=cache_folder, suffix='.tmp')
+    os.close(handle)
+    try:
+        render_document([section], number_pages=False).output(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return path
+
+
+def render_sections(sections):
+    """
+    Make sure every section is in the cache, rendering missing ones in parallel.
+
+    Returns:
+        Cached section paths in document order
+    """
+    os.makedirs(cache_folder, exist_ok=True)
+    missing = [section for section in sections if not os.path.exists(section_path(section_key(section)))]
+    print(f"Sections: {len(sections)}, cached: {len(sections) - len(missing)}, rendering: {len(missing)}")
+    if len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(missing), os.cpu_count() or 1)) as executor:
+            list(executor.map(render_section, missing))
+    elif missing:
+        render_section(missing[0])
+    return [section_path(section_key(section)) for section in sections]
+
+
+def merge_sections(sections, section_paths, output_path):
+    """
+    Merge cached sections into one document and stamp page numbers.
+
+    The Regional Development Agencies page keeps its unnumbered footer.
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    unnumbered_pages = set()
+    for (kind, _, _), path in zip(sections, section_paths):
+        start = len(writer.pages)
+        writer.append(PdfReader(path))
+        if kind == 'special':
+            unnumbered_pages.update(range(start + 1, len(writer.pages) + 1))
+
+    numbers = PageNumberPDF()
+    numbers.unnumbered_pages = unnumbered_pages
+    for _ in writer.pages:
+        numbers.add_page()
+    with tempfile.TemporaryDirectory() as temp_folder:
+        numbers_path = os.path.join(temp_folder, 'page_numbers.pdf')
+        numbers.output(numbers_path)
+        for page, number_page in zip(writer.pages, PdfReader(numbers_path).pages):
+            page.merge_page(number_page)
+            # Stamping leaves the page's content uncompressed
+            page.compress_content_streams()
+
+        writer.add_metadata({'/Title': REPORT_TITLE, '/Author': 'OCIO - TBS'})
+        # Every appended section brings its own copy of the fonts; keep one
+        writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+        with open(output_path, 'wb') as f:
+            writer.write(f)
+
+
+def prune_cache(keep_paths):
+    """Delete cached sections that no longer belong to any report."""
+    keep = {os.path.abspath(path) for path in keep_paths}
+    for name in os.listdir(cache_folder):
+        path = os.path.abspath(os.path.join(cache_folder, name))
+        if path not in keep:
+            os.remove(path)
+
+
+def create_lead_department_pdf():
+    """Create lead_department.pdf from cached or freshly rendered sections."""
+    sections = load_sections()
+    output_file = os.path.join(script_folder, 'lead_department.pdf')
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        print("pypdf is not installed; rendering the whole report in one pass")
+        with atomic_output(output_file) as temp_file:
+            render_document(sections).output(temp_file)
+        return []
+
+    section_paths = render_sections(sections)
+    with atomic_output(output_file) as temp_file:
+        merge_sections(sections, section_paths, temp_file)
+    print("PDF created successfully.")
+    return section_paths
+
+
 # Function to create the no lead department PDF
 def create_no_lead_dept_pdf():
+    """
+    Create orgs_without_lead_department.pdf, reusing the cached copy if the
+    list of organizations has not changed.
+
+    Returns:
+        Cached paths used, so they survive cache pruning
+    """
     try:
         # Get the data from lead_manual.csv
-        manual_lead_department_df = pd.read_csv(manual_lead_department_file)
-        
+        manual_lead_department_df = pd.read_csv(manual_lead_department_file, dtype=str)
+
         # Identify organizations without a lead department
         orgs_without_lead = manual_lead_department_df[
-            (manual_lead_department_df['lead_department'].isna()) | 
-            (manual_lead_department_df['lead_department'] == '')
+            manual_lead_department_df['lead_department'].fillna('') == ''
+        ].dropna(subset=['gc_orgID', 'Harmonized GC Name'])
+
+        if orgs_without_lead.empty:
+            print("All organizations have lead departments assigned")
+            return []
+
+        print(f"Found {len(orgs_without_lead)} organizations without a lead department")
+
+        # Create data for the table, sorted by gc_orgID numerically
+        table_data = [
+            [gc_orgid, name]
+            for gc_orgid, name in zip(normalize_gc_orgid(orgs_without_lead['gc_orgID']),
+                                      orgs_without_lead['Harmonized GC Name'])
         ]
-        
-        if not orgs_without_lead.empty:
-            print(f"Found {len(orgs_without_lead)} organizations without a lead department")
-            
-            # Create data for the table
-            table_data = []
-            for _, row in orgs_without_lead.iterrows():
-                if pd.notna(row['gc_orgID']) and pd.notna(row['Harmonized GC Name']):
-                    try:
-                        gc_orgid = str(int(row['gc_orgID']))
-                        table_data.append([gc_orgid, row['Harmonized GC Name']])
-                    except:
-                        # Handle non-numeric gc_orgID
-                        table_data.append([str(row['gc_orgID']), row['Harmonized GC Name']])
-            
-            # Sort by gc_orgID numerically
-            table_data.sort(key=lambda x: int(x[0]) if x[0].isdigit() else float('inf'))
-            
-            # Create PDF
+        table_data.sort(key=lambda x: int(x[0]) if x[0].isdigit() else float('inf'))
+
+        os.makedirs(cache_folder, exist_ok=True)
+        cached_file = section_path(section_key(('no_lead', NO_LEAD_TITLE, table_data)))
+        if not os.path.exists(cached_file):
             no_lead_pdf = NoLeadDeptPDF()
             no_lead_pdf.add_page()
             no_lead_pdf.create_table(table_data)
-            
-            # Save the PDF
-            output_file = os.path.join(script_folder, 'orgs_without_lead_department.pdf')
-            no_lead_pdf.output(output_file)
-            
-            print(f"PDF of organizations without a lead department created at {output_file}")
-        else:
-            print("All organizations have lead departments assigned")
-            
+            no_lead_pdf.output(cached_file)
+
+        # Save the PDF
+        output_file = os.path.join(script_folder, 'orgs_without_lead_department.pdf')
+        with atomic_output(output_file) as temp_file:
+            shutil.copyfile(cached_file, temp_file)
+
+        print(f"PDF of organizations without a lead department created at {output_file}")
+        return [cached_file]
+
     except Exception as e:
         print(f"Error creating PDF for organizations without lead departments: {str(e)}")
+        return []
+
+
+def main():
+    """Create both PDF reports."""
+    cached_paths = create_lead_department_pdf() + create_no_lead_dept_pdf()
+    if cached_paths:
+        prune_cache(cached_paths)
+    report_outputs()
+
 
-# Call the function to generate the PDF
-create_no_lead_dept_pdf()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
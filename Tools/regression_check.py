@@ -0,0 +1,210 @@
+"""
+Regression gate for the build: frozen inputs, golden outputs, timing baselines.
+
+The fixture inputs in Tools/regression/fixtures are a small synthetic source
+set (see benchmark_scale.generate_sources) laid out like the repository.
+Each check copies them to a scratch folder, runs Resources/rg_final_match.py
+there, then combine_FAA_names.py, create_harmonized_name.py and the build
+(see benchmark_scale.run_build), then:
+
+- byte-compares gc_concordance.csv, gc_org_info.csv and rg_final.csv with
+  the golden copies in Tools/regression/golden, printing a diff on mismatch
+- compares the best time of each stage over --repeat runs with
+  Tools/regression/baseline.json; a stage fails if it is slower than its
+  baseline by more than the tolerance and by more than --min-seconds
+
+Either kind of failure exits with status 1.
+
+After an intended change to the outputs or the speed of the build, rerun
+with --update to store the new golden files and baseline. --freeze
+regenerates the fixture inputs themselves (then run --update).
+
+Examples:
+    python Tools/regression_check.py
+    python Tools/regression_check.py --skip-timing
+    python Tools/regression_check.py --update
+"""
+import argparse
+import difflib
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmark_scale import generate_sources, run_build, stage_times
+
+script_folder = os.path.dirname(os.path.abspath(__file__))
+repository_folder = os.path.join(script_folder, '..')
+regression_folder = os.path.join(script_folder, 'regression')
+fixture_folder = os.path.join(regression_folder, 'fixtures')
+golden_folder = os.path.join(regression_folder, 'golden')
+baseline_file = os.path.join(regression_folder, 'baseline.json')
+
+FIXTURE_ORGS = 300
+FIXTURE_SEED = 44
+
+# Outputs compared with the golden copies: golden file name -> path in the build folder
+GOLDEN_OUTPUTS = {
+    'gc_concordance.csv': 'gc_concordance.csv',
+    'gc_org_info.csv': 'gc_org_info.csv',
+    'rg_final.csv': os.path.join('Resources', 'rg_final.csv'),
+}
+
+# Most diff lines printed per file
+DIFF_LINES = 40
+
+
+def freeze_fixtures():
+    """Regenerate the fixture inputs."""
+    shutil.rmtree(fixture_folder, ignore_errors=True)
+    generate_sources(fixture_folder, FIXTURE_ORGS, seed=FIXTURE_SEED)
+    # rg_final.csv is an output of the check, not an input
+    os.remove(os.path.join(fixture_folder, 'Resources', 'rg_final.csv'))
+    print(f"Fixtures written to {fixture_folder}")
+
+
+def run_once(folder):
+    """
+    Run the RG final match, the name scripts and the build on a copy of the fixtures.
+
+    Returns:
+        Wall time of each stage in seconds
+    """
+    shutil.copytree(fixture_folder, folder)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, os.path.join(repository_folder, 'Resources', 'rg_final_match.py')],
+        cwd=folder, capture_output=True, text=True
+    )
+    rg_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"rg_final_match.py failed:\n{result.stderr}")
+
+    times = {'rg final match': rg_seconds}
+    times.update(stage_times(run_build(folder)))
+    return times
+
+
+def compare_outputs(folder):
+    """
+    Byte-compare the outputs of a run with the golden files.
+
+    Returns:
+        Names of the outputs that differ
+    """
+    failures = []
+    for golden_name, output_path in GOLDEN_OUTPUTS.items():
+        golden_file = os.path.join(golden_folder, golden_name)
+        output_file = os.path.join(folder, output_path)
+        with open(golden_file, 'rb') as f:
+            expected = f.read()
+        with open(output_file, 'rb') as f:
+            actual = f.read()
+        if expected == actual:
+            print(f"output {golden_name}: ok")
+            continue
+
+        failures.append(golden_name)
+        print(f"output {golden_name}: DIFFERS")
+        diff = list(difflib.unified_diff(
+            expected.decode('utf-8-sig').splitlines(), actual.decode('utf-8-sig').splitlines(),
+            fromfile=f'golden/{golden_name}', tofile=f'build/{golden_name}', lineterm='', n=0
+        ))
+        if not diff:
+            diff = ['    (line endings, encoding or byte order mark differ)']
+        for line in diff[:DIFF_LINES]:
+            print(f"    {line}")
+        if len(diff) > DIFF_LINES:
+            print(f"    ... and {len(diff) - DIFF_LINES} more diff lines")
+    return failures
+
+
+def compare_timings(times, baseline, tolerance, min_seconds):
+    """
+    Compare stage times with the baseline.
+
+    Returns:
+        Names of the stages that regressed
+    """
+    failures = []
+    print(f"{'stage':<20} {'baseline s':>11} {'now s':>9} {'change':>8}")
+    for name, seconds in times.items():
+        base = baseline['stages'].get(name)
+        if base is None:
+            print(f"{name:<20} {'-':>11} {seconds:>9.3f}   (no baseline)")
+            continue
+        change = (seconds - base) / base if base else 0.0
+        slower = seconds > base * (1 + tolerance) and seconds - base > min_seconds
+        flag = '  SLOWER' if slower else ''
+        print(f"{name:<20} {base:>11.3f} {seconds:>9.3f} {change:>+8.0%}{flag}")
+        if slower:
+            failures.append(name)
+    return failures
+
+
+def main():
+    """Run the regression gate on the frozen fixtures."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--repeat', type=int, default=3, help='runs to take the best time of')
+    parser.add_argument('--tolerance', type=float, help='allowed slowdown, e.g. 0.5 for 50%%')
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help='ignore slowdowns smaller than this many seconds')
+    parser.add_argument('--skip-timing', action='store_true', help='only compare the outputs')
+    parser.add_argument('--update', action='store_true', help='store new golden files and baseline')
+    parser.add_argument('--freeze', action='store_true', help='regenerate the fixture inputs')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.freeze:
+        freeze_fixtures()
+
+    repeat = 1 if args.skip_timing else max(1, args.repeat)
+    best = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        for run in range(repeat):
+            folder = os.path.join(scratch, f'run{run}')
+            for name, seconds in run_once(folder).items():
+                best[name] = min(seconds, best.get(name, seconds))
+
+        if args.update:
+            os.makedirs(golden_folder, exist_ok=True)
+            for golden_name, output_path in GOLDEN_OUTPUTS.items():
+                shutil.copyfile(os.path.join(folder, output_path), os.path.join(golden_folder, golden_name))
+            baseline = {
+                'tolerance': args.tolerance if args.tolerance is not None else 0.5,
+                'machine': platform.platform(),
+                'python': platform.python_version(),
+                'stages': {name: round(seconds, 4) for name, seconds in best.items()},
+            }
+            with open(baseline_file, 'w', encoding='utf-8') as f:
+                json.dump(baseline, f, indent=2)
+                f.write('\n')
+            print(f"Golden files and baseline updated in {regression_folder}")
+            return 0
+
+        output_failures = compare_outputs(folder)
+
+    timing_failures = []
+    if not args.skip_timing:
+        with open(baseline_file, encoding='utf-8') as f:
+            baseline = json.load(f)
+        tolerance = args.tolerance if args.tolerance is not None else baseline['tolerance']
+        print(f"\nTimings (best of {repeat}, tolerance {tolerance:.0%}, baseline from {baseline['machine']})")
+        timing_failures = compare_timings(best, baseline, tolerance, args.min_seconds)
+
+    if output_failures or timing_failures:
+        print(f"\nRegression check FAILED: {len(output_failures)} outputs differ, "
+              f"{len(timing_failures)} stages slower than baseline")
+        return 1
+    print("\nRegression check passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+This module provides a bilingual, accent- and case-insensitive autocomplete
+index over the organization names published in gc_org_info.csv.
+
+Every name is normalized once and stored in a sorted array together with the
+suffixes that start at each of its words, so a keystroke is answered with two
+binary searches over that array instead of a str.contains scan of the table.
+"""
+import argparse
+import csv
+import heapq
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+NAME_FIELDS = ['harmonized_name', 'nom_harmonisé', 'preferred_name', 'nom_préféré']
+ABBREVIATION_FIELDS = ['abbreviation', 'abreviation']
+
+# Match kinds, best first
+EXACT_MATCH = 0        # the query is the whole name or abbreviation
+NAME_PREFIX = 1        # the query starts the name
+ABBREVIATION_PREFIX = 2
+WORD_PREFIX = 3        # the query starts a later word of the name
+
+_SEPARATORS = re.compile(r"[\s'’\-–—,.()/&]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize a name or query for matching.
+
+    Accents are stripped, case is folded and punctuation is treated as
+    a word separator, so 'Élections' and 'elections' compare equal.
+
+    Args:
+        text: Name or partial query
+
+    Returns:
+        Normalized text with single spaces between words
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return _SEPARATORS.sub(' ', stripped.casefold()).strip()
+
+
+class AutocompleteIndex:
+    """
+    Sorted-array prefix index mapping name prefixes to gc_orgIDs.
+
+    Each entry is (key, kind, word position, name length, gc_orgID), sorted
+    by key, so all entries starting with a query form one contiguous slice.
+    """
+
+    def __init__(self, entries: List[Tuple[str, int, int, int, str]],
+                 names: Optional[Dict[str, str]] = None):
+        entries.sort()
+        self._entries = entries
+        self._keys = [entry[0] for entry in entries]
+        self.names = names or {}
+        # Consecutive keystrokes often repeat a query, e.g. after a backspace
+        self._search = lru_cache(maxsize=4096)(self._search_uncached)
+
+    @classmethod
+    def from_org_info(cls, org_info_file: Optional[str] = None) -> 'AutocompleteIndex':
+        """
+        Build the index from gc_org_info.csv.
+
+        Args:
+            org_info_file: Path to gc_org_info.csv, defaults to the one next
+                to this script
+
+        Returns:
+            AutocompleteIndex over English and French names and abbreviations
+        """
+        if org_info_file is None:
+            script_folder = os.path.dirname(os.path.abspath(__file__))
+            org_info_file = os.path.join(script_folder, 'gc_org_info.csv')
+
+        entries = set()
+        names = {}
+        with open(org_info_file, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                gc_orgid = row['gc_orgID']
+                names[gc_orgid] = row['harmonized_name']
+                for field in NAME_FIELDS:
+                    words = normalize(row.get(field) or '').split()
+                    for position in range(len(words)):
+                        kind = NAME_PREFIX if position == 0 else WORD_PREFIX
+                        key = ' '.join(words[position:])
+                        entries.add((key, kind, position, len(words), gc_orgid))
+                for field in ABBREVIATION_FIELDS:
+                    key = normalize(row.get(field) or '')
+                    if key:
+                        entries.add((key, ABBREVIATION_PREFIX, 0, 1, gc_orgid))
+        return cls(list(entries), names)
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Return the best matching gc_orgIDs for a partial name.
+
+        Results are ranked by how the query matched (whole name or
+        abbreviation, start of the name, start of an abbreviation, start of
+        a later word), then by how early the word appears, then by shorter
+        names.
+
+        Args:
+            query: Text typed so far, in English or French
+            limit: Maximum number of gc_orgIDs to return
+
+        Returns:
+            List of gc_orgIDs, best match first
+        """
+        return list(self._search(normalize(query), limit))
+
+    def _search_uncached(self, query: str, limit: int) -> Tuple[str, ...]:
+        if not query:
+            return ()
+        start = bisect_left(self._keys, query)
+        # Every key with this prefix sorts below query + the highest code point
+        end = bisect_left(self._keys, query + '\U0010ffff', start)
+
+        # Keep each organization's best match across its names
+        best = {}
+        for key, kind, position, length, gc_orgid in self._entries[start:end]:
+            if key == query and kind != WORD_PREFIX:
+                kind = EXACT_MATCH
+            rank = (kind, position, length, gc_orgid)
+            if gc_orgid not in best or rank < best[gc_orgid]:
+                best[gc_orgid] = rank
+        return tuple(rank[3] for rank in heapq.nsmallest(limit, best.values()))
+
+
+def main() -> None:
+    """
+    Print the organizations matching a partial name.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('query')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    index = AutocompleteIndex.from_org_info()
+    for gc_orgid in index.search(args.query, args.limit):
+        print(f"{gc_orgid}: {index.names[gc_orgid]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,563 @@
+"""
+This module builds both published tables, gc_concordance.csv and
+gc_org_info.csv, from one merge graph.
+
+The core join (Manual org ID link against combined_FAA_names, then
+applied_en, infobase_en and the harmonized names) is computed once. Each
+published table is a projection of that core with its own extra joins: RG
+numbers, French Infobase data and POP/Phoenix codes for the concordance, and
+lead departments for the organization info. Sharing the core keeps the two
+tables from drifting apart.
+"""
+import os
+import logging
+from typing import Dict, Tuple, List
+
+import pandas as pd
+
+from build_profile import profiled, stage, start_profiling, stop_profiling
+from id_normalize import normalize_rg
+from org_changelog import publish_changelog, read_rows
+from org_history import OrgHistory
+from output_writer import report_outputs, write_csv, write_text
+from overrides import apply_overrides, load_overrides
+from publish_sqlite import build_database
+from source_schemas import load_sources
+from typed_outputs import write_typed_outputs
+from validate_build import REPORT_NAME, report_json, validate_build
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+CONCORDANCE_FIELDS = [
+    'gc_orgID', 'harmonized_name', 'nom_harmonisé',
+    'abbreviation', 'abreviation', 'infobaseID', 'rg',
+    'ati', 'open_gov_ouvert', 'pop', 'phoenix',
+    'website', 'site_web'
+]
+
+ORG_INFO_FIELDS = [
+    'gc_orgID', 'harmonized_name', 'nom_harmonisé', 'legal_title',
+    'appellation_légale', 'preferred_name', 'nom_préféré', 'lead_department',
+    'ministère_responsable', 'abbreviation', 'abreviation', 'FAA_LGFP',
+    'status_statut', 'end_date_fin'
+]
+
+# Documentation for each gc_org_info field
+ORG_INFO_DOCUMENTATION = {
+    'gc_orgID': 'Source: create_harmonized_name.csv',
+    'harmonized_name': 'Source: create_harmonized_name.csv',
+    'nom_harmonisé': 'Source: create_harmonized_name.csv',
+    'legal_title': 'Source: Resources/Manual org ID link.csv and Scraping/combined_FAA_names.csv',
+    'appellation_légale': 'Not provided in the code, likely from a similar source',
+    'preferred_name': 'Source: Resources/applied_en.csv',
+    'nom_préféré': 'Source: Resources/applied_en.csv',
+    'lead_department': 'Source: Resources/lead_manual.csv',
+    'ministère_responsable': 'Source: Resources/lead_manual.csv',
+    'abbreviation': 'Source: Resources/applied_en.csv',
+    'abreviation': 'Source: Resources/applied_en.csv',
+    'FAA_LGFP': 'Source: Scraping/combined_FAA_names.csv',
+    'status_statut': 'Source: Resources/infobase_en.csv',
+    'end_date_fin': 'Source: Resources/infobase_en.csv'
+}
+
+
+def ensure_required_columns(df: pd.DataFrame, required_columns: List[str], df_name: str) -> None:
+    """
+    Ensure that a DataFrame has the required columns.
+
+    Args:
+        df: DataFrame to check
+        required_columns: List of column names that must exist
+        df_name: Name of the DataFrame for logging purposes
+
+    Raises:
+        ValueError: If any required column is missing
+    """
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        error_msg = f"Missing required columns in {df_name}: {missing_columns}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+
+def setup_paths() -> Dict[str, str]:
+    """
+    Define and return important directory paths used in the script.
+
+    Returns:
+        Dict containing paths to script directory, resources, and scraping folders
+    """
+    script_folder = os.path.dirname(os.path.abspath(__file__))
+    return {
+        'script': script_folder,
+        'resources': os.path.join(script_folder, 'Resources'),
+        'scraping': os.path.join(script_folder, 'Scraping')
+    }
+
+
+@profiled('load')
+def load_dataframes(paths: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+    """
+    Load all required CSV files into dataframes.
+
+    Each source is read with only the columns and types declared in
+    source_schemas.SOURCE_SCHEMAS.
+
+    Args:
+        paths: Dictionary containing file paths
+
+    Returns:
+        Dictionary of loaded dataframes
+
+    Raises:
+        ValueError: If a source no longer matches its schema
+    """
+    try:
+        dfs = load_sources(paths['script'])
+        dfs['overrides_df'] = load_overrides(os.path.join(paths['resources'], 'overrides.csv'))
+        return dfs
+    except Exception as e:
+        logger.error("Error loading sources: %s", str(e))
+        raise
+
+
+@profiled('standardize')
+def standardize_dataframes(dfs: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Clean and standardize all dataframes.
+
+    Args:
+        dfs: Dictionary of dataframes to standardize
+
+    Returns:
+        Dictionary of standardized dataframes
+    """
+    # Standardize text
+    for name, df in dfs.items():
+        dfs[name] = df.apply(
+            lambda x: x.str.replace('’', "'").str.replace('\u2011', '-').str.strip()
+            if x.dtype == "object" else x
+        )
+
+    # Rename columns for joining
+    dfs['combined_faa_df']['Original English Name'] = dfs['combined_faa_df']['English Name']
+    dfs['combined_faa_df'] = dfs['combined_faa_df'].rename(
+        columns={'English Name': 'Organization Legal Name English'}
+    )
+
+    return dfs
+
+
+@profiled('initial merge')
+def create_initial_merge(dfs: Dict[str, pd.DataFrame]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Create the initial merge and identify unmatched values.
+
+    Args:
+        dfs: Dictionary of dataframes
+
+    Returns:
+        Tuple containing (matched_dataframe, unmatched_dataframe)
+    """
+    final_joined_df = dfs['manual_org_df'].merge(
+        dfs['combined_faa_df'],
+        on='Organization Legal Name English',
+        how='outer'
+    )
+
+    # Flag matched and unmatched rows
+    final_joined_df['Names Match'] = final_joined_df['Organization Legal Name English'].isna().astype(int)
+
+    # Separate unmatched values
+    unmatched_values = final_joined_df[final_joined_df['Names Match'] == 1].copy()
+    matched_values = final_joined_df[final_joined_df['Names Match'] == 0].copy()
+
+    return matched_values, unmatched_values
+
+
+def index_source(source_df: pd.DataFrame, key: str, columns: List[str],
+                 left_keys: pd.Series, source_name: str) -> pd.DataFrame:
+    """
+    Index a right-hand source by its join key, refusing keys that would fan out.
+
+    Duplicate keys that no left row refers to are harmless and dropped;
+    duplicates that a left row refers to would duplicate that row, so they
+    are reported as an error instead of being deduplicated later.
+
+    Args:
+        source_df: Right-hand source dataframe
+        key: Join key column in source_df
+        columns: Columns to bring in from the source
+        left_keys: Key values of the left side
+        source_name: Name of the source for error messages
+
+    Returns:
+        Source columns indexed by a unique key
+
+    Raises:
+        ValueError: If a key used by the left side appears more than once
+    """
+    indexed = source_df.set_index(key)[columns]
+    duplicated = indexed.index.duplicated()
+    if duplicated.any():
+        fan_out = indexed.index[duplicated].unique().intersection(left_keys.dropna().unique())
+        if len(fan_out):
+            error_msg = f"Duplicate {key} values in {source_name} would fan out the join: {sorted(fan_out)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        indexed = indexed[~duplicated]
+    return indexed
+
+
+def lookup_columns(left_keys: pd.Series, source_df: pd.DataFrame, key: str,
+                   columns: List[str], source_name: str) -> pd.DataFrame:
+    """
+    Left join a source onto a key column by index alignment.
+
+    Args:
+        left_keys: Key values of the left side, one per output row
+        source_df: Right-hand source dataframe
+        key: Join key column in source_df
+        columns: Columns to bring in from the source
+        source_name: Name of the source for error messages
+
+    Returns:
+        Source columns aligned with left_keys (same index, missing keys as NA)
+    """
+    indexed = index_source(source_df, key, columns, left_keys, source_name)
+    aligned = indexed.reindex(left_keys.to_numpy())
+    aligned.index = left_keys.index
+    return aligned
+
+
+def ensure_unique_ids(df: pd.DataFrame, df_name: str) -> None:
+    """
+    Ensure that every gc_orgID appears once.
+
+    Raises:
+        ValueError: If a gc_orgID is repeated
+    """
+    repeated = df.loc[df['gc_orgID'].duplicated(), 'gc_orgID'].unique()
+    if len(repeated):
+        error_msg = f"Repeated gc_orgID values in {df_name}: {sorted(repeated)}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+
+@profiled('core join')
+def create_core_join(matched_df: pd.DataFrame, dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Join the sources shared by both published tables.
+
+    Every column either table needs from applied_en, infobase_en and the
+    harmonized names is looked up by key and the results are assembled in
+    one concatenation.
+
+    Args:
+        matched_df: Matched rows from create_initial_merge
+        dfs: Dictionary of source dataframes
+
+    Returns:
+        Core dataframe both published tables are projected from, one row per gc_orgID
+
+    Raises:
+        ValueError: If a source or the matched rows would repeat a gc_orgID
+    """
+    ensure_unique_ids(matched_df, 'the matched organizations')
+    legal_names = matched_df['Organization Legal Name English']
+    gc_orgids = matched_df['gc_orgID']
+
+    core_df = pd.concat([
+        matched_df,
+        lookup_columns(legal_names, dfs['applied_en_df'], 'Legal title',
+                       ['Applied title', "Titre d'usage", 'Abbreviation', 'Abreviation'], 'applied_en'),
+        lookup_columns(legal_names, dfs['infobase_en_df'], 'Legal title',
+                       ['OrgID', 'Website', 'Status', 'End date'], 'infobase_en'),
+        lookup_columns(gc_orgids, dfs['harmonized_names_df'], 'gc_orgID',
+                       ['harmonized_name', 'nom_harmonisé'], 'create_harmonized_name'),
+    ], axis=1)
+
+    # Standardize columns
+    core_df = core_df.rename(
+        columns={
+            'Abbreviation': 'abbreviation',
+            'Abreviation': 'abreviation'
+        }
+    )
+
+    return core_df
+
+
+@profiled('additional merges')
+def merge_additional_data(core_df: pd.DataFrame,
+                          dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Join the concordance-only data onto the core join.
+
+    Args:
+        core_df: Core dataframe from create_core_join
+        dfs: Dictionary of source dataframes
+
+    Returns:
+        Dataframe with additional data merged
+
+    Raises:
+        ValueError: If a source has repeated keys used by the core join
+    """
+    final_joined_df = pd.concat([
+        core_df,
+        lookup_columns(core_df['gc_orgID'], dfs['final_rg_match_df'], 'gc_orgID',
+                       ['rgnumber'], 'rg_final'),
+        lookup_columns(core_df['OrgID'], dfs['infobase_fr_df'], 'OrgID',
+                       ['Appellation legale', 'Site Web'], 'infobase_fr'),
+        lookup_columns(core_df['gc_orgID'], dfs['manual_pop_phoenix_df'], 'gc_orgID',
+                       ['open_gov_ouvert', 'ati', 'pop', 'phoenix'], 'manual pop phoenix'),
+    ], axis=1)
+    final_joined_df = final_joined_df.rename(
+        columns={'OrgID': 'infobaseID', 'Website': 'website', 'rgnumber': 'rg', 'Site Web': 'site_web'}
+    )
+
+    # RG number 0 marks an unmatched organization
+    final_joined_df['rg'] = normalize_rg(final_joined_df['rg'])
+
+    return final_joined_df
+
+
+@profiled('finalize')
+def finalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Finalize the dataframe for output.
+
+    Args:
+        df: Dataframe to finalize
+
+    Returns:
+        Finalized dataframe ready for output
+    """
+    # Ensure 'site_web' column exists
+    if 'site_web' not in df.columns:
+        df['site_web'] = None
+
+    # Reorder and sort columns
+    df = df[CONCORDANCE_FIELDS].sort_values(by='gc_orgID')
+    return df
+
+
+@profiled('gc_concordance')
+def build_concordance(core_df: pd.DataFrame, dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Project the core join onto gc_concordance.
+
+    Args:
+        core_df: Core dataframe from create_core_join
+        dfs: Dictionary of source dataframes
+
+    Returns:
+        gc_concordance dataframe ready for output
+    """
+    concordance_df = merge_additional_data(core_df, dfs)
+    concordance_df = apply_overrides(concordance_df, 'gc_concordance', dfs['overrides_df'])
+    return finalize_dataframe(concordance_df)
+
+
+@profiled('gc_org_info')
+def build_org_info(core_df: pd.DataFrame, dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Project the core join onto gc_org_info.
+
+    Args:
+        core_df: Core dataframe from create_core_join
+        dfs: Dictionary of source dataframes
+
+    Returns:
+        gc_org_info dataframe ready for output
+    """
+    org_info_df = core_df.rename(columns={
+        'Organization Legal Name English': 'legal_title',
+        'Organization Legal Name French': 'appellation_légale',
+        'FAA': 'FAA_LGFP',
+        'Applied title': 'preferred_name',
+        "Titre d'usage": 'nom_préféré',
+        'Status': 'status_statut',
+        'End date': 'end_date_fin'
+    })
+
+    # Apply overrides
+    org_info_df = apply_overrides(org_info_df, 'gc_org_info', dfs['overrides_df'])
+
+    # Set default values
+    org_info_df['status_statut'] = org_info_df['status_statut'].fillna('a')
+
+    # Join lead departments
+    lead_cols = ['lead_department', 'ministère_responsable']
+    org_info_df[lead_cols] = lookup_columns(
+        org_info_df['gc_orgID'], dfs['manual_lead_department_df'], 'gc_orgID',
+        lead_cols, 'lead_manual'
+    )
+
+    return org_info_df[ORG_INFO_FIELDS].sort_values(by='gc_orgID')
+
+
+def validate_unmatched_data(unmatched_df: pd.DataFrame) -> None:
+    """
+    Validate the unmatched data to ensure data quality.
+
+    Args:
+        unmatched_df: Dataframe containing unmatched records
+
+    Logs information about the unmatched data for review
+    """
+    if unmatched_df.empty:
+        logger.info("No unmatched records found - data appears to be clean!")
+        return
+
+    # Count records by column with missing values
+    missing_counts = unmatched_df.isna().sum()
+    logger.info("Unmatched records analysis:")
+    logger.info("Total unmatched records: %d", len(unmatched_df))
+    logger.info("Missing values by column: %s", missing_counts.to_string())
+
+    # Report specific columns of interest
+    if 'gc_orgID' in unmatched_df.columns:
+        missing_ids = unmatched_df[unmatched_df['gc_orgID'].isna()].shape[0]
+        logger.info("Records missing gc_orgID: %d", missing_ids)
+
+    # Additional validation could be added here
+
+
+def save_table(df: pd.DataFrame, table: str, script_folder: str) -> None:
+    """
+    Save a published table with its typed copies, history and changelog.
+
+    Args:
+        df: Final dataframe to save
+        table: Published table name, e.g. 'gc_concordance'
+        script_folder: Folder path for output files
+    """
+    output_file = os.path.join(script_folder, f'{table}.csv')
+
+    # Keep the previous build's rows for the changelog
+    previous_rows = read_rows(output_file)
+
+    write_csv(df, output_file, index=False, encoding='utf-8-sig')
+    logger.info("%s has been saved to %s", table, output_file)
+
+    # Publish typed copies so consumers do not have to re-infer types
+    write_typed_outputs(df, table, script_folder)
+
+    # Record what changed since the previous build for as-of lookups
+    OrgHistory(os.path.join(script_folder, 'History', 'org_history.csv')).append_snapshot(table, output_file)
+    publish_changelog(table, previous_rows, output_file,
+                      os.path.join(script_folder, 'History'))
+
+
+@profiled('save')
+def save_results(concordance_df: pd.DataFrame, org_info_df: pd.DataFrame,
+                 unmatched_df: pd.DataFrame, script_folder: str) -> None:
+    """
+    Save both published tables and the unmatched records.
+
+    Args:
+        concordance_df: Final gc_concordance dataframe
+        org_info_df: Final gc_org_info dataframe
+        unmatched_df: Unmatched records dataframe to save
+        script_folder: Folder path for output files
+
+    Raises:
+        Exception: If files cannot be saved
+    """
+    unmatched_output_file = os.path.join(script_folder, 'unmatched_org_IDs.csv')
+
+    try:
+        # Validate unmatched data before saving
+        validate_unmatched_data(unmatched_df)
+
+        save_table(concordance_df, 'gc_concordance', script_folder)
+        save_table(org_info_df, 'gc_org_info', script_folder)
+
+        write_csv(unmatched_df, unmatched_output_file, index=False, encoding='utf-8-sig')
+        logger.info("The unmatched values have been saved to %s", unmatched_output_file)
+
+        write_text(
+            os.path.join(script_folder, 'gc_org_info_documentation.txt'),
+            ''.join(f'{field}: {doc}\n' for field, doc in ORG_INFO_DOCUMENTATION.items())
+        )
+    except Exception as e:
+        logger.error("Error saving results: %s", str(e))
+        raise
+
+
+def build_tables(dfs: Dict[str, pd.DataFrame]) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Run the merge graph on standardized source dataframes.
+
+    Args:
+        dfs: Dictionary of standardized source dataframes
+
+    Returns:
+        Tuple containing (concordance_df, org_info_df, unmatched_df)
+    """
+    matched_df, unmatched_df = create_initial_merge(dfs)
+    core_df = create_core_join(matched_df, dfs)
+    return build_concordance(core_df, dfs), build_org_info(core_df, dfs), unmatched_df
+
+
+def build_and_publish(dfs: Dict[str, pd.DataFrame], script_folder: str) -> None:
+    """
+    Build, validate and publish both tables from loaded source dataframes.
+
+    Args:
+        dfs: Source dataframes as returned by load_dataframes; the dictionary
+            is updated with the standardized frames
+        script_folder: Folder path for output files
+
+    Raises:
+        ValueError: If validation fails; nothing is published then
+    """
+    dfs = standardize_dataframes(dfs)
+
+    # Build both tables from the shared core join
+    concordance_df, org_info_df, unmatched_df = build_tables(dfs)
+
+    # Validate before publishing; failed error checks stop the build
+    with stage('validate'):
+        report = validate_build(concordance_df, org_info_df, dfs)
+    write_text(os.path.join(script_folder, 'History', REPORT_NAME), report_json(report))
+    if not report['passed']:
+        raise ValueError(f"Validation failed with {report['errors']} errors, see History/{REPORT_NAME}")
+
+    # Save results
+    save_results(concordance_df, org_info_df, unmatched_df, script_folder)
+
+    # Publish the SQLite database with the refreshed tables
+    with stage('publish sqlite'):
+        build_database(script_folder)
+
+
+def main() -> None:
+    """
+    Main function to build gc_concordance.csv and gc_org_info.csv.
+    """
+    paths = setup_paths()
+    # Stage timings and memory when GC_ORG_PROFILE is set or --profile is passed
+    start_profiling('build_gc_org')
+    try:
+        # Load data
+        dfs = load_dataframes(paths)
+        build_and_publish(dfs, paths['script'])
+        report_outputs()
+
+    except Exception as e:
+        logger.error("An error occurred: %s", str(e))
+        raise
+    finally:
+        stop_profiling(os.path.join(paths['script'], 'History'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+This module measures where a build spends its time and memory.
+
+Stages are marked either with the @profiled decorator on a function or with
+a `with stage(...)` block around a few lines of a script. For every stage
+run the profiler records wall time, CPU time, peak traced memory and the row
+counts going in and out. Nested stages are recorded with their parent, and a
+stage's peak includes the peaks of the stages it contains.
+
+Profiling is off unless the GC_ORG_PROFILE environment variable is set or
+the script is run with --profile. GC_ORG_PROFILE=cprofile or --cprofile also
+collects a cProfile dump. When profiling is off, a decorated function costs
+one flag check per call and a stage block does nothing, so the markers can
+stay in place.
+
+At the end of a run the report is written to History/profile_<run>.json
+(and History/profile_<run>.prof for cProfile, readable with pstats or
+snakeviz).
+"""
+import cProfile
+import datetime
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = 'GC_ORG_PROFILE'
+PROFILE_FLAG = '--profile'
+CPROFILE_FLAG = '--cprofile'
+
+_profiler = None
+# Runs started while another was already profiling; they report into it
+_nested_runs = 0
+
+
+def count_rows(value) -> Optional[int]:
+    """
+    Count the rows in a stage's input or output.
+
+    DataFrames and Series count their length; dicts, lists and tuples count
+    the rows of the tables they hold. Anything else has no row count.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        counts = [count_rows(item) for item in value]
+        counts = [count for count in counts if count is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+class StageRecord:
+    """Measurements of one stage run."""
+
+    def __init__(self, name: str, parent: Optional[str]):
+        self.name = name
+        self.parent = parent
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes = 0
+
+    def rows(self, rows_in=None, rows_out=None) -> None:
+        """Set the row counts from tables or plain numbers."""
+        if rows_in is not None:
+            self.rows_in = rows_in if isinstance(rows_in, int) else count_rows(rows_in)
+        if rows_out is not None:
+            self.rows_out = rows_out if isinstance(rows_out, int) else count_rows(rows_out)
+
+    def as_dict(self) -> Dict:
+        return {
+            'stage': self.name,
+            'parent': self.parent,
+            'wall_seconds': round(self.wall_seconds, 4),
+            'cpu_seconds': round(self.cpu_seconds, 4),
+            'peak_memory_mb': round(self.peak_bytes / 2 ** 20, 2),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+        }
+
+
+class _NullStage:
+    """Stand-in record used while profiling is off."""
+
+    def rows(self, rows_in=None, rows_out=None) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class BuildProfiler:
+    """Collects stage records for one run."""
+
+    def __init__(self, run_name: str, use_cprofile: bool = False, trace_memory: bool = True):
+        self.run_name = run_name
+        self.trace_memory = trace_memory
+        self.records: List[StageRecord] = []
+        self.open_stages: List[StageRecord] = []
+        self.cprofile = cProfile.Profile() if use_cprofile else None
+        self.started = datetime.datetime.now()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        if trace_memory:
+            tracemalloc.start()
+        if self.cprofile:
+            self.cprofile.enable()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        parent = self.open_stages[-1] if self.open_stages else None
+        record = StageRecord(name, parent.name if parent else None)
+        self.records.append(record)
+        self.open_stages.append(record)
+
+        if self.trace_memory:
+            if parent:
+                # Keep the parent's peak so far before the child starts measuring its own
+                parent.peak_bytes = max(parent.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - wall_start
+            record.cpu_seconds = time.process_time() - cpu_start
+            self.open_stages.pop()
+            if self.trace_memory:
+                record.peak_bytes = max(record.peak_bytes, tracemalloc.get_traced_memory()[1])
+                if parent:
+                    # The parent's peak covers everything that ran inside it
+                    parent.peak_bytes = max(parent.peak_bytes, record.peak_bytes)
+                tracemalloc.reset_peak()
+
+    def report(self) -> Dict:
+        """Return the run report."""
+        return {
+            'run': self.run_name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'wall_seconds': round(time.perf_counter() - self.wall_start, 4),
+            'cpu_seconds': round(time.process_time() - self.cpu_start, 4),
+            'peak_memory_mb': round(max([r.peak_bytes for r in self.records] + [0]) / 2 ** 20, 2),
+            'stages': [record.as_dict() for record in self.records],
+        }
+
+    def stop(self, output_folder: str) -> Dict:
+        """
+        Stop profiling and write the report (and cProfile dump) to output_folder.
+
+        Returns:
+            The run report
+        """
+        from output_writer import atomic_output, write_text
+
+        if self.cprofile:
+            self.cprofile.disable()
+        report = self.report()
+        if self.trace_memory:
+            tracemalloc.stop()
+
+        os.makedirs(output_folder, exist_ok=True)
+        report_file = os.path.join(output_folder, f'profile_{self.run_name}.json')
+        write_text(report_file, json.dumps(report, indent=2) + '\n')
+        if self.cprofile:
+            with atomic_output(os.path.join(output_folder, f'profile_{self.run_name}.prof')) as temp_file:
+                self.cprofile.dump_stats(temp_file)
+
+        for record in report['stages']:
+            logger.info("Stage %-22s wall %8.3fs  cpu %8.3fs  peak %8.2f MB  rows %s -> %s",
+                        record['stage'], record['wall_seconds'], record['cpu_seconds'],
+                        record['peak_memory_mb'], record['rows_in'], record['rows_out'])
+        logger.info("Profile written to %s", report_file)
+        return report
+
+
+def profiling_requested(argv: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Return 'cprofile', 'json' or None from GC_ORG_PROFILE and the command line.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    setting = os.environ.get(PROFILE_ENV, '').strip().lower()
+    if CPROFILE_FLAG in argv or setting == 'cprofile':
+        return 'cprofile'
+    if PROFILE_FLAG in argv or setting not in ('', '0', 'false', 'no'):
+        return 'json'
+    return None
+
+
+def start_profiling(run_name: str, argv: Optional[List[str]] = None,
+                    trace_memory: bool = True) -> bool:
+    """
+    Start profiling a run if it was requested.
+
+    Args:
+        run_name: Name used for the report files, e.g. 'build_gc_org'
+        argv: Command line arguments, defaults to sys.argv[1:]
+        trace_memory: Record peak memory with tracemalloc, which slows
+            allocation-heavy stages down noticeably
+
+    If a run is already being profiled, for example a script run in-process
+    by the benchmark, this run's stages are recorded in it and the matching
+    stop_profiling call leaves it running.
+
+    Returns:
+        True if profiling is on
+    """
+    global _profiler, _nested_runs
+    if _profiler is not None:
+        _nested_runs += 1
+        return True
+    mode = profiling_requested(argv)
+    if mode:
+        _profiler = BuildProfiler(run_name, use_cprofile=mode == 'cprofile', trace_memory=trace_memory)
+    return _profiler is not None
+
+
+def stop_profiling(output_folder: str) -> Optional[Dict]:
+    """
+    Stop profiling and write the reports; does nothing if profiling is off.
+
+    Returns:
+        The run report, or None if profiling was off or this run was nested
+    """
+    global _profiler, _nested_runs
+    if _profiler is None:
+        return None
+    if _nested_runs:
+        _nested_runs -= 1
+        return None
+    profiler, _profiler = _profiler, None
+    return profiler.stop(output_folder)
+
+
+@contextmanager
+def stage(name: str) -> Iterator:
+    """
+    Profile a block of code as one stage.
+
+    The yielded record takes row counts: `with stage('fuzzy match') as s:
+    ...; s.rows(rows_in, rows_out)`.
+    """
+    if _profiler is None:
+        yield _NULL_STAGE
+        return
+    with _profiler.stage(name) as record:
+        yield record
+
+
+def profiled(name: str, rows_in: Optional[str] = None) -> Callable:
+    """
+    Profile every call of a function as a stage.
+
+    Rows in are counted from the function's first argument, or from the
+    argument named by rows_in, so lookup tables passed alongside it (such
+    as the overrides) are not counted. Rows out are counted from the tables
+    returned.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        counted = rows_in or next(iter(signature.parameters), None)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return func(*args, **kwargs)
+            with _profiler.stage(name) as record:
+                record.rows_in = count_rows(signature.bind_partial(*args, **kwargs).arguments.get(counted))
+                result = func(*args, **kwargs)
+                record.rows_out = count_rows(result)
+                return result
+        return wrapper
+    return decorator
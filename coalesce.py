@@ -0,0 +1,80 @@
+"""
+This module resolves conflicts between sources from declared priorities.
+
+Two kinds of conflicts come up when combining sources:
+
+- Field priorities: one output field can come from several columns, e.g.
+  harmonized_name is the applied title if there is one, otherwise the legal
+  name. coalesce_fields takes the first non-empty column per row and records
+  which column won in a '<field>_source' column.
+- Row priorities: the same organization appears in several sources, e.g. in
+  more than one FAA schedule. coalesce_rows keeps, for each key, the row
+  from the highest priority source.
+
+Both are resolved in one vectorized pass, so adding a source or changing a
+priority is a change to the priority lists rather than new sort and merge
+steps.
+"""
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from build_profile import profiled
+
+SOURCE_SUFFIX = '_source'
+
+
+@profiled('coalesce fields')
+def coalesce_fields(df: pd.DataFrame, priorities: Dict[str, List[str]],
+                    record_source: bool = True) -> pd.DataFrame:
+    """
+    Fill each field from the first non-empty column in its priority list.
+
+    Args:
+        df: Table holding every candidate column
+        priorities: Output field to its candidate columns, highest priority first
+        record_source: Add a '<field>_source' column naming the winning column
+            ('' when no candidate had a value)
+
+    Returns:
+        The table with the coalesced fields set
+    """
+    for field, columns in priorities.items():
+        candidates = df[columns].to_numpy(dtype=object)
+        present = df[columns].notna().to_numpy()
+
+        # argmax finds the first candidate with a value in each row
+        winner = present.argmax(axis=1)
+        found = present.any(axis=1)
+        values = candidates[np.arange(len(df)), winner]
+
+        df[field] = pd.Series(values, index=df.index).where(found)
+        if record_source:
+            df[field + SOURCE_SUFFIX] = np.where(found, np.array(columns, dtype=object)[winner], '')
+    return df
+
+
+@profiled('coalesce rows')
+def coalesce_rows(df: pd.DataFrame, key: str, source_column: str,
+                  source_priority: List[str]) -> pd.DataFrame:
+    """
+    Keep one row per key, taken from the highest priority source.
+
+    Sources missing from the priority list rank after all listed sources;
+    ties keep the first row. Rows keep their original order.
+
+    Args:
+        df: Rows from every source, with a unique index
+        key: Column identifying the same entity across sources
+        source_column: Column naming the source of each row
+        source_priority: Source values, highest priority first
+
+    Returns:
+        The winning row for every key
+    """
+    rank = df[source_column].map(
+        {source: position for position, source in enumerate(source_priority)}
+    ).fillna(len(source_priority))
+    winners = rank.groupby(df[key], sort=False, dropna=False).idxmin()
+    return df[df.index.isin(winners)]
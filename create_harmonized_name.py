@@ -1,21 +1,39 @@
 import os
 import pandas as pd
 
+from build_profile import stage, start_profiling, stop_profiling
+from coalesce import coalesce_fields
+from id_normalize import normalize_gc_orgid
+from output_writer import report_outputs, write_csv
+from overrides import apply_overrides, load_overrides
+
 # Path to the folder where the script is located
 script_folder = os.path.dirname(os.path.abspath(__file__))
 resources_folder = os.path.join(script_folder, 'Resources')
 
+# Sources of each harmonized name field, highest priority first
+HARMONIZED_NAME_PRIORITIES = {
+    'harmonized_name': ['Applied title', 'Organization Legal Name English'],
+    'nom_harmonisé': ["Titre d'usage", 'Titre applique', 'Organization Legal Name French'],
+}
+
 # Paths to the CSV files
 manual_org_file = os.path.join(resources_folder, 'Manual org ID link.csv')
 applied_en_file = os.path.join(resources_folder, 'applied_en.csv')
 infobase_en_file = os.path.join(resources_folder, 'infobase_en.csv')
 infobase_fr_file = os.path.join(resources_folder, 'infobase_fr.csv')
+overrides_file = os.path.join(resources_folder, 'overrides.csv')
+
+# Stage timings and memory when GC_ORG_PROFILE is set or --profile is passed
+start_profiling('create_harmonized_name')
 
 # Read the CSV files
-manual_org_df = pd.read_csv(manual_org_file)
-applied_en_df = pd.read_csv(applied_en_file)
-infobase_en_df = pd.read_csv(infobase_en_file)
-infobase_fr_df = pd.read_csv(infobase_fr_file)
+with stage('load') as loaded:
+    manual_org_df = pd.read_csv(manual_org_file)
+    applied_en_df = pd.read_csv(applied_en_file)
+    infobase_en_df = pd.read_csv(infobase_en_file)
+    infobase_fr_df = pd.read_csv(infobase_fr_file)
+    loaded.rows(rows_out=[manual_org_df, applied_en_df, infobase_en_df, infobase_fr_df])
 
 # Standardize text
 def standardize_text(df):
@@ -27,38 +45,26 @@ applied_en_df = standardize_text(applied_en_df)
 infobase_en_df = standardize_text(infobase_en_df)
 infobase_fr_df = standardize_text(infobase_fr_df)
 
-# Perform a left join to include all entries from manual_org_df and only matching entries from applied_en_df
-joined_df = pd.merge(manual_org_df, applied_en_df, left_on='Organization Legal Name English', right_on='Legal title', how='left')
+with stage('join') as joined:
+    # Perform a left join to include all entries from manual_org_df and only matching entries from applied_en_df
+    joined_df = pd.merge(manual_org_df, applied_en_df, left_on='Organization Legal Name English', right_on='Legal title', how='left')
 
-# Merge with infobase_en_df and infobase_fr_df using the correct column names, excluding 'Applied title' and 'Appellation legale'
-joined_df = pd.merge(joined_df, infobase_en_df[['Legal title']], left_on='Organization Legal Name English', right_on='Legal title', how='left')
-joined_df = pd.merge(joined_df, infobase_fr_df[['Titre applique']], left_on='Organization Legal Name French', right_on='Titre applique', how='left')
+    # Merge with infobase_en_df and infobase_fr_df using the correct column names, excluding 'Applied title' and 'Appellation legale'
+    joined_df = pd.merge(joined_df, infobase_en_df[['Legal title']], left_on='Organization Legal Name English', right_on='Legal title', how='left')
+    joined_df = pd.merge(joined_df, infobase_fr_df[['Titre applique']], left_on='Organization Legal Name French', right_on='Titre applique', how='left')
+    joined.rows(manual_org_df, joined_df)
 
 # Debug: Print the columns of joined_df
 print("Columns in joined_df:", joined_df.columns)
 
-# Create the 'harmonized_name' field with the specified priority
-joined_df['harmonized_name'] = joined_df['Applied title']
-joined_df.loc[joined_df['harmonized_name'].isna(), 'harmonized_name'] = joined_df['Organization Legal Name English']
-
-# Create the 'nom_harmonisé' field with the specified priority
-joined_df['nom_harmonisé'] = joined_df["Titre d'usage"]
-joined_df.loc[joined_df['nom_harmonisé'].isna(), 'nom_harmonisé'] = joined_df['Titre applique']
-joined_df.loc[joined_df['nom_harmonisé'].isna(), 'nom_harmonisé'] = joined_df['Organization Legal Name French']
-
-# Manual changes
-manual_changes = {
-    'gc_orgID': 2271,
-    'harmonized_name': 'Elections Canada',
-    'nom_harmonisé': 'Élections Canada'
-}
+# Create the harmonized name fields from the first available source, recording which one was used
+joined_df = coalesce_fields(joined_df, HARMONIZED_NAME_PRIORITIES)
 
-# Apply manual changes explicitly
-joined_df.loc[joined_df['gc_orgID'] == manual_changes['gc_orgID'], 'harmonized_name'] = manual_changes['harmonized_name']
-joined_df.loc[joined_df['gc_orgID'] == manual_changes['gc_orgID'], 'nom_harmonisé'] = manual_changes['nom_harmonisé']
+# Set the field 'gc_orgID' so that there are no decimals; overrides are keyed on it
+joined_df['gc_orgID'] = normalize_gc_orgid(joined_df['gc_orgID'])
 
-# Set the field 'gc_orgID' so that there are no decimals
-joined_df['gc_orgID'] = joined_df['gc_orgID'].astype(str).str.split('.').str[0]
+# Manual changes from Resources/overrides.csv
+joined_df = apply_overrides(joined_df, 'create_harmonized_name', load_overrides(overrides_file))
 
 # Drop 'Legal title_x' and 'Legal title_y' columns if they exist
 joined_df = joined_df.drop(columns=['Legal title_x', 'Legal title_y'], errors='ignore')
@@ -68,6 +74,8 @@ joined_df = joined_df.sort_values(by='gc_orgID')
 
 # Save the final joined DataFrame to a new CSV file with UTF-8 encoding
 output_file = os.path.join(script_folder, 'create_harmonized_name.csv')
-joined_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+write_csv(joined_df, output_file, index=False, encoding='utf-8-sig')
 
 print(f"The final joined DataFrame has been saved to {output_file}")
+stop_profiling(os.path.join(script_folder, 'History'))
+report_outputs()
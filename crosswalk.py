@@ -0,0 +1,177 @@
+"""
+This module translates whole columns of identifiers between the ID systems
+published in gc_concordance.csv (gc_orgID, infobaseID, rg, pop, phoenix, ...).
+
+Each (source, target) pair is compiled once into a sorted key array and an
+aligned value array, so translating a column is a single np.searchsorted call
+followed by a gather, with no per-element Python loops. Small integer ID
+systems (gc_orgID, infobaseID, rg) also get a dense table indexed by the ID
+itself, so their translation is a plain gather.
+"""
+import csv
+import os
+import sys
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# ID systems stored as integers; every other system is a string code
+NUMERIC_SYSTEMS = ('gc_orgID', 'infobaseID', 'rg')
+STRING_SYSTEMS = ('pop', 'phoenix', 'open_gov_ouvert', 'ati')
+
+# Value returned for IDs that are unknown or have no counterpart
+NUMERIC_SENTINEL = -1
+STRING_SENTINEL = ''
+
+# Integer keys below this bound are translated through a dense lookup table,
+# which turns the translation into a single gather
+DENSE_KEY_LIMIT = 1 << 20
+
+
+class IdCrosswalk:
+    """
+    Vectorized translator between the ID systems of the concordance.
+
+    Several organizations can share one ID in another system (for example
+    portfolio organizations paid under their department's RG number). When
+    a source ID is shared, the organization with the lowest gc_orgID wins.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+        self._tables: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        self._dense: Dict[Tuple[str, str], np.ndarray] = {}
+
+    @classmethod
+    def from_concordance(cls, concordance_file: Optional[str] = None) -> 'IdCrosswalk':
+        """
+        Build a crosswalk from a gc_concordance.csv file.
+
+        Args:
+            concordance_file: Path to the concordance, defaults to the one
+                next to this script
+
+        Returns:
+            IdCrosswalk over every ID system in the file
+        """
+        if concordance_file is None:
+            script_folder = os.path.dirname(os.path.abspath(__file__))
+            concordance_file = os.path.join(script_folder, 'gc_concordance.csv')
+
+        with open(concordance_file, newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+
+        columns = {}
+        for system in NUMERIC_SYSTEMS:
+            columns[system] = np.array(
+                [int(row[system]) if row[system] else NUMERIC_SENTINEL for row in rows],
+                dtype=np.int64
+            )
+        for system in STRING_SYSTEMS:
+            columns[system] = np.array([row[system] for row in rows], dtype=str)
+        return cls(columns)
+
+    @property
+    def systems(self) -> Tuple[str, ...]:
+        """Names of the ID systems this crosswalk can translate between."""
+        return tuple(self.columns)
+
+    def _table(self, source: str, target: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the sorted source keys and aligned target values for a pair.
+        """
+        if (source, target) not in self._tables:
+            for system in (source, target):
+                if system not in self.columns:
+                    raise ValueError(f"Unknown ID system: {system}")
+
+            keys = self.columns[source]
+            values = self.columns[target]
+            missing = NUMERIC_SENTINEL if source in NUMERIC_SYSTEMS else STRING_SENTINEL
+            known = keys != missing
+            keys, values = keys[known], values[known]
+
+            # Stable sort keeps the lowest gc_orgID first among shared keys
+            order = np.argsort(keys, kind='stable')
+            keys, values = keys[order], values[order]
+            first = np.ones(len(keys), dtype=bool)
+            first[1:] = keys[1:] != keys[:-1]
+            self._tables[(source, target)] = (keys[first], values[first])
+        return self._tables[(source, target)]
+
+    def _dense_table(self, source: str, target: str) -> Optional[np.ndarray]:
+        """
+        Return a lookup table indexed directly by integer source ID, or None
+        if the source system is not numeric or its IDs are too large.
+        """
+        if source not in NUMERIC_SYSTEMS:
+            return None
+        if (source, target) not in self._dense:
+            keys, mapped = self._table(source, target)
+            dense = None
+            if len(keys) and 0 <= keys[0] and keys[-1] < DENSE_KEY_LIMIT:
+                sentinel = NUMERIC_SENTINEL if target in NUMERIC_SYSTEMS else STRING_SENTINEL
+                # One extra slot holds the sentinel for out-of-range IDs
+                dense = np.full(keys[-1] + 2, sentinel, dtype=mapped.dtype)
+                dense[keys] = mapped
+            self._dense[(source, target)] = dense
+        return self._dense[(source, target)]
+
+    def translate(self, values, source: str, target: str):
+        """
+        Translate an array of IDs from one system to another.
+
+        Args:
+            values: NumPy array, pandas Series or sequence of source IDs
+            source: ID system of the input, e.g. 'rg'
+            target: ID system to translate to, e.g. 'gc_orgID'
+
+        Returns:
+            Array of target IDs (a Series with the same index if a Series was
+            given), holding the sentinel (-1 or '') for unknown IDs
+        """
+        keys, mapped = self._table(source, target)
+        target_sentinel = NUMERIC_SENTINEL if target in NUMERIC_SYSTEMS else STRING_SENTINEL
+
+        lookup = _as_key_array(values, numeric=source in NUMERIC_SYSTEMS)
+        dense = self._dense_table(source, target)
+        if dense is not None:
+            out_of_range = len(dense) - 1
+            lookup = np.where((lookup >= 0) & (lookup < out_of_range), lookup, out_of_range)
+            result = dense[lookup]
+        else:
+            result = np.full(lookup.shape, target_sentinel, dtype=mapped.dtype)
+            if len(keys):
+                positions = np.searchsorted(keys, lookup)
+                np.clip(positions, 0, len(keys) - 1, out=positions)
+                found = keys[positions] == lookup
+                result[found] = mapped[positions[found]]
+
+        pd = sys.modules.get('pandas')
+        if pd is not None and isinstance(values, pd.Series):
+            return pd.Series(result, index=values.index, name=target)
+        return result
+
+
+def _as_key_array(values, numeric: bool) -> np.ndarray:
+    """
+    Coerce input IDs to the key dtype of their system.
+
+    Floats (e.g. IDs read with NaN gaps) are accepted for integer systems;
+    NaN and non-integral values map to the sentinel.
+    """
+    array = np.asarray(values)
+    if not numeric:
+        return array.astype(str)
+    if array.dtype.kind in 'iu':
+        return array.astype(np.int64, copy=False)
+    if array.dtype.kind == 'f':
+        integral = np.isfinite(array) & (np.floor(array) == array)
+        return np.where(integral, array, NUMERIC_SENTINEL).astype(np.int64)
+
+    # Strings such as '001' or '' from CSV columns
+    text = np.char.strip(array.astype(str))
+    digits = np.char.isdigit(text)
+    result = np.full(text.shape, NUMERIC_SENTINEL, dtype=np.int64)
+    result[digits] = text[digits].astype(np.int64)
+    return result
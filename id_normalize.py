@@ -0,0 +1,76 @@
+"""
+This module normalizes identifier columns in one vectorized pass.
+
+Identifiers reach the scripts in several shapes: a gc_orgID can be 2222,
+2222.0 or '2222.0' depending on whether its column held a blank, RG numbers
+are 1 in one file and '001' in another, and Infobase IDs and end-date years
+come in as floats. Each normalizer takes a whole column and returns either
+nullable Int64 values or consistently formatted text, so blanks stay blank
+instead of becoming NaN floats, 'nan' strings or 0.
+
+parse_int is the normalizer for plain integer codes such as Infobase IDs and
+end_date_fin years; the others build on it.
+"""
+import pandas as pd
+
+
+def parse_int(values: pd.Series) -> pd.Series:
+    """
+    Parse a column of integer codes into nullable Int64.
+
+    Accepts integers, floats without a fraction and numeric text with
+    surrounding spaces or a '.0' suffix. Blanks, non-numeric text and
+    fractional numbers become <NA>.
+
+    Args:
+        values: Column to parse
+
+    Returns:
+        Int64 column with the same index
+    """
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return values.astype('Int64')
+    if pd.api.types.is_float_dtype(values.dtype):
+        numbers = values.astype('float64')
+    else:
+        text = values.astype('string').str.strip()
+        numbers = pd.to_numeric(text.mask(text == '').astype(object), errors='coerce').astype('float64')
+    return numbers.where(numbers % 1 == 0).astype('Int64')
+
+
+def normalize_code(values: pd.Series, width: int = 0) -> pd.Series:
+    """
+    Format a column of codes as text.
+
+    Numeric codes are written as whole numbers, zero-padded to width.
+    Non-numeric codes keep their stripped text, and blanks become <NA>.
+
+    Args:
+        values: Column to format
+        width: Minimum number of digits, e.g. 3 for RG numbers ('001')
+
+    Returns:
+        Text column with the same index
+    """
+    numbers = parse_int(values)
+    text = numbers.astype('string')
+    if width:
+        text = text.str.zfill(width)
+    original = values.astype('string').str.strip()
+    return text.fillna(original.mask(original == '')).astype(object)
+
+
+def normalize_gc_orgid(values: pd.Series) -> pd.Series:
+    """Return gc_orgIDs as join-ready text keys: '2222', never '2222.0'."""
+    return normalize_code(values)
+
+
+def normalize_rg(values: pd.Series) -> pd.Series:
+    """Return RG numbers as Int64, with 0 (an unmatched organization) as <NA>."""
+    numbers = parse_int(values)
+    return numbers.mask(numbers == 0)
+
+
+def format_rg_code(values: pd.Series) -> pd.Series:
+    """Return RG numbers as the three-digit codes of the Receiver General list."""
+    return normalize_code(values, width=3)
@@ -0,0 +1,68 @@
+"""
+Command line lookup of Government of Canada organizations.
+
+Examples:
+    python lookup_org.py 2222
+    python lookup_org.py --rg 135
+    python lookup_org.py --name "sante"
+    python lookup_org.py 2222 --as-of 2024-04-01
+
+Only the standard library is imported, so a lookup starts quickly.
+"""
+import argparse
+import sys
+
+from org_registry import ID_COLUMNS, OrgRegistry
+
+
+def print_org(row: dict) -> None:
+    """Print one organization's fields, skipping empty ones."""
+    for field, value in row.items():
+        if value:
+            print(f"{field}: {value}")
+    print()
+
+
+def main() -> int:
+    """
+    Look up organizations by gc_orgID, another ID system or partial name.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('gc_orgID', nargs='?')
+    for id_column in ID_COLUMNS[1:]:
+        parser.add_argument(f"--{id_column.replace('_', '-')}", dest=id_column,
+                            help=f"Find organizations by {id_column}")
+    parser.add_argument('--name', help='Find organizations by partial English or French name')
+    parser.add_argument('--as-of', help='Show the row as published on this ISO date')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    registry = OrgRegistry()
+
+    gc_orgids = []
+    if args.gc_orgID:
+        gc_orgids.append(args.gc_orgID)
+    for id_column in ID_COLUMNS[1:]:
+        if getattr(args, id_column):
+            gc_orgids.extend(registry.find(id_column, getattr(args, id_column)))
+    if args.name:
+        gc_orgids.extend(registry.search(args.name, args.limit))
+    if not (args.gc_orgID or args.name or any(getattr(args, c) for c in ID_COLUMNS[1:])):
+        parser.error("give a gc_orgID, an ID option or --name")
+
+    found = False
+    for gc_orgid in gc_orgids:
+        row = registry.as_of(gc_orgid, args.as_of) if args.as_of else registry.get(gc_orgid)
+        if row is None:
+            continue
+        found = True
+        print_org({'gc_orgID': gc_orgid, **row} if args.as_of else row)
+
+    if not found:
+        print("No matching organization found")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
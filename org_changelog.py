@@ -0,0 +1,193 @@
+"""
+This module produces a row-level changelog each time a published table is
+regenerated, so subscribers can apply incremental updates instead of
+reloading the whole file.
+
+Every gc_orgID row gets a stable fingerprint (a hash of its field values in
+column order). Fingerprints are stored next to the history in
+History/<table>_fingerprints.csv; only rows whose fingerprint differs from
+the previous build are compared field by field.
+
+Builds that change rows append one dated entry to the changelog; builds that
+change nothing leave the changelog files untouched.
+"""
+import csv
+import datetime
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from output_writer import write_text
+
+logger = logging.getLogger(__name__)
+
+CHANGELOG_FIELDS = ['build_date', 'gc_orgID', 'change', 'field', 'old_value', 'new_value']
+
+
+def row_fingerprint(row: Dict[str, str], fields: List[str]) -> str:
+    """
+    Return a stable hash of a row's values.
+
+    Args:
+        row: Field values of one organization
+        fields: Column order of the published table
+
+    Returns:
+        Hex digest that changes whenever any field value changes
+    """
+    payload = '\x1f'.join(row.get(field) or '' for field in fields)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def read_rows(csv_file: str) -> Dict[str, Dict[str, str]]:
+    """
+    Read a published table keyed by gc_orgID, empty if it does not exist yet.
+    """
+    if not os.path.exists(csv_file):
+        return {}
+    with open(csv_file, newline='', encoding='utf-8-sig') as f:
+        return {row['gc_orgID']: row for row in csv.DictReader(f)}
+
+
+def read_fingerprints(fingerprint_file: str) -> Optional[Dict[str, str]]:
+    """Read a stored fingerprint table, or None if there is none yet."""
+    if not os.path.exists(fingerprint_file):
+        return None
+    with open(fingerprint_file, newline='', encoding='utf-8') as f:
+        return {row['gc_orgID']: row['fingerprint'] for row in csv.DictReader(f)}
+
+
+def compute_changelog(previous_rows: Dict[str, Dict[str, str]],
+                      current_rows: Dict[str, Dict[str, str]],
+                      fields: List[str],
+                      previous_fingerprints: Optional[Dict[str, str]] = None) -> Dict[str, list]:
+    """
+    Compare two builds of a table.
+
+    Args:
+        previous_rows: Previous build keyed by gc_orgID
+        current_rows: New build keyed by gc_orgID
+        fields: Column order of the table
+        previous_fingerprints: Stored fingerprints of the previous build;
+            computed from previous_rows when not given
+
+    Returns:
+        Dictionary with 'added', 'removed' and 'changed' entries and the new
+        'fingerprints'
+    """
+    if previous_fingerprints is None:
+        previous_fingerprints = {gc_orgid: row_fingerprint(row, fields)
+                                 for gc_orgid, row in previous_rows.items()}
+    current_fingerprints = {gc_orgid: row_fingerprint(row, fields)
+                            for gc_orgid, row in current_rows.items()}
+
+    added = sorted(current_fingerprints.keys() - previous_fingerprints.keys())
+    removed = sorted(previous_fingerprints.keys() - current_fingerprints.keys())
+    changed = []
+    for gc_orgid in sorted(current_fingerprints.keys() & previous_fingerprints.keys()):
+        if current_fingerprints[gc_orgid] == previous_fingerprints[gc_orgid]:
+            continue
+        old_row = previous_rows.get(gc_orgid, {})
+        new_row = current_rows[gc_orgid]
+        diffs = {field: [old_row.get(field, ''), new_row.get(field, '')]
+                 for field in fields if old_row.get(field, '') != new_row.get(field, '')}
+        changed.append({'gc_orgID': gc_orgid, 'fields': diffs})
+
+    return {
+        'added': [{'gc_orgID': gc_orgid, 'row': current_rows[gc_orgid]} for gc_orgid in added],
+        'removed': [{'gc_orgID': gc_orgid, 'row': previous_rows.get(gc_orgid, {})} for gc_orgid in removed],
+        'changed': changed,
+        'fingerprints': current_fingerprints,
+    }
+
+
+def read_text(path: str, encoding: str = 'utf-8') -> str:
+    """Read a text file, empty if it does not exist yet."""
+    if not os.path.exists(path):
+        return ''
+    with open(path, newline='', encoding=encoding) as f:
+        return f.read()
+
+
+def append_changelog(table: str, changelog: Dict[str, list], history_folder: str,
+                     build_date: str) -> None:
+    """
+    Append one build's changes to History/<table>_changelog.json and .csv.
+
+    The JSON file lists the builds oldest first; the CSV file has one line
+    per changed field, tagged with its build date.
+    """
+    json_file = os.path.join(history_folder, f'{table}_changelog.json')
+    existing = read_text(json_file)
+    builds = json.loads(existing)['builds'] if existing else []
+    builds.append({
+        'build_date': build_date,
+        'added': changelog['added'],
+        'removed': changelog['removed'],
+        'changed': changelog['changed'],
+    })
+    write_text(json_file, json.dumps({'table': table, 'builds': builds}, ensure_ascii=False, indent=2))
+
+    csv_file = os.path.join(history_folder, f'{table}_changelog.csv')
+    changelog_csv = io.StringIO(read_text(csv_file, encoding='utf-8-sig'))
+    changelog_csv.seek(0, io.SEEK_END)
+    writer = csv.writer(changelog_csv)
+    if changelog_csv.tell() == 0:
+        writer.writerow(CHANGELOG_FIELDS)
+    for entry in changelog['added']:
+        writer.writerow([build_date, entry['gc_orgID'], 'added', '', '', ''])
+    for entry in changelog['removed']:
+        writer.writerow([build_date, entry['gc_orgID'], 'removed', '', '', ''])
+    for entry in changelog['changed']:
+        for field, (old_value, new_value) in entry['fields'].items():
+            writer.writerow([build_date, entry['gc_orgID'], 'changed', field, old_value, new_value])
+    write_text(csv_file, changelog_csv.getvalue(), encoding='utf-8-sig')
+
+
+def publish_changelog(table: str, previous_rows: Dict[str, Dict[str, str]],
+                      csv_file: str, history_folder: str,
+                      build_date: Optional[str] = None) -> Dict[str, list]:
+    """
+    Record the changes of a freshly published table and store its fingerprints.
+
+    If any row was added, removed or changed, the build is appended to
+    History/<table>_changelog.json (full detail) and History/<table>_changelog.csv
+    (one line per changed field). History/<table>_fingerprints.csv is kept
+    in step with the published table.
+
+    Args:
+        table: Published table name, e.g. 'gc_concordance'
+        previous_rows: Rows of the previous build, read before overwriting
+        csv_file: Path to the CSV that was just written
+        history_folder: Folder for the changelog and fingerprint files
+        build_date: ISO date of the build, defaults to today
+
+    Returns:
+        The changelog as returned by compute_changelog
+    """
+    with open(csv_file, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        fields = [field for field in reader.fieldnames if field != 'gc_orgID']
+        current_rows = {row['gc_orgID']: row for row in reader}
+
+    os.makedirs(history_folder, exist_ok=True)
+    fingerprint_file = os.path.join(history_folder, f'{table}_fingerprints.csv')
+    changelog = compute_changelog(previous_rows, current_rows, fields,
+                                  read_fingerprints(fingerprint_file))
+
+    if changelog['added'] or changelog['removed'] or changelog['changed']:
+        append_changelog(table, changelog, history_folder,
+                         build_date or datetime.date.today().isoformat())
+
+    fingerprint_csv = io.StringIO()
+    writer = csv.writer(fingerprint_csv)
+    writer.writerow(['gc_orgID', 'fingerprint'])
+    writer.writerows(sorted(changelog['fingerprints'].items()))
+    write_text(fingerprint_file, fingerprint_csv.getvalue())
+
+    logger.info("%s changelog: %d added, %d removed, %d changed",
+                table, len(changelog['added']), len(changelog['removed']), len(changelog['changed']))
+    return changelog
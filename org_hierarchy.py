@@ -0,0 +1,185 @@
+"""
+This module builds the portfolio hierarchy encoded in Resources/lead_manual.csv.
+
+Each organization points at its parent through 'Parent GC OrgID', which is
+either another gc_orgID, its own gc_orgID (a lead department) or a ministry
+minID ('m...') from Resources/lead_code_ministers.csv. The hierarchy is
+numbered once with an Euler tour, so every subtree is a contiguous interval:
+ancestor checks are constant time, a portfolio is one slice, and rolling
+numbers up the tree is a prefix sum.
+
+Lead departments are their own parents in lead_manual.csv and nothing in the
+resources links them to a ministry, so each one is a root of its own tree.
+Ministry nodes therefore only hold the organizations whose Parent GC OrgID
+is explicitly their minID.
+"""
+import csv
+import os
+from typing import Dict, List, Optional
+
+
+class PortfolioHierarchy:
+    """
+    Euler-tour index over lead departments, ministries and their organizations.
+    """
+
+    def __init__(self, parents: Dict[str, Optional[str]], names: Dict[str, str],
+                 lead_departments: Dict[str, str]):
+        """
+        Args:
+            parents: Node ID to parent node ID, None for roots
+            names: Node ID to display name
+            lead_departments: gc_orgID to its lead department name
+        """
+        self.parents = parents
+        self.names = names
+        self.lead_departments = lead_departments
+
+        children: Dict[Optional[str], List[str]] = {}
+        for node, parent in parents.items():
+            children.setdefault(parent, []).append(node)
+
+        # Iterative depth-first numbering; tout is one past the last descendant
+        self.order: List[str] = []
+        self.tin: Dict[str, int] = {}
+        self.tout: Dict[str, int] = {}
+        stack = [(root, False) for root in sorted(children.get(None, []), reverse=True)]
+        while stack:
+            node, finished = stack.pop()
+            if finished:
+                self.tout[node] = len(self.order)
+                continue
+            self.tin[node] = len(self.order)
+            self.order.append(node)
+            stack.append((node, True))
+            for child in sorted(children.get(node, []), reverse=True):
+                stack.append((child, False))
+
+        unreachable = set(parents) - set(self.tin)
+        if unreachable:
+            raise ValueError(f"Cycle in Parent GC OrgID involving: {sorted(unreachable)}")
+
+    @classmethod
+    def from_resources(cls, resources_folder: Optional[str] = None) -> 'PortfolioHierarchy':
+        """
+        Build the hierarchy from lead_manual.csv and lead_code_ministers.csv.
+
+        Args:
+            resources_folder: Folder holding both files, defaults to Resources/
+
+        Returns:
+            PortfolioHierarchy over every organization and referenced ministry
+        """
+        if resources_folder is None:
+            script_folder = os.path.dirname(os.path.abspath(__file__))
+            resources_folder = os.path.join(script_folder, 'Resources')
+
+        parents: Dict[str, Optional[str]] = {}
+        names: Dict[str, str] = {}
+        with open(os.path.join(resources_folder, 'lead_code_ministers.csv'),
+                  newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                if row['minID'].startswith('m'):
+                    parents[row['minID']] = None
+                    names[row['minID']] = row['Title']
+
+        lead_departments = {}
+        with open(os.path.join(resources_folder, 'lead_manual.csv'),
+                  newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                gc_orgid = row['gc_orgID']
+                parent = row['Parent GC OrgID'].strip()
+                parents[gc_orgid] = parent if parent and parent != gc_orgid else None
+                names[gc_orgid] = row['Harmonized GC Name']
+                if row['lead_department']:
+                    lead_departments[gc_orgid] = row['lead_department']
+
+        # Ministries referenced by an organization but missing from the list
+        for parent in set(parents.values()) - set(parents) - {None}:
+            parents[parent] = None
+            names.setdefault(parent, parent)
+        return cls(parents, names, lead_departments)
+
+    def lead_department(self, gc_orgid: str) -> Optional[str]:
+        """Return the lead department recorded for an organization."""
+        return self.lead_departments.get(str(gc_orgid))
+
+    def is_ancestor(self, ancestor: str, node: str) -> bool:
+        """Return True if node is ancestor itself or sits below it."""
+        return self.tin[ancestor] <= self.tin[node] < self.tout[ancestor]
+
+    def descendants(self, node: str) -> List[str]:
+        """
+        Return every organization below a node, e.g. a lead department's portfolio.
+
+        Args:
+            node: gc_orgID or ministry minID
+
+        Returns:
+            Node IDs in the subtree, excluding the node itself
+        """
+        return self.order[self.tin[node] + 1:self.tout[node]]
+
+    def portfolio(self, min_id: str) -> List[str]:
+        """
+        Return the gc_orgIDs in a minister's portfolio.
+
+        Only organizations whose Parent GC OrgID is the minID (and the
+        organizations below them) are included. Lead departments are their
+        own roots, so for most ministries the result is empty; use
+        descendants() on the lead department's gc_orgID for its portfolio.
+        """
+        return self.descendants(min_id)
+
+    def path_to_root(self, node: str) -> List[str]:
+        """
+        Return the chain of node IDs from a node up to its root.
+
+        Args:
+            node: gc_orgID or ministry minID
+
+        Returns:
+            Node IDs starting with the node itself
+        """
+        path = [str(node)]
+        while self.parents[path[-1]] is not None:
+            path.append(self.parents[path[-1]])
+        return path
+
+    def rollup(self, gc_orgids, amounts) -> Dict[str, float]:
+        """
+        Total numeric data up the hierarchy.
+
+        Rows may repeat an organization (e.g. one row per transaction);
+        gc_orgIDs that are not in the hierarchy are ignored.
+
+        Args:
+            gc_orgids: Array-like of gc_orgIDs, as numbers or text
+            amounts: Array-like of values aligned with gc_orgids
+
+        Returns:
+            Node ID to the total of its own rows and all of its descendants'
+        """
+        import numpy as np
+
+        keys = np.array(self.order, dtype=str)
+        sort_order = np.argsort(keys)
+        sorted_keys = keys[sort_order]
+
+        ids = np.asarray(gc_orgids)
+        if ids.dtype.kind == 'f':
+            ids = np.where(np.isfinite(ids), ids, -1).astype(np.int64)
+        ids = ids.astype(str)
+        positions = np.searchsorted(sorted_keys, ids)
+        np.clip(positions, 0, len(sorted_keys) - 1, out=positions)
+        known = sorted_keys[positions] == ids
+
+        # Per-node totals in Euler-tour order, then subtree sums from a prefix sum
+        tour_positions = sort_order[positions[known]]
+        own = np.bincount(tour_positions, weights=np.asarray(amounts, dtype=float)[known],
+                          minlength=len(keys))
+        prefix = np.concatenate(([0.0], np.cumsum(own)))
+        tin = np.arange(len(keys))
+        tout = np.array([self.tout[node] for node in self.order])
+        totals = prefix[tout] - prefix[tin]
+        return dict(zip(self.order, totals.tolist()))
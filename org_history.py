@@ -0,0 +1,208 @@
+"""
+This module keeps a versioned history of the published organization tables
+so that lookups can be answered "as of" any past build date.
+
+Each build appends only the fields that changed since the previous build,
+keyed by gc_orgID, to History/org_history.csv. Loading the history builds an
+interval index per (table, gc_orgID, field) so point-in-time lookups are a
+binary search rather than a scan over every past build.
+"""
+import argparse
+import csv
+import datetime
+import logging
+import os
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FIELDS = ['table', 'gc_orgID', 'field', 'valid_from', 'value']
+
+# Pseudo-field recording whether the org is published in the table ('1'/'0')
+PRESENT_FIELD = '_present'
+
+
+def default_history_file() -> str:
+    """
+    Return the path of the history file next to this script.
+
+    Returns:
+        Path to History/org_history.csv
+    """
+    script_folder = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_folder, 'History', 'org_history.csv')
+
+
+def read_published_rows(csv_file: str) -> Dict[str, Dict[str, str]]:
+    """
+    Read a published table into a mapping of gc_orgID to its row.
+
+    Args:
+        csv_file: Path to a published CSV with a gc_orgID column
+
+    Returns:
+        Dictionary of gc_orgID to {field: value}
+    """
+    with open(csv_file, newline='', encoding='utf-8-sig') as f:
+        return {row['gc_orgID']: row for row in csv.DictReader(f)}
+
+
+class OrgHistory:
+    """
+    Interval index over the delta log of published organization tables.
+
+    For every (table, gc_orgID, field) the index holds the sorted list of
+    dates on which the value changed and the value from that date on, so
+    an as-of lookup is one bisect per field.
+    """
+
+    def __init__(self, history_file: Optional[str] = None):
+        self.history_file = history_file or default_history_file()
+        # (table, gc_orgID) -> field -> (valid_from dates, values)
+        self._index: Dict[Tuple[str, str], Dict[str, Tuple[List[str], List[str]]]] = {}
+        if os.path.exists(self.history_file):
+            with open(self.history_file, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    self._add(row['table'], row['gc_orgID'], row['field'],
+                              row['valid_from'], row['value'])
+
+    def _add(self, table: str, gc_orgid: str, field: str,
+             valid_from: str, value: str) -> None:
+        fields = self._index.setdefault((table, gc_orgid), {})
+        dates, values = fields.setdefault(field, ([], []))
+        # Deltas are appended in build order, so dates stay sorted
+        dates.append(valid_from)
+        values.append(value)
+
+    def latest(self, table: str) -> Dict[str, Dict[str, str]]:
+        """
+        Return the most recent recorded state of a table.
+
+        Args:
+            table: Published table name, e.g. 'gc_concordance'
+
+        Returns:
+            Dictionary of gc_orgID to {field: value} for published orgs
+        """
+        state = {}
+        for (row_table, gc_orgid), fields in self._index.items():
+            if row_table != table:
+                continue
+            row = {field: values[-1] for field, (_, values) in fields.items()}
+            if row.pop(PRESENT_FIELD, '0') == '1':
+                state[gc_orgid] = row
+        return state
+
+    def lookup(self, table: str, gc_orgid: str, as_of: str) -> Optional[Dict[str, str]]:
+        """
+        Return an organization's row as it was published on a given date.
+
+        Args:
+            table: Published table name, e.g. 'gc_org_info'
+            gc_orgid: Organization ID
+            as_of: ISO date (YYYY-MM-DD)
+
+        Returns:
+            Dictionary of field values, or None if the org was not published
+            on that date
+        """
+        fields = self._index.get((table, str(gc_orgid)))
+        if not fields:
+            return None
+        row = {}
+        for field, (dates, values) in fields.items():
+            position = bisect_right(dates, as_of)
+            if position:
+                row[field] = values[position - 1]
+        if row.pop(PRESENT_FIELD, '0') != '1':
+            return None
+        return row
+
+    def snapshot(self, table: str, as_of: str) -> Iterator[Dict[str, str]]:
+        """
+        Yield every organization row published in a table on a given date.
+
+        Args:
+            table: Published table name
+            as_of: ISO date (YYYY-MM-DD)
+
+        Yields:
+            Rows including their gc_orgID, in gc_orgID order
+        """
+        gc_orgids = sorted(gc_orgid for row_table, gc_orgid in self._index if row_table == table)
+        for gc_orgid in gc_orgids:
+            row = self.lookup(table, gc_orgid, as_of)
+            if row is not None:
+                yield dict(row, gc_orgID=gc_orgid)
+
+    def append_snapshot(self, table: str, csv_file: str,
+                        build_date: Optional[str] = None) -> int:
+        """
+        Record a freshly published table, storing only what changed.
+
+        Args:
+            table: Published table name
+            csv_file: Path to the CSV that was just written
+            build_date: ISO date of the build, defaults to today
+
+        Returns:
+            Number of delta rows appended to the history file
+        """
+        build_date = build_date or datetime.date.today().isoformat()
+        previous = self.latest(table)
+        current = read_published_rows(csv_file)
+
+        deltas = []
+        for gc_orgid, row in current.items():
+            old_row = previous.get(gc_orgid)
+            if old_row is None:
+                deltas.append((gc_orgid, PRESENT_FIELD, '1'))
+            for field, value in row.items():
+                if field == 'gc_orgID':
+                    continue
+                if old_row is None or old_row.get(field) != value:
+                    deltas.append((gc_orgid, field, value))
+        for gc_orgid in previous.keys() - current.keys():
+            deltas.append((gc_orgid, PRESENT_FIELD, '0'))
+
+        if not deltas:
+            logger.info("No changes to record in history for %s", table)
+            return 0
+
+        os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
+        write_header = not os.path.exists(self.history_file)
+        with open(self.history_file, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(HISTORY_FIELDS)
+            for gc_orgid, field, value in deltas:
+                writer.writerow([table, gc_orgid, field, build_date, value])
+                self._add(table, gc_orgid, field, build_date, value)
+
+        logger.info("Recorded %d changed values for %s in %s",
+                    len(deltas), table, self.history_file)
+        return len(deltas)
+
+
+def main() -> None:
+    """
+    Print an organization's published row as of a given date.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('gc_orgID')
+    parser.add_argument('as_of', help='ISO date, e.g. 2024-04-01')
+    parser.add_argument('--table', default='gc_org_info',
+                        choices=['gc_org_info', 'gc_concordance'])
+    args = parser.parse_args()
+
+    row = OrgHistory().lookup(args.table, args.gc_orgID, args.as_of)
+    if row is None:
+        print(f"gc_orgID {args.gc_orgID} was not published in {args.table} on {args.as_of}")
+        return
+    for field, value in row.items():
+        print(f"{field}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+This module gives lightweight access to the published organization tables.
+
+It only depends on the standard library, so looking up a handful of
+organizations does not pay for importing pandas. pandas is imported lazily,
+and only by the methods that return a DataFrame.
+"""
+import csv
+import os
+from typing import Dict, List, Optional
+
+ID_COLUMNS = ['gc_orgID', 'infobaseID', 'rg', 'pop', 'phoenix', 'open_gov_ouvert']
+
+
+class OrgRegistry:
+    """
+    In-memory view of gc_concordance.csv and gc_org_info.csv keyed by gc_orgID.
+    """
+
+    def __init__(self, script_folder: Optional[str] = None):
+        self.script_folder = script_folder or os.path.dirname(os.path.abspath(__file__))
+        self.concordance = self._read('gc_concordance.csv')
+        self.org_info = self._read('gc_org_info.csv')
+        self._id_indexes: Dict[str, Dict[str, List[str]]] = {}
+        self._autocomplete = None
+        self._history = None
+
+    def _read(self, filename: str) -> Dict[str, Dict[str, str]]:
+        with open(os.path.join(self.script_folder, filename), newline='', encoding='utf-8-sig') as f:
+            return {row['gc_orgID']: row for row in csv.DictReader(f)}
+
+    def get(self, gc_orgid: str) -> Optional[Dict[str, str]]:
+        """
+        Return everything published about an organization.
+
+        Args:
+            gc_orgid: Organization ID
+
+        Returns:
+            Combined gc_org_info and gc_concordance fields, or None if unknown
+        """
+        gc_orgid = str(gc_orgid)
+        if gc_orgid not in self.org_info and gc_orgid not in self.concordance:
+            return None
+        row = dict(self.org_info.get(gc_orgid, {}))
+        row.update(self.concordance.get(gc_orgid, {}))
+        return row
+
+    def find(self, id_column: str, value: str) -> List[str]:
+        """
+        Return the gc_orgIDs carrying an identifier from another system.
+
+        Args:
+            id_column: Concordance column, e.g. 'rg' or 'pop'
+            value: Identifier to look for
+
+        Returns:
+            Matching gc_orgIDs, possibly several (e.g. a shared RG number)
+        """
+        if id_column not in ID_COLUMNS:
+            raise ValueError(f"Unknown ID column: {id_column}")
+        if id_column not in self._id_indexes:
+            index = {}
+            for gc_orgid, row in self.concordance.items():
+                if row[id_column]:
+                    index.setdefault(row[id_column], []).append(gc_orgid)
+            self._id_indexes[id_column] = index
+        return self._id_indexes[id_column].get(str(value), [])
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Return the gc_orgIDs whose names best match a partial name.
+
+        Args:
+            query: Partial English or French name or abbreviation
+            limit: Maximum number of results
+
+        Returns:
+            List of gc_orgIDs, best match first
+        """
+        if self._autocomplete is None:
+            from autocomplete import AutocompleteIndex
+            self._autocomplete = AutocompleteIndex.from_org_info(
+                os.path.join(self.script_folder, 'gc_org_info.csv'))
+        return self._autocomplete.search(query, limit)
+
+    def as_of(self, gc_orgid: str, date: str, table: str = 'gc_org_info') -> Optional[Dict[str, str]]:
+        """
+        Return an organization's row as it was published on a past date.
+
+        Args:
+            gc_orgid: Organization ID
+            date: ISO date (YYYY-MM-DD)
+            table: 'gc_org_info' or 'gc_concordance'
+
+        Returns:
+            Dictionary of field values, or None if it was not published then
+        """
+        if self._history is None:
+            from org_history import OrgHistory
+            self._history = OrgHistory(os.path.join(self.script_folder, 'History', 'org_history.csv'))
+        return self._history.lookup(table, gc_orgid, date)
+
+    def to_dataframe(self, table: str = 'gc_org_info'):
+        """
+        Return a published table as a pandas DataFrame.
+
+        Args:
+            table: 'gc_org_info' or 'gc_concordance'
+
+        Returns:
+            DataFrame with every column read as text
+        """
+        tables = {'gc_org_info': self.org_info, 'gc_concordance': self.concordance}
+        if table not in tables:
+            raise ValueError(f"Unknown table: {table}")
+        import pandas as pd
+        return pd.DataFrame(list(tables[table].values()))
@@ -0,0 +1,182 @@
+"""
+This module writes generated files atomically and only when their content changes.
+
+Every output is first written to a temporary file in the same folder. If its
+content hash matches the existing file, the temporary file is discarded and
+the existing file (and its modification time) is left alone; otherwise the
+temporary file is renamed over the output in one step, so readers never see
+a half-written file. Each write is recorded so a stage can report which of
+its outputs actually changed.
+"""
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Outcome of every output written by this process: path -> True if changed
+_OUTPUTS: Dict[str, bool] = {}
+
+
+def file_hash(path: str) -> str:
+    """
+    Return the SHA-256 digest of a file's content.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def atomic_output(path: str) -> Iterator[str]:
+    """
+    Yield a temporary path to write an output to, then publish it atomically.
+
+    On leaving the block the temporary file replaces the output if its
+    content differs, or is deleted if it is identical. If the block raises,
+    the output is left untouched.
+
+    Args:
+        path: Final output path
+
+    Yields:
+        Temporary path in the same folder as the output
+    """
+    path = os.path.abspath(path)
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=folder, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    os.close(handle)
+    try:
+        yield temp_path
+        if os.path.exists(path) and file_hash(path) == file_hash(temp_path):
+            os.remove(temp_path)
+            _OUTPUTS[path] = False
+            logger.info("Unchanged, not rewritten: %s", path)
+            return
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, path)
+        _OUTPUTS[path] = True
+        logger.info("Updated: %s", path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def write_csv(df, path: str, **to_csv_kwargs) -> bool:
+    """
+    Write a DataFrame to CSV atomically, skipping the write if unchanged.
+
+    Args:
+        df: DataFrame to write
+        path: Output CSV path
+        **to_csv_kwargs: Passed to DataFrame.to_csv (index, encoding, ...)
+
+    Returns:
+        True if the output changed
+    """
+    with atomic_output(path) as temp_path:
+        df.to_csv(temp_path, **to_csv_kwargs)
+    return _OUTPUTS[os.path.abspath(path)]
+
+
+def write_text(path: str, text: str, encoding: str = 'utf-8') -> bool:
+    """
+    Write text atomically, skipping the write if unchanged.
+
+    Args:
+        path: Output path
+        text: Content to write
+        encoding: Text encoding, e.g. 'utf-8-sig' to add a BOM
+
+    Returns:
+        True if the output changed
+    """
+    with atomic_output(path) as temp_path:
+        with open(temp_path, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+    return _OUTPUTS[os.path.abspath(path)]
+
+
+def write_chunks(path: str, chunks: Iterable[str], encoding: str = 'utf-8') -> bool:
+    """
+    Write text arriving in pieces atomically, skipping the write if unchanged.
+
+    Only one chunk is held in memory at a time, so a streamed download can be
+    written without collecting it first.
+
+    Args:
+        path: Output path
+        chunks: Text pieces, written in order
+        encoding: Text encoding, e.g. 'utf-8-sig' to add a BOM
+
+    Returns:
+        True if the output changed
+    """
+    with atomic_output(path) as temp_path:
+        with open(temp_path, 'w', encoding=encoding, newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+    return _OUTPUTS[os.path.abspath(path)]
+
+
+def write_bytes(path: str, data: bytes) -> bool:
+    """
+    Write bytes atomically, skipping the write if unchanged.
+
+    Args:
+        path: Output path
+        data: Content to write
+
+    Returns:
+        True if the output changed
+    """
+    with atomic_output(path) as temp_path:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+    return _OUTPUTS[os.path.abspath(path)]
+
+
+def changed_outputs() -> List[str]:
+    """Return the outputs whose content changed in this process."""
+    return [path for path, changed in _OUTPUTS.items() if changed]
+
+
+def unchanged_outputs() -> List[str]:
+    """Return the outputs that were skipped because their content was identical."""
+    return [path for path, changed in _OUTPUTS.items() if not changed]
+
+
+def clear_outputs() -> None:
+    """Forget the recorded outputs, so a long-running process can report each run on its own."""
+    _OUTPUTS.clear()
+
+
+def report_outputs() -> None:
+    """
+    Print which outputs changed and which were left untouched.
+    """
+    changed = changed_outputs()
+    unchanged = unchanged_outputs()
+    print(f"Outputs changed: {len(changed)}, unchanged: {len(unchanged)}")
+    for path in changed:
+        print(f"  changed: {path}")
+    for path in unchanged:
+        print(f"  unchanged: {path}")
@@ -0,0 +1,133 @@
+"""
+This module applies the manual corrections kept in Resources/overrides.csv.
+
+Every correction is one row: the table it applies to, the action ('set' to
+change a field, 'insert' to add a row), the key field and key identifying the
+row, the field and its new value, and the reason for the change. The file is
+the single place to review what the build changes by hand.
+
+Overrides are applied as one keyed update per table: the table's keys are
+looked up in the override index once, so the cost grows with rows plus
+overrides rather than rows times overrides.
+"""
+import logging
+import os
+from typing import Optional
+
+import pandas as pd
+
+from build_profile import profiled
+from coalesce import SOURCE_SUFFIX
+from id_normalize import normalize_gc_orgid
+
+logger = logging.getLogger(__name__)
+
+OVERRIDE_COLUMNS = ['table', 'action', 'key_field', 'key', 'field', 'value', 'reason']
+ACTIONS = {'set', 'insert'}
+OVERRIDE_SOURCE = 'overrides.csv'
+
+# Key fields holding identifiers, matched as normalized codes ('2271', never '2271.0')
+ID_KEY_FIELDS = {'gc_orgID'}
+
+
+def load_overrides(overrides_file: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load the override table.
+
+    Args:
+        overrides_file: Path to the overrides CSV, defaults to Resources/overrides.csv
+
+    Returns:
+        DataFrame of overrides with every value as text
+
+    Raises:
+        ValueError: If a column is missing or an action is unknown
+    """
+    if overrides_file is None:
+        script_folder = os.path.dirname(os.path.abspath(__file__))
+        overrides_file = os.path.join(script_folder, 'Resources', 'overrides.csv')
+
+    overrides = pd.read_csv(overrides_file, dtype=str, keep_default_na=False)
+    missing_columns = [column for column in OVERRIDE_COLUMNS if column not in overrides.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns in {overrides_file}: {missing_columns}")
+    unknown_actions = set(overrides['action']) - ACTIONS
+    if unknown_actions:
+        raise ValueError(f"Unknown override actions in {overrides_file}: {sorted(unknown_actions)}")
+    return overrides[OVERRIDE_COLUMNS]
+
+
+def key_values(values: pd.Series, key_field: str) -> pd.Series:
+    """Return a key column as the text the override keys are matched against."""
+    if key_field in ID_KEY_FIELDS:
+        return normalize_gc_orgid(values)
+    return values.astype(str)
+
+
+def cast_like(values: pd.Series, column: pd.Series) -> pd.Series:
+    """Convert override text to the dtype of the column it replaces."""
+    if pd.api.types.is_numeric_dtype(column):
+        return pd.to_numeric(values).astype(column.dtype)
+    return values
+
+
+@profiled('overrides')
+def apply_overrides(df: pd.DataFrame, table: str,
+                    overrides: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Apply the overrides for one table.
+
+    Inserted rows are appended first, then every 'set' override is applied
+    in one keyed pass per key field.
+
+    Args:
+        df: Table to correct
+        table: Name of the table in the overrides file, e.g. 'gc_concordance'
+        overrides: Loaded override table, read from the default file if not given
+
+    Returns:
+        Corrected table
+
+    Raises:
+        ValueError: If an override names a field the table does not have
+    """
+    if overrides is None:
+        overrides = load_overrides()
+    table_overrides = overrides[overrides['table'] == table]
+
+    unknown_fields = set(table_overrides['field']) - set(df.columns)
+    if unknown_fields:
+        raise ValueError(f"Overrides for {table} name unknown fields: {sorted(unknown_fields)}")
+
+    inserts = table_overrides[table_overrides['action'] == 'insert']
+    if not inserts.empty:
+        new_rows = inserts.pivot(index=['key_field', 'key'], columns='field', values='value')
+        new_rows = pd.DataFrame([
+            {key_field: key, **row.dropna().to_dict()}
+            for (key_field, key), row in new_rows.iterrows()
+        ])
+        df = pd.concat([df, new_rows], ignore_index=True)
+
+    updates = table_overrides[table_overrides['action'] == 'set']
+    for key_field, key_updates in updates.groupby('key_field', sort=False):
+        # One row per key with a column per overridden field
+        wide = key_updates.assign(key=key_values(key_updates['key'], key_field))
+        wide = wide.pivot(index='key', columns='field', values='value')
+        positions = wide.index.get_indexer(key_values(df[key_field], key_field))
+        matched = positions >= 0
+
+        unmatched_keys = set(wide.index) - set(wide.index[positions[matched]])
+        if unmatched_keys:
+            logger.warning("Overrides for %s match no %s: %s", table, key_field, sorted(unmatched_keys))
+
+        rows = df.index[matched]
+        for field in wide.columns:
+            values = pd.Series(wide[field].to_numpy()[positions[matched]], index=rows)
+            values = values.dropna()
+            df.loc[values.index, field] = cast_like(values, df[field])
+            # Coalesced fields record that the override won
+            if field + SOURCE_SUFFIX in df.columns:
+                df.loc[values.index, field + SOURCE_SUFFIX] = OVERRIDE_SOURCE
+
+    logger.info("Applied %d overrides to %s", len(table_overrides), table)
+    return df
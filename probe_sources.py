@@ -0,0 +1,332 @@
+"""
+This module checks the upstream sources for changes without rerunning the
+pipeline, and says which stages need to run again.
+
+Each source is fetched with a conditional request (If-None-Match /
+If-Modified-Since from the last observation), so an unchanged source costs
+one 304 response. When the server sends the body it is streamed through a
+SHA-256 hash and never kept. F-11.xml (the Financial Administration Act) is
+parsed and every schedule group the FAA scrapers read is hashed on its own,
+so a change to Schedule II is reported as exactly that. Only the text of a
+schedule is hashed: amendments that touch only LIMS metadata such as dates
+are not reported.
+
+Hashes are compared with History/source_state.json, the upstream state the
+last build was made from. Running with --record after a build stores the
+latest observation (History/source_probe.json) as that state.
+
+Examples:
+    python probe_sources.py
+    python probe_sources.py --source faa --source rg --json
+    python probe_sources.py --record
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import os
+import sys
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+
+import requests
+
+from output_writer import write_text
+from stream_download import CHUNK_SIZE, TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+script_folder = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = os.path.join(script_folder, 'History', 'source_state.json')
+PROBE_FILE = os.path.join(script_folder, 'History', 'source_probe.json')
+
+FAA_URL = 'https://laws-lois.justice.gc.ca/eng/XML/F-11.xml'
+DATASTORE_URL = 'https://open.canada.ca/data/en/datastore/dump/{}?bom=True'
+
+# Scripts of the update workflow, in the order they run
+PIPELINE_ORDER = [
+    'Scraping/scrape_FAA1.py',
+    'Scraping/scrape_FAA1i.py',
+    'Scraping/scrape_FAA2.py',
+    'Scraping/scrape_FAA3.py',
+    'Scraping/scrape_FAA4.py',
+    'Scraping/scrape_FAA5.py',
+    'Scraping/combine_FAA_names.py',
+    'Resources/retrieve_datasets.py',
+    'Resources/rg_download.py',
+    'Resources/rg_fuzzy.py',
+    'Resources/rg_final_match.py',
+    'Resources/lead_ministry_retrieve.py',
+    'create_harmonized_name.py',
+    'build_gc_org.py',
+    'Resources/lead_fix.py',
+]
+
+FAA_STAGES = ['Scraping/combine_FAA_names.py', 'build_gc_org.py']
+DATASET_STAGES = ['Resources/retrieve_datasets.py', 'create_harmonized_name.py', 'build_gc_org.py']
+RG_STAGES = ['Resources/rg_download.py', 'Resources/rg_fuzzy.py', 'Resources/rg_final_match.py',
+             'build_gc_org.py']
+MINISTRY_STAGES = ['Resources/lead_ministry_retrieve.py', 'build_gc_org.py', 'Resources/lead_fix.py']
+
+# FAA schedule -> (element tag, element ids, scraper); the ids are the ones the scrapers look up
+FAA_SCHEDULES = {
+    'FAA 1': ('BilingualGroup', ['230473'], 'Scraping/scrape_FAA1.py'),
+    'FAA i1': ('tbody', ['230503'], 'Scraping/scrape_FAA1i.py'),
+    'FAA 2': ('BilingualGroup', ['230508'], 'Scraping/scrape_FAA2.py'),
+    'FAA 3': ('BilingualGroup', ['230535', '230572'], 'Scraping/scrape_FAA3.py'),
+    'FAA 4': ('BilingualGroup', ['230579'], 'Scraping/scrape_FAA4.py'),
+    'FAA 5': ('BilingualGroup', ['230642'], 'Scraping/scrape_FAA5.py'),
+}
+
+# Source name -> (URL, stages that consume it); the same addresses as the download scripts
+SOURCES = {
+    'faa': (FAA_URL, FAA_STAGES),
+    'infobase_en': (DATASTORE_URL.format('7c131a87-7784-4208-8e5c-043451240d95'), DATASET_STAGES),
+    'infobase_fr': (DATASTORE_URL.format('45069fe9-abe3-437f-97dd-3f64958bfa85'), DATASET_STAGES),
+    'applied_en': (DATASTORE_URL.format('f0ca63e0-c15e-45b5-9656-77abe1564b1c'), DATASET_STAGES),
+    'applied_fr': ('https://ouvert.canada.ca/data/fr/datastore/dump/f0ca63e0-c15e-45b5-9656-77abe1564b1c?bom=True',
+                   DATASET_STAGES),
+    'ogp': (DATASTORE_URL.format('04cbec5c-5a3d-4d34-927d-e41c9e6e3736'), ['Resources/retrieve_datasets.py']),
+    'rg': ('https://donnees-data.tpsgc-pwgsc.gc.ca/ba1/min-dept/min-dept.csv', RG_STAGES),
+    'ministries_en': ('https://www.ourcommons.ca/members/en/ministries/csv', MINISTRY_STAGES),
+    'ministries_fr': ('https://www.ourcommons.ca/members/fr/ministries/csv', MINISTRY_STAGES),
+}
+
+
+def text_hash(element: ET.Element) -> str:
+    """Return a hash of the text inside an element, ignoring layout whitespace."""
+    pieces = (piece.strip() for piece in element.itertext())
+    payload = '\x1f'.join(piece for piece in pieces if piece)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def local_name(name: str) -> str:
+    """Drop the {namespace} prefix of a tag or attribute name."""
+    return name.rsplit('}', 1)[-1]
+
+
+def schedule_hashes(content: bytes) -> Dict[str, Optional[str]]:
+    """
+    Hash each FAA schedule group in F-11.xml.
+
+    Returns:
+        Schedule name -> hash, or None if one of its groups is missing
+    """
+    wanted = {(tag, element_id) for tag, ids, _ in FAA_SCHEDULES.values() for element_id in ids}
+    found = {}
+    for element in ET.fromstring(content).iter():
+        tag = local_name(element.tag) if isinstance(element.tag, str) else ''
+        for key, value in element.attrib.items():
+            if local_name(key) == 'id' and (tag, value) in wanted:
+                found[(tag, value)] = text_hash(element)
+
+    hashes = {}
+    for schedule, (tag, ids, _) in FAA_SCHEDULES.items():
+        parts = [found.get((tag, element_id)) for element_id in ids]
+        hashes[schedule] = None if None in parts else '-'.join(parts)
+    return hashes
+
+
+def fetch(name: str, url: str, previous: Dict) -> Dict:
+    """
+    Observe one source, downloading it only if the server says it changed.
+
+    Args:
+        name: Source name
+        url: Address of the source
+        previous: Last observation of the source, empty if none
+
+    Returns:
+        Observation with sha256, the response validators and, for the FAA,
+        the schedule hashes
+    """
+    headers = {'Accept-Encoding': 'gzip'}
+    if previous.get('sha256') and previous.get('etag'):
+        headers['If-None-Match'] = previous['etag']
+    if previous.get('sha256') and previous.get('last_modified'):
+        headers['If-Modified-Since'] = previous['last_modified']
+
+    checked = datetime.datetime.now().isoformat(timespec='seconds')
+    with requests.get(url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+        if response.status_code == 304:
+            return dict(previous, checked=checked, downloaded=False)
+        response.raise_for_status()
+
+        observation = {
+            'url': url,
+            'checked': checked,
+            'downloaded': True,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        digest = hashlib.sha256()
+        if name == 'faa':
+            # The schedules are found by parsing the whole document
+            content = response.content
+            digest.update(content)
+            observation['schedules'] = schedule_hashes(content)
+        else:
+            for block in response.iter_content(CHUNK_SIZE):
+                digest.update(block)
+        observation['sha256'] = digest.hexdigest()
+    return observation
+
+
+def compare(name: str, observation: Dict, recorded: Optional[Dict]) -> Dict:
+    """
+    Compare an observation with the state recorded at the last build.
+
+    Returns:
+        Result with status ('unchanged', 'changed' or 'new'), the schedules
+        that changed and the stages to run again
+    """
+    stages = SOURCES[name][1]
+    result = {'source': name, 'status': 'unchanged', 'schedules': {}, 'stages': []}
+    if recorded is None:
+        result['status'] = 'new'
+        if name == 'faa':
+            result['stages'] = [scraper for _, _, scraper in FAA_SCHEDULES.values()]
+        result['stages'] += stages
+        return result
+    if observation['sha256'] == recorded.get('sha256'):
+        return result
+
+    result['status'] = 'changed'
+    if name != 'faa':
+        result['stages'] = list(stages)
+        return result
+
+    old_schedules = recorded.get('schedules', {})
+    for schedule, schedule_hash in observation.get('schedules', {}).items():
+        if schedule_hash is None:
+            status = 'missing'
+        elif schedule not in old_schedules:
+            status = 'new'
+        elif schedule_hash != old_schedules[schedule]:
+            status = 'changed'
+        else:
+            continue
+        result['schedules'][schedule] = status
+        result['stages'].append(FAA_SCHEDULES[schedule][2])
+    if result['stages']:
+        result['stages'] += stages
+    return result
+
+
+def read_json(path: str) -> Dict:
+    """Read a state file, empty if it does not exist yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def probe_sources(names: Optional[List[str]] = None) -> Dict:
+    """
+    Probe the upstream sources and compare them with the last build.
+
+    The observations are written to History/source_probe.json.
+
+    Args:
+        names: Sources to probe, defaults to all of SOURCES
+
+    Returns:
+        Report with one result per source, the errors and the stages to run
+        in pipeline order
+    """
+    recorded = read_json(STATE_FILE).get('sources', {})
+    probe = read_json(PROBE_FILE)
+    observations = probe.get('sources', {})
+
+    results, errors = [], {}
+    for name in names or list(SOURCES):
+        url = SOURCES[name][0]
+        # The latest observation has the freshest validators for a 304
+        previous = observations.get(name) or recorded.get(name) or {}
+        if previous.get('url') != url:
+            previous = {}
+        try:
+            observations[name] = fetch(name, url, previous)
+        except (requests.RequestException, ET.ParseError) as e:
+            logger.info("Could not probe %s: %s", name, e)
+            errors[name] = str(e)
+            continue
+        results.append(compare(name, observations[name], recorded.get(name)))
+
+    write_text(PROBE_FILE, json.dumps({'sources': observations}, indent=2) + '\n')
+    affected = {stage for result in results for stage in result['stages']}
+    return {
+        'results': results,
+        'errors': errors,
+        'stages': [stage for stage in PIPELINE_ORDER if stage in affected],
+    }
+
+
+def record_state(names: Optional[List[str]] = None) -> None:
+    """
+    Store the latest observations as the state the build was made from.
+
+    Args:
+        names: Sources to record, defaults to every probed source
+    """
+    observations = read_json(PROBE_FILE).get('sources', {})
+    state = read_json(STATE_FILE)
+    sources = state.get('sources', {})
+    for name in names or list(observations):
+        if name in observations:
+            sources[name] = observations[name]
+    state['sources'] = sources
+    state['recorded'] = datetime.datetime.now().isoformat(timespec='seconds')
+    write_text(STATE_FILE, json.dumps(state, indent=2) + '\n')
+
+
+def print_report(report: Dict) -> None:
+    """Print one line per source and schedule, then the stages to run."""
+    for result in report['results']:
+        print(f"{result['source']:<15} {result['status']}")
+        for schedule, status in result['schedules'].items():
+            print(f"  {schedule:<13} {status}")
+        if result['source'] == 'faa' and result['status'] == 'changed' and not result['schedules']:
+            print("  (no schedule changed)")
+    for name, error in report['errors'].items():
+        print(f"{name:<15} error: {error}")
+    if report['stages']:
+        print("\nStages to run:")
+        for stage in report['stages']:
+            print(f"  {stage}")
+    else:
+        print("\nNo upstream changes since the last build")
+
+
+def main() -> int:
+    """
+    Report which upstream sources and FAA schedules changed since the last build.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--source', action='append', choices=list(SOURCES),
+                        help='probe only this source (repeatable)')
+    parser.add_argument('--record', action='store_true',
+                        help='store the latest probe as the state of the last build')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--exit-code', action='store_true',
+                        help='exit with status 1 when a source changed')
+    args = parser.parse_args()
+
+    if args.record:
+        record_state(args.source)
+        print(f"Recorded upstream state in {STATE_FILE}")
+        return 0
+
+    report = probe_sources(args.source)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if report['errors']:
+        return 2
+    return 1 if args.exit_code and report['stages'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
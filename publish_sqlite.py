@@ -0,0 +1,256 @@
+"""
+This module publishes the generated tables as a single SQLite database,
+gc_org.sqlite, for ad-hoc joins and name search without pandas.
+
+The database holds the concordance, the organization info, the lead
+department hierarchy, the ministries and the RG crosswalk, with an index on
+every identifier column and an FTS5 table over the English and French names.
+It is built from scratch in one bulk transaction in a temporary file, then
+moved into place so readers never see a partial database (and left alone if
+nothing changed).
+"""
+import csv
+import logging
+import os
+import re
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from output_writer import atomic_output
+
+logger = logging.getLogger(__name__)
+
+DATABASE_NAME = 'gc_org.sqlite'
+
+SCHEMA = """
+CREATE TABLE concordance (
+    gc_orgID INTEGER PRIMARY KEY,
+    harmonized_name TEXT,
+    "nom_harmonisé" TEXT,
+    abbreviation TEXT,
+    abreviation TEXT,
+    infobaseID INTEGER,
+    rg INTEGER,
+    ati TEXT,
+    open_gov_ouvert TEXT,
+    pop TEXT,
+    phoenix TEXT,
+    website TEXT,
+    site_web TEXT
+);
+CREATE INDEX concordance_infobaseID ON concordance (infobaseID);
+CREATE INDEX concordance_rg ON concordance (rg);
+CREATE INDEX concordance_ati ON concordance (ati);
+CREATE INDEX concordance_open_gov_ouvert ON concordance (open_gov_ouvert);
+CREATE INDEX concordance_pop ON concordance (pop);
+CREATE INDEX concordance_phoenix ON concordance (phoenix);
+
+CREATE TABLE org_info (
+    gc_orgID INTEGER PRIMARY KEY,
+    harmonized_name TEXT,
+    "nom_harmonisé" TEXT,
+    legal_title TEXT,
+    "appellation_légale" TEXT,
+    preferred_name TEXT,
+    "nom_préféré" TEXT,
+    lead_department TEXT,
+    "ministère_responsable" TEXT,
+    abbreviation TEXT,
+    abreviation TEXT,
+    FAA_LGFP TEXT,
+    status_statut TEXT,
+    end_date_fin INTEGER
+);
+CREATE INDEX org_info_lead_department ON org_info (lead_department);
+
+CREATE TABLE lead_hierarchy (
+    gc_orgID INTEGER PRIMARY KEY,
+    parent_id TEXT,
+    harmonized_name TEXT,
+    lead_department TEXT,
+    "ministère_responsable" TEXT
+);
+CREATE INDEX lead_hierarchy_parent_id ON lead_hierarchy (parent_id);
+
+CREATE TABLE ministries (
+    minID TEXT PRIMARY KEY,
+    title TEXT,
+    titre TEXT
+);
+
+CREATE TABLE rg_crosswalk (
+    rg_original_name TEXT,
+    rgnumber INTEGER,
+    gc_orgID INTEGER
+);
+CREATE INDEX rg_crosswalk_rgnumber ON rg_crosswalk (rgnumber);
+CREATE INDEX rg_crosswalk_gc_orgID ON rg_crosswalk (gc_orgID);
+
+CREATE VIRTUAL TABLE org_names_fts USING fts5 (
+    gc_orgID UNINDEXED,
+    harmonized_name,
+    "nom_harmonisé",
+    legal_title,
+    "appellation_légale",
+    preferred_name,
+    "nom_préféré",
+    abbreviation,
+    abreviation,
+    tokenize = "unicode61 remove_diacritics 2"
+);
+"""
+
+INTEGER_COLUMNS = {'gc_orgID', 'infobaseID', 'rg', 'rgnumber', 'end_date_fin'}
+
+# Whole numbers, optionally with the '.0' suffix left by float round-trips
+INTEGER_PATTERN = re.compile(r'\s*([+-]?\d+)(?:\.0*)?\s*')
+
+# Integer columns where 0 is a placeholder for a missing value
+ZERO_AS_NULL_COLUMNS = {'rg'}
+
+FTS_COLUMNS = ['gc_orgID', 'harmonized_name', 'nom_harmonisé', 'legal_title',
+               'appellation_légale', 'preferred_name', 'nom_préféré',
+               'abbreviation', 'abreviation']
+
+
+def read_csv_rows(path: str) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Read a CSV file into its column names and a list of dictionaries."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        return list(reader.fieldnames or []), list(reader)
+
+
+def to_sql_value(column: str, value: Optional[str]):
+    """
+    Convert a CSV cell to the value stored in SQLite.
+
+    Empty cells become NULL and integer columns drop any '.0' suffix left by
+    float round-trips in the source files; a 0 in rg also becomes NULL.
+
+    Raises:
+        ValueError: If an integer column holds something that is not a whole number
+    """
+    if value is None or value == '':
+        return None
+    if column in INTEGER_COLUMNS:
+        match = INTEGER_PATTERN.fullmatch(value)
+        if match is None:
+            raise ValueError(f"not a whole number: {value!r}")
+        number = int(match.group(1))
+        if number == 0 and column in ZERO_AS_NULL_COLUMNS:
+            return None
+        return number
+    return value
+
+
+def insert_rows(connection: sqlite3.Connection, table: str,
+                columns: List[str], rows: List[Dict[str, str]],
+                source_columns: Optional[List[str]] = None,
+                key: Optional[str] = None) -> None:
+    """
+    Bulk insert rows, optionally reading them from differently named columns.
+
+    If key names the table's primary key column, rows without a key and rows
+    repeating an earlier key are skipped. Skipped rows and integer cells that
+    are not numbers (stored as NULL) are reported as warnings rather than
+    aborting the publish.
+    """
+    source_columns = source_columns or columns
+    values = []
+    seen_keys = set()
+    missing_keys = 0
+    duplicate_keys = []
+    unparsable = []
+    for row in rows:
+        row_values = []
+        for column, source in zip(columns, source_columns):
+            try:
+                row_values.append(to_sql_value(column, row.get(source)))
+            except ValueError:
+                unparsable.append(f"{column}={row.get(source)!r}")
+                row_values.append(None)
+        if key is not None:
+            key_value = row_values[columns.index(key)]
+            if key_value is None:
+                missing_keys += 1
+                continue
+            if key_value in seen_keys:
+                duplicate_keys.append(key_value)
+                continue
+            seen_keys.add(key_value)
+        values.append(row_values)
+
+    if missing_keys:
+        logger.warning("%s: skipped %d rows without a %s", table, missing_keys, key)
+    if duplicate_keys:
+        logger.warning("%s: skipped %d rows repeating a %s: %s",
+                       table, len(duplicate_keys), key, sorted(set(duplicate_keys)))
+    if unparsable:
+        logger.warning("%s: stored %d values that are not integers as NULL: %s",
+                       table, len(unparsable), unparsable[:10])
+
+    placeholders = ', '.join('?' for _ in columns)
+    quoted = ', '.join(f'"{column}"' for column in columns)
+    connection.executemany(f'INSERT INTO {table} ({quoted}) VALUES ({placeholders})', values)
+
+
+def build_database(script_folder: str) -> str:
+    """
+    Build gc_org.sqlite from the published CSVs and the manual resources.
+
+    Args:
+        script_folder: Folder holding gc_concordance.csv and gc_org_info.csv
+
+    Returns:
+        Path of the database
+    """
+    resources_folder = os.path.join(script_folder, 'Resources')
+    database_file = os.path.join(script_folder, DATABASE_NAME)
+
+    concordance_columns, concordance = read_csv_rows(os.path.join(script_folder, 'gc_concordance.csv'))
+    org_info_columns, org_info = read_csv_rows(os.path.join(script_folder, 'gc_org_info.csv'))
+    _, lead_manual = read_csv_rows(os.path.join(resources_folder, 'lead_manual.csv'))
+    _, ministers = read_csv_rows(os.path.join(resources_folder, 'lead_code_ministers.csv'))
+    _, rg_final = read_csv_rows(os.path.join(resources_folder, 'rg_final.csv'))
+
+    with atomic_output(database_file) as temp_file:
+        connection = sqlite3.connect(temp_file)
+        try:
+            connection.executescript(SCHEMA)
+            with connection:
+                insert_rows(connection, 'concordance', concordance_columns, concordance, key='gc_orgID')
+                insert_rows(connection, 'org_info', org_info_columns, org_info, key='gc_orgID')
+                insert_rows(
+                    connection, 'lead_hierarchy',
+                    ['gc_orgID', 'parent_id', 'harmonized_name', 'lead_department', 'ministère_responsable'],
+                    lead_manual,
+                    ['gc_orgID', 'Parent GC OrgID', 'Harmonized GC Name', 'lead_department', 'ministère_responsable'],
+                    key='gc_orgID'
+                )
+                insert_rows(connection, 'ministries', ['minID', 'title', 'titre'],
+                            [row for row in ministers if row['minID'].startswith('m')],
+                            ['minID', 'Title', 'Titre'], key='minID')
+                insert_rows(connection, 'rg_crosswalk', ['rg_original_name', 'rgnumber', 'gc_orgID'],
+                            rg_final, ['RGOriginalName', 'rgnumber', 'gc_orgID'])
+
+                # Name search covers the preferred and legal names of every org
+                concordance_by_id = {row['gc_orgID']: row for row in concordance}
+                names = [dict(concordance_by_id.get(row['gc_orgID'], {}), **row) for row in org_info]
+                insert_rows(connection, 'org_names_fts', FTS_COLUMNS, names)
+            connection.execute('ANALYZE')
+        finally:
+            connection.close()
+    logger.info("SQLite database published to %s", database_file)
+    return database_file
+
+
+def main() -> None:
+    """
+    Build gc_org.sqlite from the files currently in the repository.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    build_database(os.path.dirname(os.path.abspath(__file__)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+This module describes the source files read by the build and loads them
+with the right types from the start.
+
+Each source lists only the columns the build uses and the kind of each one:
+'id' columns are text keys (gc_orgID is joined as text and never goes
+through a float), 'int' columns are nullable Int64 and 'text' columns are
+plain strings. Every column is read as text and converted with the
+vectorized normalizers in id_normalize.py, so '2222' and '2222.0' give the
+same key. Loading checks the header first, so a renamed or missing
+column in a downloaded file stops the build with a clear error instead of
+surfacing later as a KeyError or a column of NaN.
+"""
+import csv
+import logging
+import os
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from id_normalize import normalize_gc_orgid, parse_int
+
+logger = logging.getLogger(__name__)
+
+# Source name -> (path relative to the repository root, [(column, kind), ...])
+SOURCE_SCHEMAS: Dict[str, Tuple[str, List[Tuple[str, str]]]] = {
+    'manual_org_df': ('Resources/Manual org ID link.csv', [
+        ('gc_orgID', 'id'),
+        ('Organization Legal Name English', 'text'),
+        ('Organization Legal Name French', 'text'),
+    ]),
+    'combined_faa_df': ('Scraping/combined_FAA_names.csv', [
+        ('English Name', 'text'),
+        ('French Name', 'text'),
+        ('FAA', 'text'),
+    ]),
+    'applied_en_df': ('Resources/applied_en.csv', [
+        ('Legal title', 'text'),
+        ('Applied title', 'text'),
+        ("Titre d'usage", 'text'),
+        ('Abbreviation', 'text'),
+        ('Abreviation', 'text'),
+    ]),
+    'infobase_en_df': ('Resources/infobase_en.csv', [
+        ('OrgID', 'int'),
+        ('Legal title', 'text'),
+        ('Website', 'text'),
+        ('Status', 'text'),
+        ('End date', 'int'),
+    ]),
+    'infobase_fr_df': ('Resources/infobase_fr.csv', [
+        ('OrgID', 'int'),
+        ('Appellation legale', 'text'),
+        ('Site Web', 'text'),
+    ]),
+    'final_rg_match_df': ('Resources/rg_final.csv', [
+        ('gc_orgID', 'id'),
+        ('rgnumber', 'int'),
+    ]),
+    'manual_pop_phoenix_df': ('Resources/manual pop phoenix.csv', [
+        ('gc_orgID', 'id'),
+        ('open_gov_ouvert', 'text'),
+        ('ati', 'text'),
+        ('pop', 'text'),
+        ('phoenix', 'text'),
+    ]),
+    'harmonized_names_df': ('create_harmonized_name.csv', [
+        ('gc_orgID', 'id'),
+        ('harmonized_name', 'text'),
+        ('nom_harmonisé', 'text'),
+    ]),
+    'manual_lead_department_df': ('Resources/lead_manual.csv', [
+        ('gc_orgID', 'id'),
+        ('Parent GC OrgID', 'id'),
+        ('lead_department', 'text'),
+        ('ministère_responsable', 'text'),
+    ]),
+    'lead_ministers_df': ('Resources/lead_code_ministers.csv', [
+        ('minID', 'id'),
+    ]),
+}
+
+NORMALIZERS = {
+    'id': normalize_gc_orgid,
+    'int': parse_int,
+}
+
+
+def read_header(path: str) -> List[str]:
+    """Return the column names of a CSV file."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return next(csv.reader(f), [])
+
+
+def load_source(name: str, script_folder: str) -> pd.DataFrame:
+    """
+    Load one source file with only its schema's columns and types.
+
+    Args:
+        name: Key in SOURCE_SCHEMAS
+        script_folder: Repository root the schema paths are relative to
+
+    Returns:
+        DataFrame with the schema's columns, in schema order
+
+    Raises:
+        ValueError: If the file is missing a column or a column no longer
+            parses as its declared kind
+    """
+    relative_path, columns = SOURCE_SCHEMAS[name]
+    path = os.path.join(script_folder, relative_path)
+    column_names = [column for column, _ in columns]
+
+    header = read_header(path)
+    missing_columns = [column for column in column_names if column not in header]
+    if missing_columns:
+        raise ValueError(f"Schema drift in {relative_path}: missing columns {missing_columns}")
+
+    df = pd.read_csv(path, usecols=column_names, dtype=str)
+    for column, kind in columns:
+        if kind not in NORMALIZERS:
+            continue
+        values = NORMALIZERS[kind](df[column])
+        unparsed = df[column].notna() & values.isna()
+        if unparsed.any():
+            raise ValueError(f"Schema drift in {relative_path}: {column} has values that are not "
+                             f"{kind} codes: {sorted(df.loc[unparsed, column].unique())[:5]}")
+        df[column] = values
+    return df[column_names]
+
+
+def load_sources(script_folder: str) -> Dict[str, pd.DataFrame]:
+    """
+    Load every source in SOURCE_SCHEMAS.
+
+    Args:
+        script_folder: Repository root the schema paths are relative to
+
+    Returns:
+        Dictionary of loaded dataframes keyed by source name
+    """
+    dfs = {}
+    for name in SOURCE_SCHEMAS:
+        dfs[name] = load_source(name, script_folder)
+        logger.info("Successfully loaded %s from %s", name, SOURCE_SCHEMAS[name][0])
+    return dfs
@@ -0,0 +1,140 @@
+"""
+This module downloads large text files in one streaming pass.
+
+The request asks for a gzip transfer, and the response is read in fixed-size
+chunks: requests decompresses each chunk, an incremental decoder turns it
+into text (characters split across chunk boundaries are carried over), and
+character fix-ups are applied to each piece with one str.translate call.
+The pieces are written straight to the destination through
+output_writer.write_chunks or handed to pandas through ChunkReader, so the
+memory used stays the same however large the dump grows.
+
+Datastore dumps are UTF-8, usually with a byte order mark; text is decoded
+as utf-8-sig so the mark is dropped instead of being written out twice.
+"""
+import codecs
+import io
+from typing import Dict, Iterator, Optional
+
+import requests
+
+from output_writer import write_chunks
+
+CHUNK_SIZE = 1 << 16
+
+# Seconds to wait for the server to connect or send the next chunk
+TIMEOUT = 60
+
+# Characters of the original and fixed text kept for previews by default
+PREVIEW_CHARS = 100
+
+
+class DownloadStream:
+    """
+    Text of one download, produced chunk by chunk.
+
+    Iterating yields the fixed-up text. After the first chunk, head and
+    fixed_head hold the start of the text before and after the fix-ups;
+    after the last one, compressed_bytes and characters hold the totals.
+    """
+
+    def __init__(self, url: str, fixups: Optional[Dict[str, str]] = None,
+                 encoding: str = 'utf-8-sig', chunk_size: int = CHUNK_SIZE,
+                 preview_chars: int = PREVIEW_CHARS):
+        self.url = url
+        self.table = str.maketrans(fixups) if fixups else None
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.preview_chars = preview_chars
+        self.head = ''
+        self.fixed_head = ''
+        self.compressed_bytes = 0
+        self.characters = 0
+
+    def __iter__(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        with requests.get(self.url, stream=True, timeout=TIMEOUT,
+                          headers={'Accept-Encoding': 'gzip'}) as response:
+            response.raise_for_status()
+            for block in response.iter_content(self.chunk_size):
+                text = decoder.decode(block)
+                if text:
+                    yield self._fix(text)
+            text = decoder.decode(b'', final=True)
+            if text:
+                yield self._fix(text)
+            self.compressed_bytes = response.raw.tell()
+
+    def _fix(self, text: str) -> str:
+        if len(self.head) < self.preview_chars:
+            self.head += text[:self.preview_chars - len(self.head)]
+        if self.table:
+            text = text.translate(self.table)
+        if len(self.fixed_head) < self.preview_chars:
+            self.fixed_head += text[:self.preview_chars - len(self.fixed_head)]
+        self.characters += len(text)
+        return text
+
+
+class ChunkReader(io.TextIOBase):
+    """
+    Read-only text file over a chunk iterator, for pd.read_csv.
+
+    Holds at most one chunk beyond what the reader has asked for.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = ''
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None or size < 0:
+            text, self._buffer = self._buffer + ''.join(self._chunks), ''
+            return text
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        text, self._buffer = self._buffer[:size], self._buffer[size:]
+        return text
+
+    def readline(self, size: Optional[int] = -1) -> str:
+        while '\n' not in self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        end = self._buffer.find('\n') + 1 or len(self._buffer)
+        if size is not None and 0 <= size < end:
+            end = size
+        line, self._buffer = self._buffer[:end], self._buffer[end:]
+        return line
+
+
+def download_text(url: str, path: str, fixups: Optional[Dict[str, str]] = None,
+                  encoding: str = 'utf-8-sig') -> DownloadStream:
+    """
+    Stream a text download to a file, applying character fix-ups on the way.
+
+    The file is written with a byte order mark (utf-8-sig) and only replaced
+    if its content changed.
+
+    Args:
+        url: Address of the file
+        path: Output path
+        fixups: Single characters to replace, e.g. {'\\u2011': '-'}
+        encoding: Encoding of the download
+
+    Returns:
+        The finished stream, with its previews and totals
+
+    Raises:
+        requests.HTTPError: The server answered with an error status
+    """
+    stream = DownloadStream(url, fixups, encoding)
+    write_chunks(path, stream, encoding='utf-8-sig')
+    return stream
@@ -0,0 +1,157 @@
+"""
+This module publishes typed Parquet and Arrow IPC copies of the generated tables.
+
+The CSV outputs lose their types: every consumer re-infers them and ends up
+with gc_orgID as a float or rg as a mix of '' and integers. The typed copies
+are written with a fixed schema per table (nullable Int32 IDs, dictionary
+encoded categorical columns) so loading them needs no parsing and always
+gives the same types.
+
+pyarrow is optional. Without it the typed outputs are skipped with a warning
+and the CSV outputs are unaffected.
+"""
+import logging
+import os
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from id_normalize import parse_int
+from output_writer import atomic_output
+
+logger = logging.getLogger(__name__)
+
+# Column kinds: 'int' is nullable Int32, 'category' is dictionary encoded
+# text and 'text' is plain UTF-8 text
+TABLE_SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    'gc_concordance': [
+        ('gc_orgID', 'int'),
+        ('harmonized_name', 'text'),
+        ('nom_harmonisé', 'text'),
+        ('abbreviation', 'text'),
+        ('abreviation', 'text'),
+        ('infobaseID', 'int'),
+        ('rg', 'int'),
+        ('ati', 'text'),
+        ('open_gov_ouvert', 'text'),
+        ('pop', 'text'),
+        ('phoenix', 'text'),
+        ('website', 'text'),
+        ('site_web', 'text'),
+    ],
+    'gc_org_info': [
+        ('gc_orgID', 'int'),
+        ('harmonized_name', 'text'),
+        ('nom_harmonisé', 'text'),
+        ('legal_title', 'text'),
+        ('appellation_légale', 'text'),
+        ('preferred_name', 'text'),
+        ('nom_préféré', 'text'),
+        ('lead_department', 'category'),
+        ('ministère_responsable', 'category'),
+        ('abbreviation', 'text'),
+        ('abreviation', 'text'),
+        ('FAA_LGFP', 'category'),
+        ('status_statut', 'category'),
+        ('end_date_fin', 'int'),
+    ],
+}
+
+
+def arrow_schema(table: str):
+    """
+    Return the pyarrow schema published for a table.
+
+    Args:
+        table: 'gc_concordance' or 'gc_org_info'
+
+    Returns:
+        pyarrow.Schema
+    """
+    import pyarrow as pa
+
+    arrow_types = {
+        'int': pa.int32(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'text': pa.string(),
+    }
+    return pa.schema([pa.field(column, arrow_types[kind]) for column, kind in TABLE_SCHEMAS[table]])
+
+
+def to_arrow_table(df: pd.DataFrame, table: str):
+    """
+    Convert a generated table to Arrow with its fixed schema.
+
+    Empty strings and NaN both become nulls, and integer columns accept
+    the mix of '', floats and ints the builders produce.
+
+    Args:
+        df: DataFrame as written to the CSV output
+        table: 'gc_concordance' or 'gc_org_info'
+
+    Returns:
+        pyarrow.Table
+    """
+    import pyarrow as pa
+
+    arrays = []
+    for column, kind in TABLE_SCHEMAS[table]:
+        values = df[column].replace('', None)
+        if kind == 'int':
+            numbers = parse_int(values)
+            if (values.notna() & numbers.isna()).any():
+                raise ValueError(f"{table}.{column} has values that are not integers")
+            values = numbers.astype('Int32')
+            arrays.append(pa.array(values, type=pa.int32(), from_pandas=True))
+        else:
+            array = pa.array(values.astype('string'), type=pa.string(), from_pandas=True)
+            arrays.append(array.dictionary_encode() if kind == 'category' else array)
+    return pa.Table.from_arrays(arrays, schema=arrow_schema(table))
+
+
+def write_typed_outputs(df: pd.DataFrame, table: str, output_folder: str) -> List[str]:
+    """
+    Write <table>.parquet and <table>.arrow next to the CSV output.
+
+    Args:
+        df: DataFrame as written to the CSV output
+        table: 'gc_concordance' or 'gc_org_info'
+        output_folder: Folder holding the CSV output
+
+    Returns:
+        Paths of the files written, empty if pyarrow is not installed
+    """
+    try:
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.warning("pyarrow is not installed; skipping Parquet/Arrow outputs for %s", table)
+        return []
+
+    arrow_table = to_arrow_table(df, table)
+    parquet_file = os.path.join(output_folder, f'{table}.parquet')
+    arrow_file = os.path.join(output_folder, f'{table}.arrow')
+    with atomic_output(parquet_file) as temp_file:
+        pq.write_table(arrow_table, temp_file)
+    with atomic_output(arrow_file) as temp_file:
+        feather.write_feather(arrow_table, temp_file, compression='uncompressed')
+    logger.info("Typed outputs for %s saved to %s and %s", table, parquet_file, arrow_file)
+    return [parquet_file, arrow_file]
+
+
+def read_typed_output(table: str, output_folder: str) -> pd.DataFrame:
+    """
+    Load a typed Parquet output with nullable integer IDs.
+
+    Args:
+        table: 'gc_concordance' or 'gc_org_info'
+        output_folder: Folder holding the Parquet output
+
+    Returns:
+        DataFrame with Int32 ID columns and categorical columns as published
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_table = pq.read_table(os.path.join(output_folder, f'{table}.parquet'))
+    return arrow_table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
@@ -0,0 +1,252 @@
+"""
+This module validates a build before it is published.
+
+The checks run on the tables the build already has in memory:
+
+- coverage: every gc_orgID in the manual files exists in Manual org ID link,
+  and every organization has a row in each manual file
+- uniqueness: gc_orgID is unique in the manual files and both outputs
+- references: Parent GC OrgID in lead_manual.csv points at a gc_orgID or a
+  minID in lead_code_ministers.csv
+- agreement: gc_concordance and gc_org_info cover the same organizations
+  with the same harmonized names
+- urls: website and site_web are well-formed web addresses
+
+Each check is a set operation or a vectorized string match. The result is
+a JSON-serializable report; any failed 'error' check stops publishing,
+while 'warning' checks are only reported.
+
+Run `python validate_build.py` to validate the files currently on disk.
+"""
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# Optional scheme, dotted host name, optional port and path
+URL_PATTERN = r'^(?:https?://)?[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+(?::\d+)?(?:/\S*)?$'
+
+# Manual files keyed by gc_orgID, with the severity of organizations missing from them
+MANUAL_FILES = {
+    'manual_pop_phoenix_df': ('manual pop phoenix.csv', ERROR),
+    'manual_lead_department_df': ('lead_manual.csv', ERROR),
+    'final_rg_match_df': ('rg_final.csv', WARNING),
+}
+
+REPORT_NAME = 'validation_report.json'
+
+
+def make_check(name: str, severity: str, failures: List) -> Dict:
+    """
+    Build one check entry of the report.
+
+    Args:
+        name: Check name, e.g. 'unique:gc_concordance'
+        severity: ERROR or WARNING
+        failures: Offending values, empty if the check passed
+
+    Returns:
+        Dictionary with the check name, severity, outcome and failures
+    """
+    return {
+        'check': name,
+        'severity': severity,
+        'passed': not failures,
+        'count': len(failures),
+        'failures': failures,
+    }
+
+
+def ids(series: pd.Series) -> pd.Index:
+    """Return the distinct gc_orgIDs of a column as text."""
+    return pd.Index(series.dropna().astype(str).str.strip()).unique()
+
+
+def check_coverage(dfs: Dict[str, pd.DataFrame]) -> List[Dict]:
+    """
+    Compare the gc_orgIDs of every manual file with Manual org ID link.
+
+    rg_final.csv uses gc_orgID 0 for RG entries without an organization,
+    so that value is not reported as unknown.
+    """
+    known_ids = ids(dfs['manual_org_df']['gc_orgID'])
+    checks = []
+    for name, (file_name, missing_severity) in MANUAL_FILES.items():
+        file_ids = ids(dfs[name]['gc_orgID']).difference(['0'])
+        checks.append(make_check(f'coverage:{file_name}:unknown', ERROR,
+                                 sorted(file_ids.difference(known_ids))))
+        checks.append(make_check(f'coverage:{file_name}:missing', missing_severity,
+                                 sorted(known_ids.difference(file_ids))))
+    return checks
+
+
+def check_uniqueness(tables: Dict[str, pd.DataFrame]) -> List[Dict]:
+    """Report gc_orgIDs that appear more than once in each table."""
+    checks = []
+    for name, df in tables.items():
+        gc_orgids = df['gc_orgID'].dropna().astype(str)
+        repeated = gc_orgids[gc_orgids.duplicated()].unique()
+        checks.append(make_check(f'unique:{name}', ERROR, sorted(repeated)))
+    return checks
+
+
+def check_references(dfs: Dict[str, pd.DataFrame]) -> List[Dict]:
+    """Report Parent GC OrgID values that match no gc_orgID or minID."""
+    parents = dfs['manual_lead_department_df']['Parent GC OrgID'].dropna().astype(str).str.strip()
+    parents = parents[parents != '']
+    targets = ids(dfs['manual_org_df']['gc_orgID']).union(ids(dfs['lead_ministers_df']['minID']))
+    dangling = pd.Index(parents.unique()).difference(targets)
+    return [make_check('references:Parent GC OrgID', ERROR, sorted(dangling))]
+
+
+def check_agreement(concordance_df: pd.DataFrame, org_info_df: pd.DataFrame) -> List[Dict]:
+    """Compare the organizations and harmonized names of both outputs."""
+    concordance_ids = ids(concordance_df['gc_orgID'])
+    org_info_ids = ids(org_info_df['gc_orgID'])
+
+    name_fields = ['harmonized_name', 'nom_harmonisé']
+    names = concordance_df[['gc_orgID'] + name_fields].merge(
+        org_info_df[['gc_orgID'] + name_fields], on='gc_orgID', suffixes=('_concordance', '_info')
+    )
+    differs = pd.Series(False, index=names.index)
+    for field in name_fields:
+        concordance_names = names[f'{field}_concordance'].fillna('')
+        info_names = names[f'{field}_info'].fillna('')
+        differs |= concordance_names != info_names
+    mismatches = names[differs].astype(str).to_dict(orient='records')
+
+    return [
+        make_check('agreement:ids only in gc_concordance', ERROR,
+                   sorted(concordance_ids.difference(org_info_ids))),
+        make_check('agreement:ids only in gc_org_info', ERROR,
+                   sorted(org_info_ids.difference(concordance_ids))),
+        make_check('agreement:harmonized names', ERROR, mismatches),
+    ]
+
+
+def check_urls(concordance_df: pd.DataFrame) -> List[Dict]:
+    """Report website and site_web values that are not well-formed addresses."""
+    checks = []
+    for column in ['website', 'site_web']:
+        urls = concordance_df[['gc_orgID', column]].dropna()
+        urls = urls[urls[column].astype(str) != '']
+        malformed = urls[~urls[column].astype(str).str.match(URL_PATTERN)]
+        checks.append(make_check(f'urls:{column}', ERROR,
+                                 malformed.astype(str).to_dict(orient='records')))
+    return checks
+
+
+def validate_build(concordance_df: pd.DataFrame, org_info_df: pd.DataFrame,
+                   dfs: Dict[str, pd.DataFrame]) -> Dict:
+    """
+    Run every check on a build.
+
+    Args:
+        concordance_df: gc_concordance as it will be published
+        org_info_df: gc_org_info as it will be published
+        dfs: Source dataframes the build loaded
+
+    Returns:
+        Report with the overall outcome, error and warning counts and every check
+    """
+    start = time.perf_counter()
+    checks = (
+        check_coverage(dfs)
+        + check_uniqueness({
+            'Manual org ID link.csv': dfs['manual_org_df'],
+            'manual pop phoenix.csv': dfs['manual_pop_phoenix_df'],
+            'lead_manual.csv': dfs['manual_lead_department_df'],
+            'gc_concordance': concordance_df,
+            'gc_org_info': org_info_df,
+        })
+        + check_references(dfs)
+        + check_agreement(concordance_df, org_info_df)
+        + check_urls(concordance_df)
+    )
+    failed = [check for check in checks if not check['passed']]
+    errors = sum(check['severity'] == ERROR for check in failed)
+    warnings = sum(check['severity'] == WARNING for check in failed)
+
+    for check in failed:
+        log = logger.error if check['severity'] == ERROR else logger.warning
+        log("Validation %s failed for %d values", check['check'], check['count'])
+    # Timing is logged rather than reported, so an unchanged build leaves the report untouched
+    logger.info("Validated the build in %.3f s", time.perf_counter() - start)
+
+    return {
+        'passed': errors == 0,
+        'errors': errors,
+        'warnings': warnings,
+        'checks': checks,
+    }
+
+
+def report_json(report: Dict) -> str:
+    """Serialize a report for writing."""
+    return json.dumps(report, ensure_ascii=False, indent=2) + '\n'
+
+
+def print_report(report: Dict, prefixes: Optional[List[str]] = None) -> None:
+    """
+    Print a summary of a report.
+
+    Args:
+        report: Report from validate_build
+        prefixes: Only print checks whose name starts with one of these
+    """
+    for check in report['checks']:
+        if prefixes and not check['check'].startswith(tuple(prefixes)):
+            continue
+        outcome = 'ok' if check['passed'] else f"{check['severity'].upper()} ({check['count']})"
+        print(f"{check['check']}: {outcome}")
+        for failure in check['failures'][:10]:
+            print(f"    {failure}")
+        if check['count'] > 10:
+            print(f"    ... and {check['count'] - 10} more")
+
+
+def validate_files(script_folder: str) -> Dict:
+    """
+    Validate the published CSVs and sources currently on disk.
+
+    Args:
+        script_folder: Repository root
+
+    Returns:
+        Report from validate_build
+    """
+    from source_schemas import load_sources
+
+    dfs = load_sources(script_folder)
+    concordance_df = pd.read_csv(os.path.join(script_folder, 'gc_concordance.csv'), dtype=str)
+    org_info_df = pd.read_csv(os.path.join(script_folder, 'gc_org_info.csv'), dtype=str)
+    return validate_build(concordance_df, org_info_df, dfs)
+
+
+def main() -> None:
+    """
+    Validate the files on disk, write History/validation_report.json and
+    exit with status 1 if an error check fails.
+    """
+    from output_writer import write_text
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    script_folder = os.path.dirname(os.path.abspath(__file__))
+    report = validate_files(script_folder)
+    write_text(os.path.join(script_folder, 'History', REPORT_NAME), report_json(report))
+    print_report(report)
+    print(f"Errors: {report['errors']}, warnings: {report['warnings']}")
+    sys.exit(0 if report['passed'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+This module keeps the published tables up to date while the manual files
+in Resources/ and Scraping/ are being edited.
+
+`python watch_build.py` polls both folders. When a file changes it waits
+for the edits to settle (the debounce), then reruns only the stages that
+read the changed files and the stages downstream of their outputs. STAGES
+is the dependency graph: each stage names the files it reads and writes,
+and is listed after every stage it depends on.
+
+Everything runs in one long-lived interpreter, so pandas and the build
+modules are imported once. The build stage keeps the parsed sources in
+memory and rereads only the files whose modification time or size
+changed, which brings gc_concordance.csv and gc_org_info.csv up to date
+well within a second of saving a manual file.
+
+The download steps (retrieve_datasets.py, rg_download.py, rg_fuzzy.py,
+lead_ministry_retrieve.py) and lead_fix.py, which rewrites lead_manual.csv
+from the build's own output, are not rerun by the watcher.
+
+Examples:
+    python watch_build.py
+    python watch_build.py --verbose --debounce 1
+"""
+import argparse
+import contextlib
+import datetime
+import fnmatch
+import io
+import logging
+import os
+import runpy
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from build_gc_org import build_and_publish
+from output_writer import changed_outputs, clear_outputs
+from overrides import load_overrides
+from source_schemas import SOURCE_SCHEMAS, load_source
+
+logger = logging.getLogger(__name__)
+
+script_folder = os.path.dirname(os.path.abspath(__file__))
+
+WATCHED_FOLDERS = ['Resources', 'Scraping']
+OVERRIDES_PATH = 'Resources/overrides.csv'
+
+# Seconds between scans of the watched folders
+POLL_SECONDS = 0.2
+# Seconds without further edits before the stages run
+DEBOUNCE_SECONDS = 0.3
+
+Signature = Tuple[int, int]
+
+
+def file_signature(path: str) -> Optional[Signature]:
+    """Return a file's modification time and size, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def snapshot(folder: str) -> Dict[str, Signature]:
+    """
+    Return the signature of every file in the watched folders.
+
+    Paths are relative to folder with '/' separators. Hidden files, such as
+    the temporary files of output_writer, are skipped.
+    """
+    signatures = {}
+    for watched in WATCHED_FOLDERS:
+        with os.scandir(os.path.join(folder, watched)) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                signatures[f'{watched}/{entry.name}'] = (stat.st_mtime_ns, stat.st_size)
+    return signatures
+
+
+def changed_paths(before: Dict[str, Signature], after: Dict[str, Signature]) -> List[str]:
+    """Return the files added, removed or modified between two snapshots."""
+    return sorted(path for path in set(before) | set(after) if before.get(path) != after.get(path))
+
+
+class SourceCache:
+    """
+    The build's parsed sources, kept between runs.
+
+    A source is reread only when its file signature changed since it was
+    last parsed.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.frames: Dict[str, Tuple[Optional[Signature], pd.DataFrame]] = {}
+
+    def _get(self, name: str, relative_path: str, loader: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+        path = os.path.join(self.folder, relative_path)
+        signature = file_signature(path)
+        cached = self.frames.get(name)
+        if cached is None or cached[0] != signature:
+            self.frames[name] = (signature, loader(path))
+            logger.info("Parsed %s", relative_path)
+        return self.frames[name][1]
+
+    def load(self) -> Dict[str, pd.DataFrame]:
+        """
+        Return the sources as load_dataframes would, rereading changed files.
+
+        Raises:
+            ValueError: If a changed source no longer matches its schema; the
+                previously parsed copy is kept
+        """
+        dfs = {}
+        for name, (relative_path, _) in SOURCE_SCHEMAS.items():
+            dfs[name] = self._get(name, relative_path, lambda _, name=name: load_source(name, self.folder))
+        dfs['overrides_df'] = self._get('overrides_df', OVERRIDES_PATH, load_overrides)
+        return dfs
+
+
+class Stage:
+    """One step of the watched pipeline: the files it reads and writes, and how to run it."""
+
+    def __init__(self, name: str, reads: Iterable[str], writes: Iterable[str],
+                 run: Callable[['Watcher'], None]):
+        self.name = name
+        self.reads = list(reads)
+        self.writes = list(writes)
+        self.run = run
+
+    def reads_any(self, paths: Iterable[str]) -> bool:
+        """True if the stage reads one of the paths (reads may be glob patterns)."""
+        return any(fnmatch.fnmatchcase(path, pattern) for path in paths for pattern in self.reads)
+
+
+def run_script(relative_path: str) -> Callable[['Watcher'], None]:
+    """
+    Return a stage runner that executes a pipeline script in this interpreter.
+
+    The script runs as __main__ from the repository root (rg_final_match.py
+    resolves its files from the working directory). Its printed output is
+    only shown with --verbose or when it fails.
+    """
+    def run(watcher: 'Watcher') -> None:
+        saved_cwd, saved_path = os.getcwd(), list(sys.path)
+        output = io.StringIO()
+        try:
+            os.chdir(watcher.folder)
+            with contextlib.redirect_stdout(sys.stdout if watcher.verbose else output):
+                runpy.run_path(os.path.join(watcher.folder, relative_path), run_name='__main__')
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                print(output.getvalue(), end='')
+                raise RuntimeError(f"{relative_path} exited with status {e.code}")
+        except Exception:
+            print(output.getvalue(), end='')
+            raise
+        finally:
+            os.chdir(saved_cwd)
+            sys.path[:] = saved_path
+    return run
+
+
+def run_build(watcher: 'Watcher') -> None:
+    """Rebuild and publish both tables from the cached sources."""
+    build_and_publish(watcher.cache.load(), watcher.folder)
+
+
+# Listed in dependency order: a stage comes after every stage whose writes it reads
+STAGES = [
+    Stage('combine FAA names', ['Scraping/FAA*.csv'], ['Scraping/combined_FAA_names.csv'],
+          run_script('Scraping/combine_FAA_names.py')),
+    Stage('RG final match', ['Resources/rg_matched.csv', 'Resources/rg_fixed.csv'],
+          ['Resources/rg_final.csv'], run_script('Resources/rg_final_match.py')),
+    Stage('harmonized names',
+          ['Resources/Manual org ID link.csv', 'Resources/applied_en.csv',
+           'Resources/infobase_en.csv', 'Resources/infobase_fr.csv'],
+          ['create_harmonized_name.csv'], run_script('create_harmonized_name.py')),
+    Stage('build', [path for path, _ in SOURCE_SCHEMAS.values()] + [OVERRIDES_PATH],
+          ['gc_concordance.csv', 'gc_org_info.csv'], run_build),
+]
+
+
+def downstream_stages(paths: Iterable[str], stages: List[Stage] = STAGES) -> List[Stage]:
+    """
+    Return the stages to rerun for changed files, in run order.
+
+    A stage is selected if it reads a changed file or a file written by a
+    stage selected before it.
+    """
+    dirty = set(paths)
+    selected = []
+    for stage in stages:
+        if stage.reads_any(dirty):
+            selected.append(stage)
+            dirty.update(stage.writes)
+    return selected
+
+
+class Watcher:
+    """Polls the watched folders and reruns the affected stages."""
+
+    def __init__(self, folder: str = script_folder, poll_seconds: float = POLL_SECONDS,
+                 debounce_seconds: float = DEBOUNCE_SECONDS, verbose: bool = False):
+        self.folder = folder
+        self.poll_seconds = poll_seconds
+        self.debounce_seconds = debounce_seconds
+        self.verbose = verbose
+        self.cache = SourceCache(folder)
+        self.baseline = snapshot(folder)
+
+    def wait_for_edits(self) -> Dict[str, Signature]:
+        """Block until files changed and then stayed unchanged for the debounce time."""
+        current = snapshot(self.folder)
+        while current == self.baseline:
+            time.sleep(self.poll_seconds)
+            current = snapshot(self.folder)
+        while True:
+            time.sleep(self.debounce_seconds)
+            settled = snapshot(self.folder)
+            if settled == current:
+                return settled
+            current = settled
+
+    def run_once(self, current: Dict[str, Signature]) -> bool:
+        """
+        Rerun the stages downstream of the edits between the baseline and current.
+
+        Returns:
+            True if every stage succeeded
+        """
+        paths = changed_paths(self.baseline, current)
+        stages = downstream_stages(paths)
+        stamp = datetime.datetime.now().strftime('%H:%M:%S')
+        print(f"[{stamp}] Changed: {', '.join(paths)}")
+        if not stages:
+            print("  No stage reads these files")
+
+        clear_outputs()
+        succeeded = True
+        for stage in stages:
+            start = time.perf_counter()
+            try:
+                stage.run(self)
+            except Exception as e:
+                print(f"  {stage.name:<18} FAILED: {e}")
+                print("  Later stages skipped; waiting for the next edit")
+                succeeded = False
+                break
+            print(f"  {stage.name:<18} {time.perf_counter() - start:6.2f}s")
+
+        written = [os.path.relpath(path, self.folder).replace(os.sep, '/') for path in changed_outputs()]
+        if written:
+            print(f"  Outputs changed: {', '.join(written)}")
+
+        # Files the stages wrote are not edits; anything else saved meanwhile is picked up next time
+        after = snapshot(self.folder)
+        self.baseline = dict(current)
+        for path in set(written) & set(after):
+            self.baseline[path] = after[path]
+        return succeeded
+
+    def watch(self) -> None:
+        """Watch until interrupted."""
+        self.cache.load()
+        print(f"Watching {', '.join(WATCHED_FOLDERS)} in {self.folder} (Ctrl+C to stop)")
+        while True:
+            self.run_once(self.wait_for_edits())
+
+
+def main() -> int:
+    """Rebuild the outputs affected by edits to Resources/ and Scraping/ as they are saved."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--poll', type=float, default=POLL_SECONDS, help='seconds between folder scans')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS,
+                        help='seconds without edits before rebuilding')
+    parser.add_argument('--verbose', action='store_true', help='show the output of every stage')
+    args = parser.parse_args()
+
+    # The build logs every step at INFO; keep the watcher's output to one line per stage
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    watcher = Watcher(poll_seconds=args.poll, debounce_seconds=args.debounce, verbose=args.verbose)
+    try:
+        watcher.watch()
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())